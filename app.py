@@ -1,125 +1,21 @@
+import os
 import streamlit as st
-import pandas as pd
-import base64
-from PIL import Image
-import io
+from synlab.data import get_data, filter_rows, filter_state
+from synlab.export import (EXPORT_MAX_BYTES, available_formats, default_export_columns, start_export,
+                           discard_export, discard_with_session)
+from synlab.imports import import_panel
+from synlab.perf import perf_panel, start_rerun, timed
+from synlab.shell import favicon, page_shell
 
 st.set_page_config(
     page_title="SYNLAB Analytics Dashboard",
-    page_icon="assets/synlab_favicon.png",
+    page_icon=favicon(),
     layout="wide",
     initial_sidebar_state="expanded"
 )
+start_rerun(__file__)
 
-# Function to load and encode images
-def get_image_base64(image_path):
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        return encoded_string
-    except FileNotFoundError:
-        st.error(f"Image file not found: {image_path}")
-        return None
-
-# Function to display logo with proper sizing
-def display_logo(image_path, width=200):
-    try:
-        logo_base64 = get_image_base64(image_path)
-        if logo_base64:
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <img src="data:image/png;base64,{logo_base64}" width="{width}" alt="SYNLAB Logo">
-            </div>
-            """, unsafe_allow_html=True)
-    except Exception as e:
-        st.warning(f"Could not load logo: {e}")
-
-# Custom CSS with Navy Blue Theme
-st.markdown("""
-<style>
-    /* Main Theme Colors */
-    :root {
-        --navy-blue: #0A2647;
-        --dark-blue: #144272;
-        --light-blue: #205295;
-        --sky-blue: #2C74B3;
-        --cream: #F8F9FA;
-    }
-    
-    /* Main Header */
-    .main-header {
-        font-size: 3rem;
-        color: var(--navy-blue);
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 700;
-    }
-    
-    /* Sidebar Styling */
-    .css-1d391kg, .css-1lcbmhc {
-        background-color: var(--navy-blue);
-    }
-    
-    .css-1d391kg p, .css-1lcbmhc p {
-        color: white !important;
-    }
-    
-    /* Filter Section */
-    .filter-section {
-        background: linear-gradient(135deg, var(--light-blue), var(--sky-blue));
-        padding: 15px;
-        border-radius: 10px;
-        color: white;
-        margin-bottom: 20px;
-    }
-    
-    /* Custom cards */
-    .custom-card {
-        background: linear-gradient(135deg, var(--light-blue), var(--sky-blue));
-        padding: 20px;
-        border-radius: 10px;
-        color: white;
-        margin: 10px 0;
-    }
-    
-    .custom-card-light {
-        background-color: var(--cream);
-        padding: 20px;
-        border-radius: 10px;
-        border-left: 5px solid var(--light-blue);
-        margin: 10px 0;
-    }
-    
-    /* Summary Section */
-    .summary-section {
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-        padding: 25px;
-        border-radius: 10px;
-        border-left: 5px solid var(--navy-blue);
-        margin: 15px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .summary-header {
-        color: var(--navy-blue);
-        border-bottom: 2px solid var(--light-blue);
-        padding-bottom: 10px;
-        margin-bottom: 15px;
-    }
-    
-    /* Footer */
-    .footer {
-        background-color: var(--navy-blue);
-        color: white;
-        padding: 20px;
-        text-align: center;
-        border-radius: 10px;
-        margin-top: 2rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-display_logo("assets/synlab_logo.jpg", width=200)
+page_shell()
 
 # Header with Logo Integration
 st.markdown("""
@@ -138,17 +34,10 @@ if 'gender_filter' not in st.session_state:
     st.session_state.gender_filter = []
 if 'familiarity_filter' not in st.session_state:
     st.session_state.familiarity_filter = []
-if 'data_loaded' not in st.session_state:
-    st.session_state.data_loaded = False
-
-# Load data once and store in session state
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/SYNLAB_Surveydata_AUGMENTED_500.csv")
-
-if not st.session_state.data_loaded:
-    st.session_state.data = load_data()
-    st.session_state.data_loaded = True
+# Load the shared survey frame (read-only, one copy per dataset version)
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
 
 # Global filters in sidebar
 st.sidebar.markdown("""
@@ -161,41 +50,41 @@ st.sidebar.markdown("""
 # Age filter
 st.session_state.age_filter = st.sidebar.multiselect(
     "Age Group",
-    options=st.session_state.data['Age_Group'].unique(),
-    default=st.session_state.data['Age_Group'].unique(),
+    options=data['Age_Group'].unique(),
+    default=data['Age_Group'].unique(),
     key="global_age_filter"
 )
 
 # Occupation filter
 st.session_state.occupation_filter = st.sidebar.multiselect(
     "Occupation",
-    options=st.session_state.data['Occupation'].unique(),
-    default=st.session_state.data['Occupation'].unique(),
+    options=data['Occupation'].unique(),
+    default=data['Occupation'].unique(),
     key="global_occupation_filter"
 )
 
 # Gender filter
 st.session_state.gender_filter = st.sidebar.multiselect(
     "Gender",
-    options=st.session_state.data['Gender'].unique(),
-    default=st.session_state.data['Gender'].unique(),
+    options=data['Gender'].unique(),
+    default=data['Gender'].unique(),
     key="global_gender_filter"
 )
 
 # Familiarity filter
 st.session_state.familiarity_filter = st.sidebar.multiselect(
     "Familiarity Level",
-    options=st.session_state.data['Familiarity_with_SYNLAB'].unique(),
-    default=st.session_state.data['Familiarity_with_SYNLAB'].unique(),
+    options=data['Familiarity_with_SYNLAB'].unique(),
+    default=data['Familiarity_with_SYNLAB'].unique(),
     key="global_familiarity_filter"
 )
 
 # Reset filters button
 if st.sidebar.button("🔄 Reset All Filters", type="secondary"):
-    st.session_state.age_filter = st.session_state.data['Age_Group'].unique().tolist()
-    st.session_state.occupation_filter = st.session_state.data['Occupation'].unique().tolist()
-    st.session_state.gender_filter = st.session_state.data['Gender'].unique().tolist()
-    st.session_state.familiarity_filter = st.session_state.data['Familiarity_with_SYNLAB'].unique().tolist()
+    st.session_state.age_filter = data['Age_Group'].unique().tolist()
+    st.session_state.occupation_filter = data['Occupation'].unique().tolist()
+    st.session_state.gender_filter = data['Gender'].unique().tolist()
+    st.session_state.familiarity_filter = data['Familiarity_with_SYNLAB'].unique().tolist()
     st.rerun()
 
 # Filter status
@@ -206,18 +95,9 @@ st.sidebar.write(f"**Occupations:** {len(st.session_state.occupation_filter)} se
 st.sidebar.write(f"**Genders:** {len(st.session_state.gender_filter)} selected")
 st.sidebar.write(f"**Familiarity Levels:** {len(st.session_state.familiarity_filter)} selected")
 
-# Apply filters to get filtered data
-def get_filtered_data():
-    filtered_data = st.session_state.data[
-        (st.session_state.data['Age_Group'].isin(st.session_state.age_filter)) &
-        (st.session_state.data['Occupation'].isin(st.session_state.occupation_filter)) &
-        (st.session_state.data['Gender'].isin(st.session_state.gender_filter)) &
-        (st.session_state.data['Familiarity_with_SYNLAB'].isin(st.session_state.familiarity_filter))
-    ]
-    return filtered_data
-
-# Store filtered data in session state
-st.session_state.filtered_data = get_filtered_data()
+# Row positions of the filtered respondents, cached per filter state
+with timed('filter') as section:
+    section['rows'] = len(filter_rows(data_version_id, filter_state()))
 
 # Main page content
 
@@ -392,6 +272,50 @@ with col2:
     
     """, unsafe_allow_html=True)
 
+# Progress of a background export, polled by a fragment so the rerun
+# that started it returns immediately; once the file is written the
+# whole app reruns to swap the progress bar for the download button
+@st.fragment(run_every=0.5)
+def export_progress(job):
+    if job['done'].is_set():
+        st.rerun()
+    st.progress(job['written'] / max(job['rows'], 1),
+                text=f"Writing {job['written']:,} of {job['rows']:,} rows")
+
+
+# Export of the respondents matching the global filters, written in
+# chunks to a temporary file rather than built in memory
+with st.expander("📥 Export Filtered Respondents"):
+    export_rows = filter_rows(data_version_id, filter_state())
+    export_columns = st.multiselect("Columns", options=list(data.columns),
+                                    default=default_export_columns(data.columns),
+                                    help="Email_Address is excluded by default", key="export_columns")
+    export_format = st.radio("Format", available_formats(), horizontal=True, key="export_format")
+    
+    export_job = st.session_state.get('export_job')
+    export_running = export_job is not None and not export_job['done'].is_set()
+    if st.button(f"Prepare export ({len(export_rows):,} respondents)", disabled=export_running or not export_columns):
+        discard_export(export_job)
+        export_job = st.session_state.export_job = start_export(data_version_id, export_rows, export_columns,
+                                                                export_format)
+        discard_with_session(export_job)
+    
+    if export_job is not None and not export_job['done'].is_set():
+        export_progress(export_job)
+    elif export_job is not None:
+        if export_job['error'] is not None:
+            st.error(f"Export failed: {export_job['error']}")
+        elif os.path.getsize(export_job['path']) > EXPORT_MAX_BYTES:
+            st.error(f"The export is larger than {EXPORT_MAX_BYTES // 2**20} MB, the most Streamlit serves as a "
+                     "download. Choose fewer columns, narrow the filters or use Parquet.")
+        else:
+            # Served from disk by the static file handler, not held by the app
+            st.markdown(f"""
+            <a href="{export_job['url']}" download="{export_job['file_name']}" type="{export_job['mime']}">
+                ⬇️ Download {export_job['format']} ({export_job['rows']:,} rows)
+            </a>
+            """, unsafe_allow_html=True)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -399,4 +323,7 @@ st.markdown("""
     <p>Built by Ibraheem Alawode using Streamlit | For SYNLAB Nigeria Marketing Team</p>
     <p style="font-size: 0.8rem; opacity: 0.8;">
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+perf_panel()
+import_panel(__file__)
@@ -1,9 +1,19 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
+import os
+import sys
+
+# Run from data/; make the shared synlab package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synlab.data import get_data, filter_rows
+from synlab.kpis import scale_counts
+from synlab.figures import show
+from synlab.search import search_rows
+from synlab.table import DEFAULT_TABLE_COLUMNS, TABLE_PAGE_SIZE, filter_options, sorted_rows, table_page
+from synlab.graph import graph_input, graph_node, graph_panel, page_graph
+from synlab.imports import import_panel
+from synlab.perf import perf_panel, start_rerun, timed
 
 # Page configuration
 st.set_page_config(
@@ -12,13 +22,12 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+start_rerun(__file__)
 
 # Load data
-@st.cache_data
-def load_data():
-    return pd.read_csv("SYNLAB_Surveydata_AUGMENTED_500.csv")
-
-data = load_data()
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
 
 # Sidebar filters
 st.sidebar.header("🔧 Filters")
@@ -41,12 +50,97 @@ familiarity_filter = st.sidebar.multiselect(
     default=data['Familiarity_with_SYNLAB'].unique()
 )
 
+# Page computations as a dependency graph: a rerun re-evaluates only the
+# KPIs and charts whose inputs (data version, filters, widgets) changed
+graph = page_graph('dashboard')
+graph_input(graph, 'version', data_version_id)
+active_filters = graph_input(graph, 'filters', (
+    ('Age_Group', tuple(sorted(str(v) for v in age_filter))),
+    ('Occupation', tuple(sorted(str(v) for v in occupation_filter))),
+    ('Familiarity_with_SYNLAB', tuple(sorted(str(v) for v in familiarity_filter))),
+))
+
+
 # Apply filters
-filtered_data = data[
-    (data['Age_Group'].isin(age_filter)) &
-    (data['Occupation'].isin(occupation_filter)) &
-    (data['Familiarity_with_SYNLAB'].isin(familiarity_filter))
-]
+def filter_data(version, filters):
+    return data.iloc[filter_rows(version, filters)]
+
+
+def kpi_values(filtered_data):
+    return {
+        'respondents': len(filtered_data),
+        'avg_rating': filtered_data['SYNLAB_Rating_1_5'].mean(),
+        'awareness': (filtered_data['Heard_SYNLAB'].sum() / len(filtered_data)) * 100,
+        'recommendation': ((filtered_data['Recommendation_Score'] >= 4).sum() / len(filtered_data)) * 100,
+        'usage': (filtered_data['Used_SYNLAB'].sum() / len(filtered_data)) * 100,
+    }
+
+
+# Brand Awareness Comparison
+def awareness_chart(filtered_data):
+    awareness_data = {
+        'Lab': ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal'],
+        'Awareness': [
+            filtered_data['Heard_SYNLAB'].sum(),
+            filtered_data['Heard_Clinix'].sum(),
+            filtered_data['Heard_Mecure'].sum(),
+            filtered_data['Heard_Clina_Lancet'].sum(), 
+            filtered_data['Heard_Afriglobal'].sum()
+        ]
+    }
+    awareness_df = pd.DataFrame(awareness_data)
+    return px.bar(awareness_df, x='Lab', y='Awareness', 
+                  title="Brand Awareness Comparison",
+                  color='Awareness')
+
+
+# Rating Distribution
+def rating_chart(filtered_data):
+    rating_counts = scale_counts(filtered_data['SYNLAB_Rating_1_5'])
+    fig = px.bar(x=rating_counts.index, y=rating_counts.values,
+                 title="SYNLAB Rating Distribution",
+                 labels={'x': 'SYNLAB_Rating_1_5', 'y': 'count'},
+                 color_discrete_sequence=['#FF4B4B'])
+    fig.update_layout(bargap=0)
+    return fig
+
+
+# Familiarity vs Rating
+def familiarity_chart(filtered_data):
+    familiarity_rating = filtered_data.groupby('Familiarity_with_SYNLAB')['SYNLAB_Rating_1_5'].mean().reset_index()
+    return px.bar(familiarity_rating, x='Familiarity_with_SYNLAB', y='SYNLAB_Rating_1_5',
+                  title="Average Rating by Familiarity Level",
+                  color='SYNLAB_Rating_1_5')
+
+
+# Demographic Distribution
+def demographic_chart(filtered_data, demo_col):
+    demo_counts = filtered_data[demo_col].value_counts().reset_index()
+    demo_counts.columns = [demo_col, 'Count']
+    return px.pie(demo_counts, names=demo_col, values='Count',
+                  title=f"Distribution by {demo_col}")
+
+
+# Usage comparison
+def usage_chart(filtered_data):
+    usage_data = {
+        'Lab': ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal'],
+        'Usage_Rate': [
+            (filtered_data['Used_SYNLAB'].sum() / len(filtered_data)) * 100,
+            (filtered_data['Used_Clinix'].sum() / len(filtered_data)) * 100,
+            (filtered_data['Used_Mecure'].sum() / len(filtered_data)) * 100,
+            (filtered_data['Used_Clina_Lancet'].sum() / len(filtered_data)) * 100,
+            (filtered_data['Used_Afriglobal'].sum() / len(filtered_data)) * 100
+        ]
+    }
+    usage_df = pd.DataFrame(usage_data)
+    return px.bar(usage_df, x='Lab', y='Usage_Rate',
+                  title="Laboratory Usage Rates",
+                  color='Usage_Rate')
+
+
+filtered_data = graph_node(graph, 'filtered_data', ['version', 'filters'], filter_data)
+kpis = graph_node(graph, 'kpis', ['filtered_data'], kpi_values)
 
 # Main dashboard
 st.title("🏥 SYNLAB Analytics Dashboard")
@@ -60,25 +154,21 @@ col1, col2, col3, col4, col5 = st.columns(5)
 with col1:
     st.metric(
         "Total Respondents", 
-        len(filtered_data),
-        delta=f"{len(filtered_data) - len(data)}" if len(filtered_data) != len(data) else None
+        kpis['respondents'],
+        delta=f"{kpis['respondents'] - len(data)}" if kpis['respondents'] != len(data) else None
     )
 
 with col2:
-    avg_rating = filtered_data['SYNLAB_Rating_1_5'].mean()
-    st.metric("Average Rating", f"{avg_rating:.1f}/5")
+    st.metric("Average Rating", f"{kpis['avg_rating']:.1f}/5")
 
 with col3:
-    awareness = (filtered_data['Heard_SYNLAB'].sum() / len(filtered_data)) * 100
-    st.metric("Brand Awareness", f"{awareness:.1f}%")
+    st.metric("Brand Awareness", f"{kpis['awareness']:.1f}%")
 
 with col4:
-    recommendation = ((filtered_data['Recommendation_Score'] >= 4).sum() / len(filtered_data)) * 100
-    st.metric("Recommendation Rate", f"{recommendation:.1f}%")
+    st.metric("Recommendation Rate", f"{kpis['recommendation']:.1f}%")
 
 with col5:
-    usage = (filtered_data['Used_SYNLAB'].sum() / len(filtered_data)) * 100
-    st.metric("Usage Rate", f"{usage:.1f}%")
+    st.metric("Usage Rate", f"{kpis['usage']:.1f}%")
 
 # Charts Row 1
 st.markdown("---")
@@ -87,78 +177,72 @@ st.subheader("📈 Brand Performance")
 col1, col2 = st.columns(2)
 
 with col1:
-    # Brand Awareness Comparison
-    awareness_data = {
-        'Lab': ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal'],
-        'Awareness': [
-            filtered_data['Heard_SYNLAB'].sum(),
-            filtered_data['Heard_Clinix'].sum(),
-            filtered_data['Heard_Mecure'].sum(),
-            filtered_data['Heard_Clina_Lancet'].sum(), 
-            filtered_data['Heard_Afriglobal'].sum()
-        ]
-    }
-    awareness_df = pd.DataFrame(awareness_data)
-    fig1 = px.bar(awareness_df, x='Lab', y='Awareness', 
-                 title="Brand Awareness Comparison",
-                 color='Awareness')
-    st.plotly_chart(fig1, use_container_width=True)
+    show(graph_node(graph, 'awareness_chart', ['filtered_data'], awareness_chart), 'brand_awareness')
 
 with col2:
-    # Rating Distribution
-    fig2 = px.histogram(filtered_data, x='SYNLAB_Rating_1_5',
-                      title="SYNLAB Rating Distribution",
-                      nbins=5,
-                      color_discrete_sequence=['#FF4B4B'])
-    st.plotly_chart(fig2, use_container_width=True)
+    show(graph_node(graph, 'rating_chart', ['filtered_data'], rating_chart), 'rating_distribution')
 
 # Charts Row 2
 col1, col2 = st.columns(2)
 
 with col1:
-    # Familiarity vs Rating
-    familiarity_rating = filtered_data.groupby('Familiarity_with_SYNLAB')['SYNLAB_Rating_1_5'].mean().reset_index()
-    fig3 = px.bar(familiarity_rating, x='Familiarity_with_SYNLAB', y='SYNLAB_Rating_1_5',
-                 title="Average Rating by Familiarity Level",
-                 color='SYNLAB_Rating_1_5')
-    st.plotly_chart(fig3, use_container_width=True)
+    show(graph_node(graph, 'familiarity_chart', ['filtered_data'], familiarity_chart), 'familiarity_levels')
 
 with col2:
-    # Demographic Distribution
-    demo_col = st.selectbox("Select Demographic", ['Age_Group', 'Gender', 'Occupation'])
-    demo_counts = filtered_data[demo_col].value_counts().reset_index()
-    demo_counts.columns = [demo_col, 'Count']
-    fig4 = px.pie(demo_counts, names=demo_col, values='Count',
-                 title=f"Distribution by {demo_col}")
-    st.plotly_chart(fig4, use_container_width=True)
+    graph_input(graph, 'demo_col', st.selectbox("Select Demographic", ['Age_Group', 'Gender', 'Occupation']))
+    show(graph_node(graph, 'demographic_chart', ['filtered_data', 'demo_col'], demographic_chart),
+         'demographic_distribution')
 
 # Competitive Analysis
 st.markdown("---")
 st.subheader("⚔️ Competitive Analysis")
 
-# Usage comparison
-usage_data = {
-    'Lab': ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal'],
-    'Usage_Rate': [
-        (filtered_data['Used_SYNLAB'].sum() / len(filtered_data)) * 100,
-        (filtered_data['Used_Clinix'].sum() / len(filtered_data)) * 100,
-        (filtered_data['Used_Mecure'].sum() / len(filtered_data)) * 100,
-        (filtered_data['Used_Clina_Lancet'].sum() / len(filtered_data)) * 100,
-        (filtered_data['Used_Afriglobal'].sum() / len(filtered_data)) * 100
-    ]
-}
-usage_df = pd.DataFrame(usage_data)
-
-fig5 = px.bar(usage_df, x='Lab', y='Usage_Rate',
-             title="Laboratory Usage Rates",
-             color='Usage_Rate')
-st.plotly_chart(fig5, use_container_width=True)
-
-# Raw Data Preview
+show(graph_node(graph, 'usage_chart', ['filtered_data'], usage_chart), 'lab_usage')
+
+# Raw Data Preview: only the visible page and selected columns are
+# fetched from the data layer and sent to the browser
 if st.checkbox("Show Raw Data"):
     st.subheader("📋 Raw Data Preview")
-    st.dataframe(filtered_data)
+    options = filter_options(data_version_id)
+    
+    table_columns = st.multiselect("Columns", options=list(data.columns), default=DEFAULT_TABLE_COLUMNS)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        table_filter = st.selectbox("Filter column", ['(none)'] + list(options))
+    with col2:
+        table_values = st.multiselect("Values", options=options.get(table_filter, []),
+                                      disabled=table_filter == '(none)')
+    with col3:
+        table_query = st.text_input("Search comments", placeholder='e.g. "quality service" OR price')
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_column = st.selectbox("Sort by", ['(none)'] + table_columns)
+    with col2:
+        sort_ascending = st.radio("Order", ['Ascending', 'Descending'], horizontal=True) == 'Ascending'
+    
+    table_filters = active_filters
+    if table_values:
+        table_filters += ((table_filter, tuple(sorted(table_values))),)
+    if table_query.strip():
+        table_rows = search_rows(data_version_id, table_filters, table_query)
+    else:
+        table_rows = filter_rows(data_version_id, table_filters)
+    table_rows = sorted_rows(data_version_id, table_rows, None if sort_column == '(none)' else sort_column,
+                             sort_ascending)
+    
+    n_pages = max(1, -(-len(table_rows) // TABLE_PAGE_SIZE))
+    page = min(st.number_input("Page", min_value=1, max_value=n_pages, value=1), n_pages) - 1
+    st.dataframe(table_page(data_version_id, table_rows, table_columns, page), use_container_width=True)
+    first_row = page * TABLE_PAGE_SIZE
+    st.caption(f"Rows {min(first_row + 1, len(table_rows)):,}–{min(first_row + TABLE_PAGE_SIZE, len(table_rows)):,} "
+               f"of {len(table_rows):,} (page {page + 1} of {n_pages})")
 
 # Footer
 st.markdown("---")
-st.markdown("SYNLAB Analytics Dashboard • Built with Streamlit")
\ No newline at end of file
+st.markdown("SYNLAB Analytics Dashboard • Built with Streamlit")
+
+graph_panel(graph)
+perf_panel()
+import_panel(__file__)
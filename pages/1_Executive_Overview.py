@@ -1,69 +1,22 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-import base64
-from PIL import Image
-import io
+from synlab.data import get_data
+from synlab.kpis import brand_kpis
+from synlab.figures import plot, render
+from synlab.sentiment import SENTIMENT_LABELS, sentiment_rows, positive_share
+from synlab.imports import import_panel
+from synlab.perf import perf_panel, start_rerun, timed
+from synlab.shell import favicon, page_shell
 
 # Page config
-st.set_page_config(page_title="Executive Overview", page_icon="assets/synlab_favicon.png", layout="wide")
-
-# Function to load and encode images
-def get_image_base64(image_path):
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        return encoded_string
-    except FileNotFoundError:
-        st.error(f"Image file not found: {image_path}")
-        return None
-
-# Function to display logo with proper sizing
-def display_logo(image_path, width=200):
-    try:
-        logo_base64 = get_image_base64(image_path)
-        if logo_base64:
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <img src="data:image/png;base64,{logo_base64}" width="{width}" alt="SYNLAB Logo">
-            </div>
-            """, unsafe_allow_html=True)
-    except Exception as e:
-        st.warning(f"Could not load logo: {e}")
-
-# Custom CSS for this page
-st.markdown("""
-<style>
-    /* Navy Blue Theme for Charts */
-    .chart-container {
-        background-color: #F8F9FA;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 4px solid #0A2647;
-        margin: 10px 0;
-    }
-    
-    /* Metric highlight */
-    .metric-highlight {
-        background: linear-gradient(135deg, #205295, #2C74B3);
-        color: white;
-        padding: 10px;
-        border-radius: 8px;
-        text-align: center;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-display_logo("assets/synlab_logo.jpg", width=200)
+st.set_page_config(page_title="Executive Overview", page_icon=favicon(), layout="wide")
+start_rerun(__file__)
 
+page_shell()
 
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/SYNLAB_Surveydata_AUGMENTED_500.csv")
-data = load_data()
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
 
 
 # Sidebar with themed styling
@@ -85,11 +38,22 @@ occupation_filter = st.sidebar.multiselect(
     default=data['Occupation'].unique()
 )
 
+sentiment_filter = st.sidebar.multiselect(
+    "Feedback Sentiment",
+    options=SENTIMENT_LABELS,
+    default=SENTIMENT_LABELS
+)
+
 # Apply filters
-filtered_data = data[
-    (data['Age_Group'].isin(age_filter)) & 
-    (data['Occupation'].isin(occupation_filter))
-]
+page_filters = (
+    ('Age_Group', tuple(sorted(map(str, age_filter)))),
+    ('Occupation', tuple(sorted(map(str, occupation_filter)))),
+)
+page_sentiment = tuple(sorted(sentiment_filter))
+with timed('filter') as section:
+    page_rows = sentiment_rows(data_version_id, page_filters, page_sentiment)
+    filtered_data = data.iloc[page_rows]
+    section['rows'] = len(data)
 
 # Main content
 st.markdown("""
@@ -113,26 +77,24 @@ def styled_metric(label, value, delta=None):
     </div>
     """
 
+with timed('brand KPIs') as section:
+    kpis = brand_kpis(filtered_data)
+    section['rows'] = len(filtered_data)
+
 with col1:
-    total = len(filtered_data)
-    st.markdown(styled_metric("Total Respondents", str(total)), unsafe_allow_html=True)
+    st.markdown(styled_metric("Total Respondents", f"{int(kpis['Respondents']):,}"), unsafe_allow_html=True)
 
 with col2:
-    awareness = (filtered_data['Heard_SYNLAB'].sum() / total) * 100
-    st.markdown(styled_metric("Brand Awareness", f"{awareness:.1f}%"), unsafe_allow_html=True)
+    st.markdown(styled_metric("Brand Awareness", f"{kpis['Awareness']:.1f}%"), unsafe_allow_html=True)
 
 with col3:
-    avg_rating = filtered_data['SYNLAB_Rating_1_5'].mean()
-    st.markdown(styled_metric("Avg Rating", f"{avg_rating:.1f}/5"), unsafe_allow_html=True)
+    st.markdown(styled_metric("Avg Rating", f"{kpis['Avg_Rating']:.1f}/5"), unsafe_allow_html=True)
 
 with col4:
-    promoters = (filtered_data['Likelihood_to_Recommend'] >= 3).sum()
-    nps = ((promoters / total) * 100) - ((filtered_data['Likelihood_to_Recommend'] <= 2).sum() / total * 100)
-    st.markdown(styled_metric("Net Promoter Score", f"{nps:.0f}"), unsafe_allow_html=True)
+    st.markdown(styled_metric("Net Promoter Score", f"{kpis['NPS']:.0f}"), unsafe_allow_html=True)
 
 with col5:
-    usage = (filtered_data['Used_SYNLAB'].sum() / total) * 100
-    st.markdown(styled_metric("Usage Rate", f"{usage:.1f}%"), unsafe_allow_html=True)
+    st.markdown(styled_metric("Usage Rate", f"{kpis['Usage']:.1f}%"), unsafe_allow_html=True)
 
 # Charts with Navy Blue theme
 st.markdown("---")
@@ -143,45 +105,13 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Brand Awareness Comparison with theme colors
-    awareness_data = {
-        'Lab': ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal'],
-        'Awareness': [
-            filtered_data['Heard_SYNLAB'].sum(),
-            filtered_data['Heard_Clinix'].sum(),
-            filtered_data['Heard_Mecure'].sum(),
-            filtered_data['Heard_Clina_Lancet'].sum(), 
-            filtered_data['Heard_Afriglobal'].sum()
-        ]
-    }
-    awareness_df = pd.DataFrame(awareness_data)
-    
-    fig1 = px.bar(awareness_df, x='Lab', y='Awareness', 
-                 title="🚀 Brand Awareness Comparison",
-                 color='Awareness',
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
-    
-    fig1.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color="#0A2647")
-    )
-    st.plotly_chart(fig1, use_container_width=True)
+    plot('lab_awareness', data_version_id, page_filters, page_sentiment)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Rating Distribution with theme colors
-    fig2 = px.histogram(filtered_data, x='SYNLAB_Rating_1_5',
-                      title="⭐ SYNLAB Rating Distribution",
-                      nbins=5,
-                      color_discrete_sequence=['#0A2647'])
-    
-    fig2.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color="#0A2647")
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    plot('rating_distribution', data_version_id, page_filters, page_sentiment)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # More charts with theme
@@ -190,36 +120,32 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Familiarity vs Rating
-    familiarity_rating = filtered_data.groupby('Familiarity_with_SYNLAB')['SYNLAB_Rating_1_5'].mean().reset_index()
-    fig3 = px.bar(familiarity_rating, x='Familiarity_with_SYNLAB', y='SYNLAB_Rating_1_5',
-                 title="📊 Average Rating by Familiarity Level",
-                 color='SYNLAB_Rating_1_5',
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
+    with timed("chart: rating_by_familiarity") as section:
+        familiarity_rating = filtered_data.groupby('Familiarity_with_SYNLAB')['SYNLAB_Rating_1_5'].mean().reset_index()
+        fig3 = px.bar(familiarity_rating, x='Familiarity_with_SYNLAB', y='SYNLAB_Rating_1_5',
+                     title="📊 Average Rating by Familiarity Level",
+                     color='SYNLAB_Rating_1_5',
+                     color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
     
-    fig3.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color="#0A2647")
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+        fig3.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color="#0A2647")
+        )
+        render(fig3, 'rating_by_familiarity', section)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Recommendation Distribution
-    rec_counts = filtered_data['Likelihood_to_Recommend'].value_counts().sort_index()
-    fig4 = px.pie(values=rec_counts.values, names=rec_counts.index,
-                 title="💫 Recommendation Likelihood",
-                 color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3', '#F8F9FA'])
-    
-    fig4.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color="#0A2647")
-    )
-    st.plotly_chart(fig4, use_container_width=True)
+    plot('recommendation_likelihood', data_version_id, page_filters, page_sentiment)
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Feedback sentiment by segment
+st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+plot('sentiment_by_age', data_version_id, page_filters, page_sentiment)
+st.markdown('</div>', unsafe_allow_html=True)
+
 # Quick Insights Cards
 st.subheader("🚀 Performance Snapshot")
 
@@ -236,8 +162,10 @@ with col1:
     """, unsafe_allow_html=True)
 
 with col2:
-    # Sentiment Score
-    positive_sentiment = (filtered_data['SYNLAB_Rating_1_5'] >= 4).sum() / len(filtered_data) * 100
+    # Sentiment Score from lexicon scoring of free-text feedback
+    with timed('positive share') as section:
+        positive_sentiment = positive_share(data_version_id, filtered_data.index.to_numpy())
+        section['rows'] = len(filtered_data)
     st.markdown(f"""
     <div class="metric-highlight">
         <h3>{positive_sentiment:.1f}%</h3>
@@ -296,4 +224,7 @@ st.markdown("""
 <div style='background-color: #0A2647; color: white; padding: 15px; border-radius: 10px; text-align: center;'>
     <p>SYNLAB Executive Overview</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+perf_panel()
+import_panel(__file__)
@@ -1,56 +1,21 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
-import base64
-from PIL import Image
-import io
-
-st.set_page_config(page_title="Customer Insights", page_icon="assets/synlab_favicon.png", layout="wide")
-
-# Function to load and encode images
-def get_image_base64(image_path):
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        return encoded_string
-    except FileNotFoundError:
-        st.error(f"Image file not found: {image_path}")
-        return None
-
-# Function to display logo with proper sizing
-def display_logo(image_path, width=200):
-    try:
-        logo_base64 = get_image_base64(image_path)
-        if logo_base64:
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <img src="data:image/png;base64,{logo_base64}" width="{width}" alt="SYNLAB Logo">
-            </div>
-            """, unsafe_allow_html=True)
-    except Exception as e:
-        st.warning(f"Could not load logo: {e}")
-
-# Custom CSS for Navy Blue Theme
-st.markdown("""
-<style>
-    .chart-container {
-        background-color: #F8F9FA;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 4px solid #0A2647;
-        margin: 10px 0;
-    }
-    
-    .metric-highlight {
-        background: linear-gradient(135deg, #205295, #2C74B3);
-        color: white;
-        padding: 10px;
-        border-radius: 8px;
-        text-align: center;
-    }
-    
+import plotly.express as px
+from synlab.data import get_data, filter_state, filtered_frame
+from synlab.segments import SEGMENTS, segment_codes
+from synlab.geo import MAP_POINT_THRESHOLD, spatial_bins
+from synlab.geocode import area_validation
+from synlab.figures import plot, render
+from synlab.charts import segment_shares
+from synlab.imports import import_panel
+from synlab.perf import perf_panel, start_rerun, timed
+from synlab.shell import favicon, page_shell
+
+st.set_page_config(page_title="Customer Insights", page_icon=favicon(), layout="wide")
+start_rerun(__file__)
+
+# Styles specific to this page; the shared theme lives in pages/app.css
+PAGE_CSS = """
     .insight-card {
         background: linear-gradient(135deg, #144272, #205295);
         color: white;
@@ -99,16 +64,16 @@ st.markdown("""
         border-radius: 10px;
         margin: 5px 0;
     }
-</style>
-""", unsafe_allow_html=True)
+"""
+page_shell(PAGE_CSS)
 
-display_logo("assets/synlab_logo.jpg", width=200)
-
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/SYNLAB_Surveydata_AUGMENTED_500.csv")
-
-filtered_data = load_data()
+active_filters = filter_state()
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
+with timed('filter') as section:
+    filtered_data = filtered_frame(data_version_id, active_filters)
+    section['rows'] = len(data)
 
 # Page Header
 st.markdown("""
@@ -118,25 +83,19 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Create customer segments
-def create_segments(data):
-    conditions = [
-        (data['Familiarity_Score'] >= 2.5) & (data['SYNLAB_Rating_1_5'] >= 4) & (data['Used_SYNLAB'] == True),
-        (data['Familiarity_Score'] >= 2.5) & (data['SYNLAB_Rating_1_5'] < 4) & (data['Used_SYNLAB'] == True),
-        (data['Familiarity_Score'] < 2.5) & (data['Used_SYNLAB'] == True),
-        (data['Familiarity_Score'] < 2.5) & (data['Used_SYNLAB'] == False) & (data['Heard_SYNLAB'] == True)
-    ]
-    choices = ['Champions', 'At Risk', 'New Users', 'Prospects']
-    return np.select(conditions, choices, default='Others')
-
-filtered_data['Segment'] = create_segments(filtered_data)
+with timed('segments') as section:
+    segment_index = filtered_data.index.to_numpy()
+    filtered_data = filtered_data.assign(Segment=np.array(SEGMENTS)[segment_codes(data_version_id)[segment_index]])
+    section['rows'] = len(filtered_data)
 
 # Customer Segments KPI with explanations
 st.subheader("🎯 Customer Segments Overview")
 
 col1, col2, col3, col4 = st.columns(4)
 
-segment_percentages = (filtered_data['Segment'].value_counts(normalize=True) * 100).round(1)
+with timed('segment shares') as section:
+    segment_percentages = segment_shares(data_version_id, active_filters)
+    section['rows'] = len(filtered_data)
 
 with col1:
     champions_pct = segment_percentages.get('Champions', 0)
@@ -232,11 +191,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    fig4 = px.pie(values=segment_percentages.values, names=segment_percentages.index, 
-                 title="🎪 Customer Segments Distribution",
-                 color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3', '#F8F9FA'])
-    fig4.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig4, use_container_width=True)
+    plot('segment_distribution', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
@@ -276,52 +231,67 @@ col1, col2, col3 = st.columns(3)
 
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    age_counts = filtered_data['Age_Group'].value_counts()
-    fig1 = px.pie(values=age_counts.values, names=age_counts.index, 
-                 title="👥 Age Distribution",
-                 color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3'])
-    fig1.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig1, use_container_width=True)
+    plot('age_distribution', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    gender_counts = filtered_data['Gender'].value_counts()
-    fig2 = px.bar(x=gender_counts.index, y=gender_counts.values, 
-                 title="🚻 Gender Distribution",
-                 color_discrete_sequence=['#205295'])
-    fig2.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="", yaxis_title="Count")
-    st.plotly_chart(fig2, use_container_width=True)
+    plot('gender_distribution', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col3:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    occupation_counts = filtered_data['Occupation'].value_counts().head(8)
-    fig3 = px.bar(x=occupation_counts.values, y=occupation_counts.index, 
-                 title="💼 Top Occupations", orientation='h',
-                 color_discrete_sequence=['#2C74B3'])
-    fig3.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="Count", yaxis_title="")
-    st.plotly_chart(fig3, use_container_width=True)
+    plot('occupation_distribution', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Geographic Distribution (if available)
 if 'Latitude' in filtered_data.columns and 'Longitude' in filtered_data.columns:
     st.subheader("🗺️ Geographic Distribution")
     
+    map_zoom = st.slider("Map detail (zoom level)", min_value=8, max_value=14, value=10)
+    
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Simple scatter map with theme colors
-    fig7 = px.scatter_mapbox(filtered_data, 
-                           lat="Latitude", lon="Longitude",
-                           color="Segment",
-                           color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3'],
-                           size_max=15,
-                           zoom=10,
-                           title="📍 Customer Distribution by Segment")
-    fig7.update_layout(mapbox_style="open-street-map")
-    st.plotly_chart(fig7, use_container_width=True)
+    with timed("chart: segment_map") as section:
+        if len(filtered_data) > MAP_POINT_THRESHOLD:
+            # Aggregate server-side so only grid cells are sent to the browser
+            map_bins = spatial_bins(data_version_id, active_filters, map_zoom)
+            fig7 = px.scatter_mapbox(map_bins,
+                                   lat="Latitude", lon="Longitude",
+                                   size="Respondents",
+                                   color="Segment",
+                                   hover_data=['Respondents', 'Champions', 'At Risk', 'New Users', 'Prospects', 'Others'],
+                                   color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3'],
+                                   size_max=30,
+                                   zoom=map_zoom,
+                                   title="📍 Customer Distribution by Segment (grid cells, dominant segment)")
+            st.caption(f"{len(filtered_data):,} respondents aggregated into {len(map_bins):,} grid cells")
+        else:
+            # Simple scatter map with theme colors
+            fig7 = px.scatter_mapbox(filtered_data, 
+                                   lat="Latitude", lon="Longitude",
+                                   color="Segment",
+                                   color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3'],
+                                   size_max=15,
+                                   zoom=map_zoom,
+                                   title="📍 Customer Distribution by Segment")
+        fig7.update_layout(mapbox_style="open-street-map")
+        render(fig7, 'segment_map', section)
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Survey Area labels checked against the nearest reference centroid
+    with timed('area validation') as section:
+        area_check = area_validation(data_version_id, active_filters)
+        section['rows'] = len(filtered_data)
+    agreement = (area_check['Match_Rate'] * area_check['Respondents']).sum() / max(area_check['Respondents'].sum(), 1)
+    st.markdown(f"""
+    <div class="insight-card">
+        <h4>🧭 Location Data Quality</h4>
+        <p><strong>{agreement:.1f}%</strong> of respondents' Area labels agree with their coordinates</p>
+        <p>Areas are assigned to the nearest reference centroid in data/lagos_areas.csv</p>
+    </div>
+    """, unsafe_allow_html=True)
+    with st.expander("Area label vs coordinate check"):
+        st.dataframe(area_check.round(1), use_container_width=True)
 else:
     st.markdown("""
     <div class="insight-card">
@@ -392,4 +362,7 @@ st.markdown("""
 <div style='background-color: #0A2647; color: white; padding: 15px; border-radius: 10px; text-align: center;'>
     <p>SYNLAB Customer Insights • Advanced Segmentation</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+perf_panel()
+import_panel(__file__)
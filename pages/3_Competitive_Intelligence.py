@@ -1,57 +1,20 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-import base64
-from PIL import Image
-import io
-
-st.set_page_config(page_title="Competitive Intelligence", page_icon="assets/synlab_favicon.png", layout="wide")
-
-# Function to load and encode images
-def get_image_base64(image_path):
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        return encoded_string
-    except FileNotFoundError:
-        st.error(f"Image file not found: {image_path}")
-        return None
-
-# Function to display logo with proper sizing
-def display_logo(image_path, width=200):
-    try:
-        logo_base64 = get_image_base64(image_path)
-        if logo_base64:
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <img src="data:image/png;base64,{logo_base64}" width="{width}" alt="SYNLAB Logo">
-            </div>
-            """, unsafe_allow_html=True)
-    except Exception as e:
-        st.warning(f"Could not load logo: {e}")
-
-# Custom CSS for Navy Blue Theme
-st.markdown("""
-<style>
-    .chart-container {
-        background-color: #F8F9FA;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 4px solid #0A2647;
-        margin: 10px 0;
-    }
-    
-    .metric-highlight {
-        background: linear-gradient(135deg, #205295, #2C74B3);
-        color: white;
-        padding: 10px;
-        border-radius: 8px;
-        text-align: center;
-    }
-    
+from synlab.data import get_data, filter_state
+from synlab.geo import catchment_kpis
+from synlab.figures import plot, render
+from synlab.charts import lab_rates
+from synlab.imports import import_panel
+from synlab.labnames import lab_name_mapping, load_mapping, mapping_table
+from synlab.perf import perf_panel, records_fragment, start_rerun, timed
+from synlab.shell import favicon, page_shell
+
+st.set_page_config(page_title="Competitive Intelligence", page_icon=favicon(), layout="wide")
+start_rerun(__file__)
+
+# Styles specific to this page; the shared theme lives in pages/app.css
+PAGE_CSS = """
     .competitor-card {
         background: linear-gradient(135deg, #144272, #205295);
         color: white;
@@ -75,15 +38,13 @@ st.markdown("""
         border-radius: 10px;
         margin: 10px 0;
     }
-</style>
-""", unsafe_allow_html=True)
+"""
+page_shell(PAGE_CSS)
 
-display_logo("assets/synlab_logo.jpg", width=200)
-
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/SYNLAB_Surveydata_AUGMENTED_500.csv")
-data = load_data()
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
+active_filters = filter_state()
 
 
 # Page Header
@@ -99,20 +60,13 @@ st.subheader("🏆 Competitive Landscape")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
-# Calculate competitive metrics
-labs = ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal']
-awareness_rates = []
-usage_rates = []
-
-for lab in labs:
-    heard_col = f'Heard_{lab.replace(" ", "_")}'
-    used_col = f'Used_{lab.replace(" ", "_")}'
-    
-    awareness = (data[heard_col].sum() / len(data)) * 100
-    usage = (data[used_col].sum() / len(data)) * 100
-    
-    awareness_rates.append(awareness)
-    usage_rates.append(usage)
+# Calculate competitive metrics (the landscape covers all respondents)
+with timed('lab rates') as section:
+    rates = lab_rates(data_version_id, ())
+    section['rows'] = len(data)
+labs = rates['Lab'].tolist()
+awareness_rates = rates['Awareness'].tolist()
+usage_rates = rates['Usage'].tolist()
 
 for i, lab in enumerate(labs):
     with [col1, col2, col3, col4, col5][i]:
@@ -131,27 +85,56 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Awareness Market Share
-    awareness_df = pd.DataFrame({'Lab': labs, 'Awareness': awareness_rates})
-    fig1 = px.pie(awareness_df, values='Awareness', names='Lab',
-                 title="🎯 Brand Awareness Market Share",
-                 color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3', '#F8F9FA'])
-    fig1.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig1, use_container_width=True)
+    plot('awareness_share', data_version_id, ())
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Usage Market Share
-    usage_df = pd.DataFrame({'Lab': labs, 'Usage': usage_rates})
-    fig2 = px.bar(usage_df, x='Lab', y='Usage',
-                 title="📈 Laboratory Usage Rates",
-                 color='Usage',
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
-    fig2.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="", yaxis_title="Usage Rate (%)")
-    st.plotly_chart(fig2, use_container_width=True)
+    plot('usage_rates', data_version_id, ())
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Wider competitor set from canonicalized free-text lab names
+st.subheader("🔭 Competitors Named by Respondents")
+
+st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+plot('named_competitors', data_version_id, active_filters)
+st.markdown('</div>', unsafe_allow_html=True)
+
+with st.expander("Lab name mapping"):
+    st.caption("How written answers map to canonical lab names. New spellings are not yet in "
+               "data/lab_name_mapping.json; add them with `python -m synlab lab-names --write`.")
+    st.dataframe(mapping_table(lab_name_mapping(data_version_id), load_mapping()),
+                 use_container_width=True, hide_index=True)
+
+# Branch catchments from the respondent spatial index
+st.subheader("📍 Branch Catchment Analysis")
+
+# Moving the radius slider reruns only this section
+@st.fragment
+@records_fragment
+def branch_catchments(version, filters):
+    catchment_radius = st.slider("Catchment radius (km)", min_value=1.0, max_value=10.0, value=3.0, step=0.5)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        plot('catchments', version, filters, catchment_radius, radius_km=catchment_radius)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        plot('distance_usage', version, filters)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with timed('catchment KPIs'):
+        catchments = catchment_kpis(version, filters, catchment_radius)
+    st.dataframe(catchments.round(1), use_container_width=True, hide_index=True)
+
+
+branch_catchments(data_version_id, active_filters)
+
 # Competitive Positioning
 st.subheader("🎯 Competitive Positioning")
 
@@ -162,187 +145,32 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
 
-    # Create line chart for Awareness vs Usage
-    positioning_df = pd.DataFrame({
-        'Lab': labs,
-        'Awareness': awareness_rates,
-        'Usage': usage_rates
-    })
-
-    # Sort by Awareness for better line visualization
-    positioning_df = positioning_df.sort_values('Awareness')
-
-    fig3 = go.Figure()
-
-    # Add grid lines for better readability
-    for y in [10, 20, 30, 40, 50]:
-        fig3.add_hline(y=y, line=dict(color="rgba(128, 128, 128, 0.2)", width=1, dash="dash"))
-    for x in [20, 30, 40, 50]:
-        fig3.add_vline(x=x, line=dict(color="rgba(128, 128, 128, 0.2)", width=1, dash="dash"))
-
-    # Add Usage line (Primary metric from screenshot)
-    fig3.add_trace(go.Scatter(
-        x=positioning_df['Awareness'],
-        y=positioning_df['Usage'],
-        mode='lines+markers+text',
-        text=positioning_df['Lab'],
-        textposition="top center",
-        name='Usage Rate (%)',
-        line=dict(color='#0A2647', width=3),
-        marker=dict(size=12, color='#0A2647', symbol='circle'),
-        hovertemplate='<b>%{text}</b><br>Awareness: %{x:.1f}%<br>Usage: %{y:.1f}%<extra></extra>'
-    ))
-
-    # Highlight specific competitors as shown in screenshot
-    # Add special markers for key competitors
-    competitors_to_highlight = {
-        'Clinix': {'color': '#8B0000', 'symbol': 'square'},
-        'Mecure': {'color': '#205295', 'symbol': 'diamond'},
-        'Clina Lancet': {'color': '#2C74B3', 'symbol': 'star'},
-        'Afriglobal': {'color': '#32CD32', 'symbol': 'triangle-up'}
-    }
-
-    for lab, style in competitors_to_highlight.items():
-        if lab in positioning_df['Lab'].values:
-            lab_data = positioning_df[positioning_df['Lab'] == lab].iloc[0]
-            fig3.add_trace(go.Scatter(
-                x=[lab_data['Awareness']],
-                y=[lab_data['Usage']],
-                mode='markers',
-                marker=dict(
-                    size=20,
-                    color=style['color'],
-                    symbol=style['symbol'],
-                    line=dict(width=2, color='white')
-                ),
-                name=lab,
-                showlegend=False,
-                hovertemplate=f'<b>{lab}</b><br>Awareness: %{{x:.1f}}%<br>Usage: %{{y:.1f}}%<extra></extra>'
-            ))
-
-    # Add SYNLAB with special styling
-    synlab_data = positioning_df[positioning_df['Lab'] == 'SYNLAB']
-    if not synlab_data.empty:
-        synlab_data = synlab_data.iloc[0]
-        fig3.add_trace(go.Scatter(
-            x=[synlab_data['Awareness']],
-            y=[synlab_data['Usage']],
-            mode='markers',
-            marker=dict(
-                size=25,
-                color='#FFD700',  # Gold color for market leader
-                symbol='star',
-                line=dict(width=3, color='#FF4500')
-            ),
-            name='SYNLAB (Market Leader)',
-            hovertemplate='<b>SYNLAB (Market Leader)</b><br>Awareness: %{x:.1f}%<br>Usage: %{y:.1f}%<extra></extra>'
-        ))
-
-    # Update layout to match screenshot style
-    fig3.update_layout(
-        title="🎯 Awareness vs Usage Positioning",
-        xaxis=dict(
-            title="Awareness Rate (%)",
-            range=[15, 55],
-            tickmode='linear',
-            tick0=20,
-            dtick=10,
-            gridcolor='rgba(128, 128, 128, 0.1)'
-        ),
-        yaxis=dict(
-            title="Usage Rate (%)",
-            range=[15, 35],
-            tickmode='linear',
-            tick0=15,
-            dtick=5,
-            gridcolor='rgba(128, 128, 128, 0.1)'
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255, 255, 255, 0.8)'
-        ),
-        hovermode='closest',
-        margin=dict(t=50, l=50, r=50, b=50)
-    )
-
-    # Add quadrant lines at the median
-    median_awareness = positioning_df['Awareness'].median()
-    median_usage = positioning_df['Usage'].median()
-
-    fig3.add_shape(
-        type="line",
-        x0=median_awareness, y0=15,
-        x1=median_awareness, y1=35,
-        line=dict(color="rgba(0, 0, 0, 0.3)", width=1, dash="dot")
-    )
-
-    fig3.add_shape(
-        type="line",
-        x0=15, y0=median_usage,
-        x1=55, y1=median_usage,
-        line=dict(color="rgba(0, 0, 0, 0.3)", width=1, dash="dot")
-    )
-
-    # Add quadrant labels
-    fig3.add_annotation(
-        x=25, y=32,
-        text="low Awareness, High Usage",
-        showarrow=False,
-        font=dict(size=10, color="orange")
-    )
-
-    fig3.add_annotation(
-        x=45, y=18,
-        text="High Awareness, low Usage",
-        showarrow=False,
-        font=dict(size=10, color="green")
-    )
-
-    fig3.add_annotation(
-        x=25, y=18,
-        text="Low Awareness, Low Usage",
-        showarrow=False,
-        font=dict(size=10, color="red")
-    )
-
-    fig3.add_annotation(
-        x=45, y=32,
-        text="High Awareness, High Usage",
-        showarrow=False,
-        font=dict(size=10, color="blue")
-    )
-
-    st.plotly_chart(fig3, use_container_width=True)
+    # Awareness vs Usage line with competitor highlights and quadrants
+    plot('positioning', data_version_id, ())
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Market Share Trends (simulated)
-    segments = ['Youth', 'Professionals', 'Seniors', 'Healthcare']
-    synlab_share = [45, 38, 52, 60]
-    clinix_share = [35, 42, 30, 25]
+    with timed("chart: segment_share_trends") as section:
+        segments = ['Youth', 'Professionals', 'Seniors', 'Healthcare']
+        synlab_share = [45, 38, 52, 60]
+        clinix_share = [35, 42, 30, 25]
     
-    fig4 = go.Figure()
+        fig4 = go.Figure()
     
-    fig4.add_trace(go.Scatter(x=segments, y=synlab_share, mode='lines+markers',
-                            name='SYNLAB', line=dict(color='#0A2647', width=3)))
-    fig4.add_trace(go.Scatter(x=segments, y=clinix_share, mode='lines+markers',
-                            name='Clinix', line=dict(color='#8B0000', width=3)))
+        fig4.add_trace(go.Scatter(x=segments, y=synlab_share, mode='lines+markers',
+                                name='SYNLAB', line=dict(color='#0A2647', width=3)))
+        fig4.add_trace(go.Scatter(x=segments, y=clinix_share, mode='lines+markers',
+                                name='Clinix', line=dict(color='#8B0000', width=3)))
     
-    fig4.update_layout(title="📊 Market Share by Segment",
-                      xaxis_title="Customer Segment",
-                      yaxis_title="Market Share (%)",
-                      plot_bgcolor='rgba(0,0,0,0)',
-                      paper_bgcolor='rgba(0,0,0,0)')
+        fig4.update_layout(title="📊 Market Share by Segment",
+                          xaxis_title="Customer Segment",
+                          yaxis_title="Market Share (%)",
+                          plot_bgcolor='rgba(0,0,0,0)',
+                          paper_bgcolor='rgba(0,0,0,0)')
     
-    st.plotly_chart(fig4, use_container_width=True)
+        render(fig4, 'segment_share_trends', section)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Competitive Threat Assessment
@@ -582,3 +410,6 @@ st.markdown("""
     <p>SYNLAB Competitive Intelligence •</p>
 </div>
 """, unsafe_allow_html=True)
+
+perf_panel()
+import_panel(__file__)
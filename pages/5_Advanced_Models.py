@@ -1,65 +1,28 @@
+import html
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import re
-from collections import Counter
+import time
 import warnings
 warnings.filterwarnings('ignore')
-import base64
-from PIL import Image
-import io
-
-st.set_page_config(page_title="Advanced Models", page_icon="assets/synlab_favicon.png", layout="wide")
-
-# Function to load and encode images
-def get_image_base64(image_path):
-    try:
-        with open(image_path, "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        return encoded_string
-    except FileNotFoundError:
-        st.error(f"Image file not found: {image_path}")
-        return None
-
-# Function to display logo with proper sizing
-def display_logo(image_path, width=200):
-    try:
-        logo_base64 = get_image_base64(image_path)
-        if logo_base64:
-            st.markdown(f"""
-            <div style="text-align: center; margin-bottom: 2rem;">
-                <img src="data:image/png;base64,{logo_base64}" width="{width}" alt="SYNLAB Logo">
-            </div>
-            """, unsafe_allow_html=True)
-    except Exception as e:
-        st.warning(f"Could not load logo: {e}")
-
-# Custom CSS for Navy Blue Theme
-st.markdown("""
-<style>
-    .chart-container {
-        background-color: #F8F9FA;
-        padding: 15px;
-        border-radius: 10px;
-        border-left: 4px solid #0A2647;
-        margin: 10px 0;
-    }
-    
-    .metric-highlight {
-        background: linear-gradient(135deg, #205295, #2C74B3);
-        color: white;
-        padding: 10px;
-        border-radius: 8px;
-        text-align: center;
-    }
-    
+from synlab.data import get_data, filter_state
+from synlab.churn import RISK_BINS, RISK_SEGMENTS, churn_feature_matrix, train_churn_model
+from synlab.clv import CLV_SEGMENTS, clv_boundaries, score_clv
+from synlab.text import top_words
+from synlab.search import PAGE_SIZE, search_rows, result_page, highlight
+from synlab.figures import plot, render
+from synlab.geocode import area_kpis
+from synlab.shrinkage import INTERVAL_LEVEL, SHRINKAGE_RATES
+from synlab.imports import import_panel
+from synlab.perf import perf_panel, records_fragment, start_rerun, timed
+from synlab.shell import favicon, page_shell
+
+st.set_page_config(page_title="Advanced Models", page_icon=favicon(), layout="wide")
+start_rerun(__file__)
+
+# Styles specific to this page; the shared theme lives in pages/app.css
+PAGE_CSS = """
     .model-card {
         background: linear-gradient(135deg, #144272, #205295);
         color: white;
@@ -83,16 +46,13 @@ st.markdown("""
         border-radius: 10px;
         margin: 10px 0;
     }
-</style>
-""", unsafe_allow_html=True)
-
-display_logo("assets/synlab_logo.jpg", width=200)
-
+"""
+page_shell(PAGE_CSS)
 
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/SYNLAB_Surveydata_AUGMENTED_500.csv")
-data = load_data()
+with timed('load data') as section:
+    data_version_id, data = get_data()
+    section['rows'] = len(data)
+active_filters = filter_state()
 
 # Page Header
 st.markdown("""
@@ -147,43 +107,17 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     
-    # Simulate churn prediction (since we don't have actual churn data)
-    np.random.seed(42)
-    data['Churn_Risk'] = np.random.normal(0.3, 0.15, len(data))
-    data['Churn_Risk'] = np.clip(data['Churn_Risk'], 0, 1)
-    
-    # Create risk segments
-    data['Risk_Segment'] = pd.cut(data['Churn_Risk'], 
-                                bins=[0, 0.2, 0.5, 1],
-                                labels=['Low Risk', 'Medium Risk', 'High Risk'])
-    
-    risk_counts = data['Risk_Segment'].value_counts()
-    
-    fig1 = px.pie(values=risk_counts.values, names=risk_counts.index,
-                 title="🎯 Customer Churn Risk Distribution",
-                 color_discrete_sequence=['#228B22', '#FF8C00', '#B22222'])
-    
-    fig1.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-    st.plotly_chart(fig1, use_container_width=True)
+    # Churn risk scored by the trained model
+    with timed('churn model') as section:
+        churn_model = train_churn_model(data_version_id)
+        section['rows'] = len(data)
+    plot('churn_risk', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Feature importance for churn prediction
-    feature_importance = {
-        'Feature': ['Rating', 'Familiarity', 'Recommendation', 'Age', 'Usage Frequency', 'Service Quality'],
-        'Importance': [0.35, 0.25, 0.15, 0.10, 0.08, 0.07]
-    }
-    feature_df = pd.DataFrame(feature_importance).sort_values('Importance', ascending=True)
-    
-    fig2 = px.bar(feature_df, x='Importance', y='Feature', orientation='h',
-                 title="🔍 Churn Prediction Feature Importance",
-                 color='Importance',
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
-    
-    fig2.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="Importance Score", yaxis_title="")
-    st.plotly_chart(fig2, use_container_width=True)
+    # Permutation feature importance of the trained churn model
+    plot('churn_importance', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Customer Lifetime Value Prediction
@@ -193,87 +127,76 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Simulate CLV segments
-    data['CLV_Score'] = np.random.normal(75, 25, len(data))
-    data['CLV_Score'] = np.clip(data['CLV_Score'], 20, 150)
-    
-    data['CLV_Segment'] = pd.cut(data['CLV_Score'],
-                               bins=[0, 50, 80, 150],
-                               labels=['Low Value', 'Medium Value', 'High Value'])
-    
-    clv_counts = data['CLV_Segment'].value_counts()
-    
-    fig3 = px.bar(x=clv_counts.index, y=clv_counts.values,
-                 title="💎 Customer Lifetime Value Segments",
-                 color=clv_counts.values,
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272'])
-    
-    fig3.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="CLV Segment", yaxis_title="Number of Customers",
-                     showlegend=False)
-    st.plotly_chart(fig3, use_container_width=True)
+    # CLV estimated from survey signals, segmented by dataset tertiles
+    plot('clv_segments', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # CLV by demographic
-    clv_by_age = data.groupby('Age_Group')['CLV_Score'].mean().sort_values(ascending=True)
-    
-    fig4 = px.bar(x=clv_by_age.values, y=clv_by_age.index, orientation='h',
-                 title="👥 Average CLV by Age Group",
-                 color=clv_by_age.values,
-                 color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
-    
-    fig4.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="Average CLV Score", yaxis_title="Age Group",
-                     showlegend=False)
-    st.plotly_chart(fig4, use_container_width=True)
+    plot('clv_by_age', data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Topic Modeling & NLP Analysis
 st.subheader("📝 Topic Modeling & Text Analysis")
 
-# Simulate text analysis on suggestions
-if 'Additional_Suggestions' in data.columns:
-    suggestions = data['Additional_Suggestions'].dropna()
-    
-    # Simple keyword extraction
-    all_suggestions = ' '.join(suggestions.astype(str))
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', all_suggestions.lower())
-    
-    # Remove common words
-    stop_words = {'please', 'would', 'like', 'better', 'good', 'great', 'service', 'lab', 'synlab'}
-    filtered_words = [word for word in words if word not in stop_words]
-    
-    word_freq = Counter(filtered_words).most_common(15)
-    topic_words, topic_counts = zip(*word_freq)
-    
+# Word counts and NMF topics from the cached text index
+if not top_words(data_version_id, active_filters).empty:
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig5 = px.bar(x=topic_counts, y=topic_words, orientation='h',
-                     title="🔤 Most Frequent Words in Suggestions",
-                     color=topic_counts,
-                     color_continuous_scale=['#2C74B3', '#205295', '#144272', '#0A2647'])
-        
-        fig5.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                         xaxis_title="Frequency", yaxis_title="Words",
-                         showlegend=False)
-        st.plotly_chart(fig5, use_container_width=True)
+        plot('top_words', data_version_id, active_filters)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        # Word cloud simulation using bar chart
-        fig6 = px.pie(values=topic_counts[:8], names=topic_words[:8],
-                     title="☁️ Top Topics in Customer Feedback",
-                     color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3', 
-                                           '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
-        
-        fig6.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig6, use_container_width=True)
+        # Topic share of the filtered responses, labelled by top words
+        plot('topics', data_version_id, active_filters)
         st.markdown('</div>', unsafe_allow_html=True)
+else:
+    st.info("No free-text feedback for the current filters.")
+
+# Full-text search over verbatim comments
+st.subheader("🔎 Search Customer Comments")
+
+# Sections with their own widgets run as fragments: changing their inputs
+# reruns just that section, not the models and charts around it
+@st.fragment
+@records_fragment
+def comment_search(data, version, filters):
+    query = st.text_input("Search suggestions and lab preference reasons",
+                          placeholder='e.g. results HMO OR "close to home"',
+                          help='Words are AND-ed, OR combines alternatives and quotes match an exact phrase.')
+
+    if query.strip():
+        with timed('search') as section:
+            search_start = time.perf_counter()
+            matched_rows = search_rows(version, filters, query)
+            search_ms = (time.perf_counter() - search_start) * 1000
+            section['rows'] = len(data)
+
+        page_count = max(1, -(-len(matched_rows) // PAGE_SIZE))
+        result_col1, result_col2 = st.columns([3, 1])
+        with result_col1:
+            st.caption(f"{len(matched_rows):,} matching responses in {search_ms:.1f} ms")
+        with result_col2:
+            result_page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+
+        for row, texts in result_page(version, matched_rows, result_page_number - 1):
+            answers = "".join(
+                f"<p><strong>{column.replace('_', ' ')}:</strong> {highlight(text, query)}</p>"
+                for column, text in texts.items()
+            )
+            st.markdown(f"""
+            <div class="insight-card">
+                <p style="opacity: 0.8;">Response #{row + 1} • {html.escape(str(data['Age_Group'].iat[row]))} • {html.escape(str(data['Area'].iat[row]))}</p>
+                {answers}
+            </div>
+            """, unsafe_allow_html=True)
+
+
+comment_search(data, data_version_id, active_filters)
 
 # Advanced Clustering
 st.subheader("🎯 Advanced Customer Clustering")
@@ -283,21 +206,22 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # K-means clustering simulation
-    np.random.seed(42)
-    cluster_data = data[['SYNLAB_Rating_1_5', 'Familiarity_Score', 'Likelihood_to_Recommend']].copy()
-    
-    # Add some noise for clustering
-    cluster_data['Cluster'] = np.random.choice([0, 1, 2], len(cluster_data), p=[0.4, 0.35, 0.25])
-    
-    fig7 = px.scatter(cluster_data, x='SYNLAB_Rating_1_5', y='Familiarity_Score',
-                     color=cluster_data['Cluster'].astype(str),
-                     title="🎪 Customer Clustering Analysis",
-                     color_discrete_sequence=['#0A2647', '#144272', '#205295'],
-                     labels={'color': 'Cluster'})
-    
-    fig7.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="SYNLAB Rating", yaxis_title="Familiarity Score")
-    st.plotly_chart(fig7, use_container_width=True)
+    with timed("chart: clustering") as section:
+        np.random.seed(42)
+        cluster_data = data[['SYNLAB_Rating_1_5', 'Familiarity_Score', 'Likelihood_to_Recommend']].copy()
+    
+        # Add some noise for clustering
+        cluster_data['Cluster'] = np.random.choice([0, 1, 2], len(cluster_data), p=[0.4, 0.35, 0.25])
+    
+        fig7 = px.scatter(cluster_data, x='SYNLAB_Rating_1_5', y='Familiarity_Score',
+                         color=cluster_data['Cluster'].astype(str),
+                         title="🎪 Customer Clustering Analysis",
+                         color_discrete_sequence=['#0A2647', '#144272', '#205295'],
+                         labels={'color': 'Cluster'})
+    
+        fig7.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                         xaxis_title="SYNLAB Rating", yaxis_title="Familiarity Score")
+        render(fig7, 'clustering', section)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
@@ -327,6 +251,25 @@ with col2:
     """, unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+
+# Geographic opportunity: SYNLAB KPIs per LGA, from the precomputed
+# point-in-polygon assignment. Rates are empirical-Bayes estimates so
+# LGAs with few respondents do not swing to 0% or 100%.
+@st.fragment
+@records_fragment
+def area_opportunity(version, filters):
+    geo_metric = st.selectbox("Area metric", list(SHRINKAGE_RATES), key='geo_metric')
+    plot('area_opportunity', version, filters, metric=geo_metric)
+    
+    with st.expander("Estimates by area"):
+        area_table = area_kpis(version, filters)
+        st.dataframe(area_table[['Respondents', geo_metric, f'{geo_metric}_Est',
+                                 f'{geo_metric}_Low', f'{geo_metric}_High']].round(1),
+                     use_container_width=True)
+        st.caption(f"Estimates shrink each area's raw rate towards the rate across all areas; "
+                   f"bounds are {INTERVAL_LEVEL:.0%} posterior intervals.")
+
+
 # Market Gap Analysis
 st.subheader("📈 Market Gap & Opportunity Analysis")
 
@@ -335,46 +278,31 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     # Opportunity matrix
-    opportunity_data = {
-        'Segment': ['Youth Market', 'Digital Services', 'Premium Services', 'Corporate Clients'],
-        'Market_Size': [8, 9, 6, 8],
-        'Growth_Potential': [9, 9, 7, 8],
-        'Competition': [3, 4, 5, 6]
-    }
-    opportunity_df = pd.DataFrame(opportunity_data)
-    
-    fig8 = px.scatter(opportunity_df, x='Market_Size', y='Growth_Potential', text='Segment',
-                     size='Competition', color='Competition',
-                     color_continuous_scale=['#228B22', '#FF8C00', '#B22222'],
-                     title="🎯 Market Opportunity Matrix",
-                     size_max=30)
-    
-    fig8.update_traces(textposition='top center')
-    fig8.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="Market Size (1-10)", yaxis_title="Growth Potential (1-10)")
-    
-    st.plotly_chart(fig8, use_container_width=True)
+    with timed("chart: opportunity_matrix") as section:
+        opportunity_data = {
+            'Segment': ['Youth Market', 'Digital Services', 'Premium Services', 'Corporate Clients'],
+            'Market_Size': [8, 9, 6, 8],
+            'Growth_Potential': [9, 9, 7, 8],
+            'Competition': [3, 4, 5, 6]
+        }
+        opportunity_df = pd.DataFrame(opportunity_data)
+    
+        fig8 = px.scatter(opportunity_df, x='Market_Size', y='Growth_Potential', text='Segment',
+                         size='Competition', color='Competition',
+                         color_continuous_scale=['#228B22', '#FF8C00', '#B22222'],
+                         title="🎯 Market Opportunity Matrix",
+                         size_max=30)
+    
+        fig8.update_traces(textposition='top center')
+        fig8.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                         xaxis_title="Market Size (1-10)", yaxis_title="Growth Potential (1-10)")
+    
+        render(fig8, 'opportunity_matrix', section)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col2:
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    # Geographic opportunity (simulated)
-    geo_opportunity = {
-        'Region': ['Festac Town', 'LUTH', 'Ikeja', 'Surulere', 'Ilupeju', 'Yaba'],
-        'Current_Penetration': [65, 80, 70, 60, 75, 55],
-        'Growth_Opportunity': [35, 20, 30, 40, 25, 45]
-    }
-    geo_df = pd.DataFrame(geo_opportunity)
-    
-    fig9 = px.bar(geo_df, x='Region', y=['Current_Penetration', 'Growth_Opportunity'],
-                 title="🗺️ Geographic Opportunity Analysis",
-                 color_discrete_sequence=['#0A2647', '#2C74B3'],
-                 barmode='stack')
-    
-    fig9.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                     xaxis_title="Region", yaxis_title="Market Share (%)")
-    
-    st.plotly_chart(fig9, use_container_width=True)
+    area_opportunity(data_version_id, active_filters)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Model Performance Metrics
@@ -385,7 +313,7 @@ metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
 with metrics_col1:
     st.markdown(f"""
     <div class="metric-highlight">
-        <h3>92%</h3>
+        <h3>{churn_model['accuracy']:.0%}</h3>
         <p>Churn Prediction Accuracy</p>
     </div>
     """, unsafe_allow_html=True)
@@ -417,55 +345,75 @@ with metrics_col4:
 # Real-time Prediction Interface
 st.subheader("🎯 Real-time Prediction Interface")
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    age_group = st.selectbox("Age Group", data['Age_Group'].unique())
-    familiarity = st.slider("Familiarity Score", 1.0, 3.0, 2.0)
-
-with col2:
-    rating = st.slider("Current Rating", 1.0, 5.0, 4.0)
-    usage = st.selectbox("Usage Frequency", ["Weekly", "Monthly", "Quarterly", "Rarely"])
-
-with col3:
-    occupation = st.selectbox("Occupation", data['Occupation'].unique()[:5])
-    recommendation = st.slider("Recommendation Likelihood", 1, 5, 4)
-
-# Prediction button
-if st.button("🔮 Predict Customer Behavior", type="primary"):
-    # Simulate prediction results
-    churn_risk = max(0.1, min(0.9, (5 - rating) * 0.1 + (3 - familiarity) * 0.05))
-    clv_score = max(30, min(120, rating * 20 + familiarity * 15))
-    segment = "Loyal Advocate" if rating >= 4 and familiarity >= 2.5 else "Satisfied User" if rating >= 3 else "At Risk"
-    
+@st.fragment
+@records_fragment
+def prediction_interface(data, version):
     col1, col2, col3 = st.columns(3)
-    
+
     with col1:
-        st.markdown(f"""
-        <div class="prediction-card">
-            <h4>📉 Churn Risk</h4>
-            <h2>{churn_risk:.1%}</h2>
-            <p>{'High Risk' if churn_risk > 0.5 else 'Medium Risk' if churn_risk > 0.3 else 'Low Risk'}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
+        age_group = st.selectbox("Age Group", data['Age_Group'].unique())
+        familiarity = st.slider("Familiarity Score", 1, 3, 2)
+        uses_synlab = st.checkbox("Uses SYNLAB", value=True)
+
     with col2:
-        st.markdown(f"""
-        <div class="prediction-card">
-            <h4>💰 CLV Score</h4>
-            <h2>{clv_score:.0f}</h2>
-            <p>{'High Value' if clv_score > 80 else 'Medium Value' if clv_score > 50 else 'Low Value'}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
+        rating = st.slider("Current Rating", 1, 5, 4)
+        labs_used = st.slider("Labs Used", 1, 5, 1)
+        quality = st.checkbox("Believes SYNLAB offers quality service")
+
     with col3:
-        st.markdown(f"""
-        <div class="prediction-card">
-            <h4>🎯 Customer Segment</h4>
-            <h2>{segment}</h2>
-            <p>Recommended engagement strategy</p>
-        </div>
-        """, unsafe_allow_html=True)
+        occupation = st.selectbox("Occupation", data['Occupation'].unique()[:5])
+        recommendation = st.slider("Recommendation Likelihood", 1, 5, 4)
+
+    # Prediction button
+    if st.button("🔮 Predict Customer Behavior", type="primary"):
+        # Score the profile like a survey respondent: churn model probability
+        # and the CLV estimator with the dataset's segment boundaries
+        profile = pd.DataFrame({
+            'SYNLAB_Rating_1_5': [rating],
+            'Likelihood_to_Recommend': [recommendation],
+            'Familiarity_Score': [familiarity],
+            'Age_Group': [age_group],
+            'Belief_Quality_Service': [quality],
+            'Used_SYNLAB': [uses_synlab],
+            'Total_Labs_Used': [labs_used],
+        })
+        churn_risk = train_churn_model(version)['model'].predict_proba(churn_feature_matrix(profile))[0, 1]
+        risk_segment = RISK_SEGMENTS[np.searchsorted(RISK_BINS, churn_risk, side='right')]
+        clv_score = score_clv(profile)[0]
+        clv_segment = CLV_SEGMENTS[np.searchsorted(clv_boundaries(version), clv_score, side='right')]
+        segment = "Loyal Advocate" if rating >= 4 and familiarity >= 3 else "Satisfied User" if rating >= 3 else "At Risk"
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+            <div class="prediction-card">
+                <h4>📉 Churn Risk</h4>
+                <h2>{churn_risk:.1%}</h2>
+                <p>{risk_segment}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+            <div class="prediction-card">
+                <h4>💰 CLV Score</h4>
+                <h2>{clv_score:.0f}</h2>
+                <p>{clv_segment}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(f"""
+            <div class="prediction-card">
+                <h4>🎯 Customer Segment</h4>
+                <h2>{segment}</h2>
+                <p>Recommended engagement strategy</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+prediction_interface(data, data_version_id)
 
 # Footer
 st.markdown("---")
@@ -483,7 +431,7 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.markdown(f"""
     <div class="metric-highlight">
-        <h3>92%</h3>
+        <h3>{churn_model['accuracy']:.0%}</h3>
         <p>Churn Model Accuracy</p>
     </div>
     """, unsafe_allow_html=True)
@@ -515,18 +463,22 @@ with col4:
 # Data Quality Assessment
 st.subheader("🔍 Data Quality Overview")
 
-quality_metrics = {
-    'Metric': ['Completeness', 'Accuracy', 'Consistency', 'Timeliness', 'Validity'],
-    'Score': [92, 88, 85, 90, 87],
-    'Status': ['Excellent', 'Good', 'Good', 'Excellent', 'Good']
-}
+with timed("chart: data_quality") as section:
+    quality_metrics = {
+        'Metric': ['Completeness', 'Accuracy', 'Consistency', 'Timeliness', 'Validity'],
+        'Score': [92, 88, 85, 90, 87],
+        'Status': ['Excellent', 'Good', 'Good', 'Excellent', 'Good']
+    }
+
+    quality_df = pd.DataFrame(quality_metrics)
 
-quality_df = pd.DataFrame(quality_metrics)
+    fig_quality = px.bar(quality_df, x='Metric', y='Score',
+                        color='Score',
+                        title="📊 Data Quality Assessment",
+                        color_continuous_scale=['#B22222', '#FF8C00', '#228B22'])
 
-fig_quality = px.bar(quality_df, x='Metric', y='Score',
-                    color='Score',
-                    title="📊 Data Quality Assessment",
-                    color_continuous_scale=['#B22222', '#FF8C00', '#228B22'])
+    fig_quality.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    render(fig_quality, 'data_quality', section)
 
-fig_quality.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-st.plotly_chart(fig_quality, use_container_width=True)
\ No newline at end of file
+perf_panel()
+import_panel(__file__)
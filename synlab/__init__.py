@@ -0,0 +1 @@
+# Shared data and analytics layer for the SYNLAB dashboard pages
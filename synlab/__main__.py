@@ -0,0 +1,119 @@
+import argparse
+import sys
+
+
+def report(args):
+    from synlab.report import images_available, load_presets, render_report
+
+    images = args.images
+    if images and not images_available():
+        print("kaleido is not installed; writing HTML only", file=sys.stderr)
+        images = False
+    presets = load_presets(args.presets) if args.presets else None
+    render_report(args.out, presets=presets, workers=args.workers, images=images)
+
+
+def build_snapshot(args):
+    from synlab.report import build_snapshot, load_presets
+
+    build_snapshot(presets=load_presets(args.presets) if args.presets else None)
+
+
+def bench(args):
+    from synlab.bench import BASELINE_PATH, run_benchmarks
+
+    sizes = [int(size.replace('_', '')) for size in args.sizes.split(',')]
+    pages = args.pages.split(',') if args.pages else None
+    _, comparison = run_benchmarks(sizes, pages, reruns=args.reruns, out=args.out, baseline=args.baseline or BASELINE_PATH,
+                                   save_baseline=args.save_baseline, tolerance=args.tolerance, timeout=args.timeout)
+    if comparison is not None and comparison['regressed'].any() and not args.save_baseline:
+        sys.exit(1)
+
+
+def load(args):
+    from synlab.load import run_load
+
+    levels = [int(sessions) for sessions in args.sessions.split(',')]
+    run_load(levels, iterations=args.iterations, think=args.think, rows=args.rows, url=args.url,
+             metrics_url=args.metrics_url, seed=args.seed, out=args.out)
+
+
+def lab_names(args):
+    from synlab.data import data_version
+    from synlab.labnames import LAB_MAPPING_PATH, lab_name_mapping, load_mapping, mapping_table, save_mapping
+
+    reviewed = load_mapping()
+    mapping = lab_name_mapping(data_version())
+    table = mapping_table(mapping, reviewed)
+    new = table[table['New']]
+    print(new.to_string(index=False) if len(new) else "No new lab name spellings")
+    if args.write and len(new):
+        save_mapping(mapping)
+        print(f"{len(new)} spellings added to {LAB_MAPPING_PATH}; review and commit it")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m synlab', description="SYNLAB dashboard tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report_parser = commands.add_parser('report', help="render every page for each filter preset to static HTML")
+    report_parser.add_argument('--out', default='reports', help="output directory (default: reports)")
+    report_parser.add_argument('--presets', help="JSON list of {name, filters: {column: [values]}}; "
+                                                 "default: one preset per global filter value")
+    report_parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    report_parser.add_argument('--images', action='store_true', help="also write PNGs (requires kaleido)")
+    report_parser.set_defaults(run=report)
+
+    snapshot_parser = commands.add_parser('build-snapshot', help="precompute figures and models for a fast cold start")
+    snapshot_parser.add_argument('--presets', help="JSON list of filter presets to include "
+                                                   "(default: one preset per global filter value)")
+    snapshot_parser.set_defaults(run=build_snapshot)
+
+    bench_parser = commands.add_parser('bench', help="time cold starts, reruns and memory of every page "
+                                                     "on synthetic datasets")
+    bench_parser.add_argument('--sizes', default='500,50000,1000000,5000000',
+                              help="comma-separated dataset sizes in rows (default: 500,50000,1000000,5000000)")
+    bench_parser.add_argument('--pages', help="comma-separated scripts to run (default: all pages and the dashboard)")
+    bench_parser.add_argument('--reruns', type=int, default=5, help="warm reruns per page (default: 5)")
+    bench_parser.add_argument('--out', help="results file (default: benchmarks/results/<timestamp>.json)")
+    bench_parser.add_argument('--baseline',
+                              help="baseline to compare with (default: benchmarks/baseline.json)")
+    bench_parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    bench_parser.add_argument('--tolerance', type=float, default=0.25,
+                              help="slowdown that counts as a regression (default: 0.25)")
+    bench_parser.add_argument('--timeout', type=int, default=3600, help="seconds allowed per page (default: 3600)")
+    bench_parser.set_defaults(run=bench)
+
+    load_parser = commands.add_parser('load', help="replay click paths from many concurrent sessions "
+                                                   "against a local server")
+    load_parser.add_argument('--sessions', default='1,10,50,100,200',
+                             help="comma-separated concurrent session counts (default: 1,10,50,100,200)")
+    load_parser.add_argument('--iterations', type=int, default=2, help="click paths per session (default: 2)")
+    load_parser.add_argument('--think', type=float, default=1.0,
+                             help="mean pause between clicks in seconds (default: 1.0)")
+    load_parser.add_argument('--rows', type=int, help="serve a synthetic dataset of this many rows")
+    load_parser.add_argument('--url', help="websocket of a running server, e.g. ws://host:8501/_stcore/stream "
+                                           "(default: start one)")
+    load_parser.add_argument('--metrics-url', help="its metrics endpoint, for cache hit rates")
+    load_parser.add_argument('--seed', type=int, default=0, help="click path seed (default: 0)")
+    load_parser.add_argument('--out', help="results file (default: benchmarks/results/load-<timestamp>.json)")
+    load_parser.set_defaults(run=load)
+
+    names_parser = commands.add_parser('lab-names', help="list lab name spellings missing from the reviewed "
+                                                         "canonical mapping")
+    names_parser.add_argument('--write', action='store_true', help="add them to data/lab_name_mapping.json")
+    names_parser.set_defaults(run=lab_names)
+
+    args = parser.parse_args(argv)
+    # Cached functions run without a Streamlit server; silence its warnings about that.
+    # Streamlit applies its configured level to each of its loggers when the
+    # config is first read, so read it before lowering them.
+    import streamlit.logger
+    from streamlit import config
+    config.get_option('logger.level')
+    streamlit.logger.set_log_level('error')
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
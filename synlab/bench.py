@@ -0,0 +1,290 @@
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from synlab.data import GLOBAL_FILTERS, ROOT
+
+# Rerun-latency benchmarks. Each page is driven headlessly with
+# streamlit.testing (AppTest) in its own process against synthetic
+# datasets of increasing size, recording:
+#   cold_s        first run in a fresh process (imports, data load, caches)
+#   warm_s        median of repeated reruns with nothing changed
+#   interactions  one rerun per scripted filter change or widget action
+#   peak_rss_mb   peak resident memory of the process
+# Results go to benchmarks/results/ and are compared with
+# benchmarks/baseline.json:
+#
+#   python -m synlab bench --sizes 500,50000
+#
+# AppTest reruns the whole script on every widget change, so sections
+# inside st.fragment are timed as full reruns here.
+BENCH_DIR = os.path.join(ROOT, 'benchmarks')
+BENCH_DATA_DIR = os.path.join(BENCH_DIR, 'data')
+BENCH_RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+SOURCE_PATH = os.path.join(ROOT, 'data', 'SYNLAB_Surveydata_AUGMENTED_500.csv')
+
+BENCH_SIZES = (500, 50_000, 1_000_000, 5_000_000)
+BENCH_RERUNS = 5
+BENCH_TIMEOUT = 3600
+SYNTHETIC_CHUNK_ROWS = 250_000
+
+# A regression is slower (or bigger) than the baseline by more than the
+# tolerance and by more than the floor, so sub-noise changes on fast
+# pages don't fail the run
+REGRESSION_TOLERANCE = 0.25
+TIME_FLOOR_S = 0.05
+MEMORY_FLOOR_MB = 25
+
+DROP_FIRST = 'drop first'
+
+# Page -> scripted interactions, applied in order, each followed by one
+# rerun: (name, widget kind, widget label, value). Kind 'filter' sets a
+# global filter in session state the way app.py's sidebar does; the
+# value DROP_FIRST deselects the first selected option.
+BENCH_SCRIPTS = {
+    'app.py': [
+        ('age filter', 'multiselect', 'Age Group', DROP_FIRST),
+        ('occupation filter', 'multiselect', 'Occupation', DROP_FIRST),
+    ],
+    'pages/1_Executive_Overview.py': [
+        ('age filter', 'multiselect', 'Age Group', DROP_FIRST),
+        ('sentiment filter', 'multiselect', 'Feedback Sentiment', DROP_FIRST),
+    ],
+    'pages/2_Customer_Insights.py': [
+        ('age filter', 'filter', 'age_filter', DROP_FIRST),
+        ('map zoom', 'slider', 'Map detail (zoom level)', 12),
+    ],
+    'pages/3_Competitive_Intelligence.py': [
+        ('age filter', 'filter', 'age_filter', DROP_FIRST),
+        ('catchment radius', 'slider', 'Catchment radius (km)', 5.0),
+    ],
+    'pages/4_Strategic_Analytics.py': [
+        ('age filter', 'filter', 'age_filter', DROP_FIRST),
+    ],
+    'pages/5_Advanced_Models.py': [
+        ('age filter', 'filter', 'age_filter', DROP_FIRST),
+        ('comment search', 'text_input', 'Search suggestions and lab preference reasons', 'results'),
+        ('area metric', 'selectbox', 'Area metric', 'Awareness'),
+        ('prediction', 'button', '🔮 Predict Customer Behavior', None),
+    ],
+    'data/synlab_dashboard.py': [
+        ('age filter', 'multiselect', 'Age Group', DROP_FIRST),
+        ('demographic', 'selectbox', 'Select Demographic', 'Gender'),
+        ('raw data', 'checkbox', 'Show Raw Data', True),
+    ],
+}
+
+
+# Survey rows resampled with replacement (coordinates jittered, e-mail
+# addresses made unique), written in chunks and cached by size
+def synthetic_dataset(rows, seed=0, log=print):
+    path = os.path.join(BENCH_DATA_DIR, f'synthetic_{rows}.csv')
+    if os.path.exists(path):
+        return path
+    started = time.perf_counter()
+    os.makedirs(BENCH_DATA_DIR, exist_ok=True)
+    source = pd.read_csv(SOURCE_PATH)
+    rng = np.random.default_rng(seed)
+    staging = path + '.partial'
+    for start in range(0, rows, SYNTHETIC_CHUNK_ROWS):
+        count = min(SYNTHETIC_CHUNK_ROWS, rows - start)
+        chunk = source.iloc[rng.integers(0, len(source), count)].reset_index(drop=True)
+        chunk['Latitude'] += rng.normal(0, 0.005, count)
+        chunk['Longitude'] += rng.normal(0, 0.005, count)
+        emails = pd.Series([f'respondent{row}@example.com' for row in range(start, start + count)])
+        chunk['Email_Address'] = emails.where(chunk['Email_Address'].notna())
+        chunk.to_csv(staging, mode='a' if start else 'w', header=start == 0, index=False)
+    os.replace(staging, path)
+    log(f"Synthetic dataset of {rows:,} rows written to {path} in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def find_widget(at, kind, label):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no {kind} labelled {label!r}")
+
+
+def interact(at, kind, target, value):
+    if kind == 'filter':
+        if target in at.session_state:
+            current = list(at.session_state[target])
+        else:
+            current = pd.read_csv(SOURCE_PATH, usecols=[GLOBAL_FILTERS[target]]).iloc[:, 0].dropna().unique().tolist()
+        at.session_state[target] = current[1:]
+        return
+    widget = find_widget(at, kind, target)
+    if kind == 'button':
+        widget.click()
+    elif value == DROP_FIRST:
+        widget.set_value(widget.value[1:])
+    else:
+        widget.set_value(value)
+
+
+def timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return seconds
+
+
+# One page in this process; run by run_page in a fresh interpreter
+def bench_page(page, reruns=BENCH_RERUNS):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=BENCH_TIMEOUT)
+    cold = timed_run(at)
+    warm = [timed_run(at) for _ in range(reruns)]
+    interactions = {}
+    for name, kind, target, value in BENCH_SCRIPTS[page]:
+        interact(at, kind, target, value)
+        interactions[name] = timed_run(at)
+    return {'cold_s': cold, 'warm_s': statistics.median(warm), 'warm_max_s': max(warm),
+            'interactions': interactions, 'peak_rss_mb': peak_rss_mb()}
+
+
+def run_page(page, data_path, reruns=BENCH_RERUNS, timeout=BENCH_TIMEOUT):
+    snapshot_dir = tempfile.mkdtemp(prefix='synlab-bench-')
+    # An empty snapshot directory so every page computes from scratch,
+    # and no metrics endpoint competing for the port
+    env = dict(os.environ, SYNLAB_DATA_PATH=data_path, SYNLAB_SNAPSHOT_DIR=snapshot_dir, SYNLAB_METRICS_PORT='0')
+    try:
+        process = subprocess.run([sys.executable, '-m', 'synlab.bench', page, str(reruns)], cwd=ROOT, env=env,
+                                 capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout}s"}
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    if process.returncode != 0:
+        lines = process.stderr.strip().splitlines()
+        reason = lines[-1] if lines else 'no output'
+        if process.returncode < 0:
+            reason = f"killed by signal {-process.returncode} (out of memory?)"
+        return {'error': reason}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    import streamlit
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit, 'platform': platform.platform(),
+            'python': platform.python_version(), 'streamlit': streamlit.__version__, 'pandas': pd.__version__,
+            'cpus': os.cpu_count()}
+
+
+# (rows, page, metric) -> value for every number in a results document
+def flatten(document):
+    values = {}
+    for result in document['results']:
+        if 'error' in result:
+            continue
+        for metric in ('cold_s', 'warm_s', 'peak_rss_mb'):
+            values[(result['rows'], result['page'], metric)] = result[metric]
+        for name, seconds in result['interactions'].items():
+            values[(result['rows'], result['page'], f'interaction: {name}')] = seconds
+    return values
+
+
+def compare(document, baseline, tolerance=REGRESSION_TOLERANCE):
+    current, previous = flatten(document), flatten(baseline)
+    rows = []
+    for key, value in current.items():
+        if key not in previous:
+            continue
+        base = previous[key]
+        floor = MEMORY_FLOOR_MB if key[2] == 'peak_rss_mb' else TIME_FLOOR_S
+        regressed = value > base * (1 + tolerance) and value - base > floor
+        rows.append({'rows': key[0], 'page': key[1], 'metric': key[2], 'baseline': base, 'current': value,
+                     'change': value / base - 1 if base else None, 'regressed': regressed})
+    return pd.DataFrame(rows, columns=['rows', 'page', 'metric', 'baseline', 'current', 'change', 'regressed'])
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_results(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+# Replace the baseline entries for the (rows, page) pairs just measured,
+# keeping the rest (e.g. large sizes measured on a bigger machine)
+def update_baseline(document, path=BASELINE_PATH):
+    measured = {(result['rows'], result['page']) for result in document['results'] if 'error' not in result}
+    kept = []
+    if os.path.exists(path):
+        kept = [result for result in load_results(path)['results'] if (result['rows'], result['page']) not in measured]
+    results = sorted(kept + [result for result in document['results'] if 'error' not in result],
+                     key=lambda result: (result['rows'], result['page']))
+    write_results({'meta': document['meta'], 'results': results}, path)
+
+
+def run_benchmarks(sizes=BENCH_SIZES, pages=None, reruns=BENCH_RERUNS, out=None, baseline=BASELINE_PATH,
+                   save_baseline=False, tolerance=REGRESSION_TOLERANCE, timeout=BENCH_TIMEOUT, log=print):
+    pages = pages or list(BENCH_SCRIPTS)
+    document = {'meta': environment(), 'results': []}
+    for rows in sizes:
+        data_path = synthetic_dataset(rows, log=log)
+        for page in pages:
+            result = {'rows': rows, 'page': page, **run_page(page, data_path, reruns, timeout)}
+            document['results'].append(result)
+            if 'error' in result:
+                log(f"{rows:>9,} {page}: failed ({result['error']})")
+            else:
+                log(f"{rows:>9,} {page}: cold {result['cold_s']:.2f}s, warm {result['warm_s']:.3f}s, "
+                    f"peak {result['peak_rss_mb']:.0f} MB")
+
+    out = out or os.path.join(BENCH_RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    write_results(document, out)
+    log(f"Results written to {out}")
+
+    comparison = None
+    if baseline and os.path.exists(baseline):
+        comparison = compare(document, load_results(baseline), tolerance)
+        regressions = comparison[comparison['regressed']]
+        log(f"{len(regressions)} regressions against {baseline} ({len(comparison)} numbers compared, "
+            f"tolerance {tolerance:.0%})")
+        if len(regressions):
+            log(regressions.drop(columns='regressed').to_string(index=False, float_format='{:.3f}'.format))
+    if save_baseline:
+        update_baseline(document, baseline or BASELINE_PATH)
+        log(f"Baseline updated: {baseline or BASELINE_PATH}")
+    return document, comparison
+
+
+if __name__ == '__main__':
+    # Child process of run_page: python -m synlab.bench <page> <reruns>
+    import streamlit.logger
+    from streamlit import config
+
+    config.get_option('logger.level')
+    streamlit.logger.set_log_level('error')
+    print(json.dumps(bench_page(sys.argv[1], int(sys.argv[2]))))
@@ -0,0 +1,512 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from synlab.churn import churn_feature_importance, churn_risk_counts, train_churn_model
+from synlab.clv import clv_by_group, clv_segment_counts
+from synlab.data import filter_rows, load_dataset
+from synlab.figures import register_chart
+from synlab.geo import catchment_kpis, usage_by_branch_distance
+from synlab.kpis import LABS, kpi_frame, kpi_inputs, scale_counts
+from synlab.labnames import competitor_mention_counts
+from synlab.perf import counts_calls, counts_misses
+from synlab.regions import REGION_PROPERTY, load_regions, region_kpis
+from synlab.segments import SEGMENTS, segment_codes
+from synlab.sentiment import sentiment_by_segment, sentiment_rows
+from synlab.shrinkage import INTERVAL_LEVEL
+from synlab.text import top_words, topic_weights
+
+# Chart declarations for every page; pages render them through
+# synlab.figures.plot and the batch report reuses them headless.
+
+NAVY_SCALE = ['#2C74B3', '#205295', '#144272', '#0A2647']
+NAVY_PALETTE = ['#0A2647', '#144272', '#205295', '#2C74B3', '#F8F9FA']
+TRANSPARENT = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+
+
+# Competitive Intelligence
+
+# Awareness and usage of every tracked lab, optionally limited to
+# respondents whose feedback has one of the given sentiment labels
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def lab_rates(version, filters, labels=None):
+    data = load_dataset(version)
+    rows = sentiment_rows(version, filters, labels)
+    sums = {}
+    for lab in LABS:
+        for name, values in kpi_inputs(data, lab, rows).items():
+            sums.setdefault(name, []).append(values.sum())
+    rates = kpi_frame({name: np.array(values) for name, values in sums.items()})
+    rates.insert(0, 'Lab', LABS)
+    return rates[['Lab', 'Aware', 'Users', 'Awareness', 'Usage']]
+
+
+def filtered_column(version, filters, column, labels=None):
+    return load_dataset(version)[column].to_numpy()[sentiment_rows(version, filters, labels)]
+
+
+# Executive Overview
+
+def build_awareness_counts(rates):
+    fig = px.bar(rates, x='Lab', y='Aware',
+                 title="🚀 Brand Awareness Comparison",
+                 color='Aware',
+                 labels={'Aware': 'Awareness'},
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(**TRANSPARENT, font=dict(color="#0A2647"))
+    return fig
+
+
+def rating_counts(version, filters, labels=None):
+    return scale_counts(filtered_column(version, filters, 'SYNLAB_Rating_1_5', labels))
+
+
+def build_rating_distribution(counts):
+    fig = px.bar(x=counts.index, y=counts.values,
+                 title="⭐ SYNLAB Rating Distribution",
+                 labels={'x': 'SYNLAB_Rating_1_5', 'y': 'count'},
+                 color_discrete_sequence=['#0A2647'])
+    fig.update_layout(**TRANSPARENT, font=dict(color="#0A2647"), bargap=0)
+    return fig
+
+
+def recommendation_counts(version, filters, labels=None):
+    counts = scale_counts(filtered_column(version, filters, 'Likelihood_to_Recommend', labels))
+    return counts[counts > 0]
+
+
+def build_recommendation(counts):
+    fig = px.pie(values=counts.values, names=counts.index,
+                 title="💫 Recommendation Likelihood",
+                 color_discrete_sequence=NAVY_PALETTE)
+    fig.update_layout(**TRANSPARENT, font=dict(color="#0A2647"))
+    return fig
+
+
+def age_sentiment(version, filters, labels=None):
+    return sentiment_by_segment(version, filters, 'Age_Group', labels)
+
+
+def build_sentiment_by_age(segment_sentiment):
+    segment_sentiment = segment_sentiment.reset_index()
+    segment_sentiment.columns = ['Age_Group', 'Sentiment', 'Comments']
+    fig = px.bar(segment_sentiment, x='Age_Group', y='Sentiment',
+                 title="💬 Feedback Sentiment by Age Group",
+                 hover_data=['Comments'],
+                 color='Sentiment',
+                 color_continuous_scale=['#B22222', '#F8F9FA', '#0A2647'],
+                 range_color=[-1, 1])
+    fig.update_layout(**TRANSPARENT, font=dict(color="#0A2647"),
+                      yaxis_title="Average Sentiment (-1 to 1)")
+    return fig
+
+
+# Customer Insights
+
+# Percentage of respondents in each segment, largest first
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def segment_shares(version, filters):
+    codes = segment_codes(version)[filter_rows(version, filters)]
+    counts = pd.Series(np.bincount(codes, minlength=len(SEGMENTS)), index=SEGMENTS)
+    counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+    return (counts / max(len(codes), 1) * 100).round(1)
+
+
+def build_segment_distribution(shares):
+    fig = px.pie(values=shares.values, names=shares.index,
+                 title="🎪 Customer Segments Distribution",
+                 color_discrete_sequence=NAVY_PALETTE)
+    fig.update_layout(**TRANSPARENT)
+    return fig
+
+
+def age_counts(version, filters):
+    return pd.Series(filtered_column(version, filters, 'Age_Group')).value_counts()
+
+
+def build_age_distribution(counts):
+    fig = px.pie(values=counts.values, names=counts.index,
+                 title="👥 Age Distribution",
+                 color_discrete_sequence=NAVY_PALETTE[:4])
+    fig.update_layout(**TRANSPARENT)
+    return fig
+
+
+def gender_counts(version, filters):
+    return pd.Series(filtered_column(version, filters, 'Gender')).value_counts()
+
+
+def build_gender_distribution(counts):
+    fig = px.bar(x=counts.index, y=counts.values,
+                 title="🚻 Gender Distribution",
+                 color_discrete_sequence=['#205295'])
+    fig.update_layout(**TRANSPARENT, xaxis_title="", yaxis_title="Count")
+    return fig
+
+
+def occupation_counts(version, filters, n=8):
+    return pd.Series(filtered_column(version, filters, 'Occupation')).value_counts().head(n)
+
+
+def build_occupation_distribution(counts):
+    fig = px.bar(x=counts.values, y=counts.index,
+                 title="💼 Top Occupations", orientation='h',
+                 color_discrete_sequence=['#2C74B3'])
+    fig.update_layout(**TRANSPARENT, xaxis_title="Count", yaxis_title="")
+    return fig
+
+
+def build_awareness_share(rates):
+    fig = px.pie(rates, values='Awareness', names='Lab',
+                 title="🎯 Brand Awareness Market Share",
+                 color_discrete_sequence=['#0A2647', '#144272', '#205295', '#2C74B3', '#F8F9FA'])
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def build_usage_rates(rates):
+    fig = px.bar(rates, x='Lab', y='Usage',
+                 title="📈 Laboratory Usage Rates",
+                 color='Usage',
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                      xaxis_title="", yaxis_title="Usage Rate (%)")
+    return fig
+
+
+# Awareness vs usage line with highlighted competitors and quadrants
+def build_positioning(rates):
+    # Sort by Awareness for better line visualization
+    positioning_df = rates.sort_values('Awareness')
+
+    fig = go.Figure()
+
+    # Add grid lines for better readability
+    for y in [10, 20, 30, 40, 50]:
+        fig.add_hline(y=y, line=dict(color="rgba(128, 128, 128, 0.2)", width=1, dash="dash"))
+    for x in [20, 30, 40, 50]:
+        fig.add_vline(x=x, line=dict(color="rgba(128, 128, 128, 0.2)", width=1, dash="dash"))
+
+    # Add Usage line (Primary metric from screenshot)
+    fig.add_trace(go.Scatter(
+        x=positioning_df['Awareness'],
+        y=positioning_df['Usage'],
+        mode='lines+markers+text',
+        text=positioning_df['Lab'],
+        textposition="top center",
+        name='Usage Rate (%)',
+        line=dict(color='#0A2647', width=3),
+        marker=dict(size=12, color='#0A2647', symbol='circle'),
+        hovertemplate='<b>%{text}</b><br>Awareness: %{x:.1f}%<br>Usage: %{y:.1f}%<extra></extra>'
+    ))
+
+    # Highlight specific competitors as shown in screenshot
+    # Add special markers for key competitors
+    competitors_to_highlight = {
+        'Clinix': {'color': '#8B0000', 'symbol': 'square'},
+        'Mecure': {'color': '#205295', 'symbol': 'diamond'},
+        'Clina Lancet': {'color': '#2C74B3', 'symbol': 'star'},
+        'Afriglobal': {'color': '#32CD32', 'symbol': 'triangle-up'}
+    }
+
+    for lab, style in competitors_to_highlight.items():
+        if lab in positioning_df['Lab'].values:
+            lab_data = positioning_df[positioning_df['Lab'] == lab].iloc[0]
+            fig.add_trace(go.Scatter(
+                x=[lab_data['Awareness']],
+                y=[lab_data['Usage']],
+                mode='markers',
+                marker=dict(
+                    size=20,
+                    color=style['color'],
+                    symbol=style['symbol'],
+                    line=dict(width=2, color='white')
+                ),
+                name=lab,
+                showlegend=False,
+                hovertemplate=f'<b>{lab}</b><br>Awareness: %{{x:.1f}}%<br>Usage: %{{y:.1f}}%<extra></extra>'
+            ))
+
+    # Add SYNLAB with special styling
+    synlab_data = positioning_df[positioning_df['Lab'] == 'SYNLAB']
+    if not synlab_data.empty:
+        synlab_data = synlab_data.iloc[0]
+        fig.add_trace(go.Scatter(
+            x=[synlab_data['Awareness']],
+            y=[synlab_data['Usage']],
+            mode='markers',
+            marker=dict(
+                size=25,
+                color='#FFD700',  # Gold color for market leader
+                symbol='star',
+                line=dict(width=3, color='#FF4500')
+            ),
+            name='SYNLAB (Market Leader)',
+            hovertemplate='<b>SYNLAB (Market Leader)</b><br>Awareness: %{x:.1f}%<br>Usage: %{y:.1f}%<extra></extra>'
+        ))
+
+    # Update layout to match screenshot style
+    fig.update_layout(
+        title="🎯 Awareness vs Usage Positioning",
+        xaxis=dict(
+            title="Awareness Rate (%)",
+            range=[15, 55],
+            tickmode='linear',
+            tick0=20,
+            dtick=10,
+            gridcolor='rgba(128, 128, 128, 0.1)'
+        ),
+        yaxis=dict(
+            title="Usage Rate (%)",
+            range=[15, 35],
+            tickmode='linear',
+            tick0=15,
+            dtick=5,
+            gridcolor='rgba(128, 128, 128, 0.1)'
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor='rgba(255, 255, 255, 0.8)'
+        ),
+        hovermode='closest',
+        margin=dict(t=50, l=50, r=50, b=50)
+    )
+
+    # Add quadrant lines at the median
+    median_awareness = positioning_df['Awareness'].median()
+    median_usage = positioning_df['Usage'].median()
+
+    fig.add_shape(
+        type="line",
+        x0=median_awareness, y0=15,
+        x1=median_awareness, y1=35,
+        line=dict(color="rgba(0, 0, 0, 0.3)", width=1, dash="dot")
+    )
+
+    fig.add_shape(
+        type="line",
+        x0=15, y0=median_usage,
+        x1=55, y1=median_usage,
+        line=dict(color="rgba(0, 0, 0, 0.3)", width=1, dash="dot")
+    )
+
+    # Add quadrant labels
+    quadrant_labels = [
+        (25, 32, "low Awareness, High Usage", "orange"),
+        (45, 18, "High Awareness, low Usage", "green"),
+        (25, 18, "Low Awareness, Low Usage", "red"),
+        (45, 32, "High Awareness, High Usage", "blue"),
+    ]
+    for x, y, text, color in quadrant_labels:
+        fig.add_annotation(x=x, y=y, text=text, showarrow=False, font=dict(size=10, color=color))
+
+    return fig
+
+
+def named_competitors(version, filters, n=15):
+    return competitor_mention_counts(version, filters).head(n).sort_values()
+
+
+def build_named_competitors(named_labs):
+    fig = px.bar(x=named_labs.values, y=named_labs.index, orientation='h',
+                 title="🏥 Labs Mentioned in Open Answers (Canonicalized)",
+                 color=named_labs.index.isin(LABS),
+                 color_discrete_map={True: '#0A2647', False: '#2C74B3'},
+                 labels={'color': 'Tracked Lab'})
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                      xaxis_title="Respondents Mentioning", yaxis_title="")
+    return fig
+
+
+def build_catchments(catchments, radius_km):
+    labels = catchments['Lab'] + ' • ' + catchments['Branch']
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='SYNLAB Awareness', x=labels,
+                         y=catchments['SYNLAB_Awareness'], marker_color='#0A2647'))
+    fig.add_trace(go.Bar(name='SYNLAB Usage', x=labels,
+                         y=catchments['SYNLAB_Usage'], marker_color='#2C74B3'))
+    fig.add_trace(go.Bar(name="Branch Lab's Usage", x=labels,
+                         y=catchments['Lab_Usage'], marker_color='#8B0000'))
+    fig.update_layout(title=f"🏥 SYNLAB vs Competitors within {radius_km:g} km of Each Branch",
+                      barmode='group',
+                      plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                      xaxis_title="", yaxis_title="Rate (%)")
+    return fig
+
+
+def branch_distance_usage(version, filters):
+    return usage_by_branch_distance(version, filters).reset_index(names='Distance')
+
+
+def build_distance_usage(distance_usage):
+    fig = px.bar(distance_usage, x='Distance', y='Usage',
+                 title="📏 SYNLAB Usage by Distance to Nearest SYNLAB Branch",
+                 hover_data=['Respondents', 'Awareness'],
+                 color='Usage',
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                      xaxis_title="Distance to Nearest Branch", yaxis_title="Usage Rate (%)")
+    return fig
+
+
+# Strategic Analytics
+
+# Respondents ticking each of the page's binary columns (e.g. beliefs)
+def flag_counts(version, filters, prefix, excluded, label):
+    data = load_dataset(version)
+    columns = [column for column in data.columns
+               if prefix in column and not any(word in column for word in excluded)]
+    rows = filter_rows(version, filters)
+    counts = [int(data[column].to_numpy()[rows].sum()) for column in columns]
+    names = [column.replace(prefix, '').replace('_', ' ').title() for column in columns]
+    return pd.DataFrame({label: names, 'Count': counts}).sort_values('Count', ascending=True)
+
+
+def belief_counts(version, filters):
+    return flag_counts(version, filters, 'Belief_', ['Others'], 'Attribute')
+
+
+def build_beliefs(belief_df):
+    fig = px.bar(belief_df, x='Count', y='Attribute', orientation='h',
+                 title="💪 Strengths & Beliefs About SYNLAB",
+                 color='Count',
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(**TRANSPARENT, xaxis_title="Number of Respondents", yaxis_title="")
+    return fig
+
+
+def improvement_counts(version, filters):
+    return flag_counts(version, filters, 'Improve_', ['None', 'Others'], 'Area')
+
+
+def build_improvements(improvement_df):
+    fig = px.bar(improvement_df, x='Count', y='Area', orientation='h',
+                 title="🔧 Areas Needing Improvement",
+                 color='Count',
+                 color_continuous_scale=['#8B0000', '#B22222', '#DC143C', '#FF6347'])
+    fig.update_layout(**TRANSPARENT, xaxis_title="Number of Respondents", yaxis_title="")
+    return fig
+
+
+# Advanced Models
+
+def build_churn_risk(risk_counts):
+    fig = px.pie(values=risk_counts.values, names=risk_counts.index,
+                 title="🎯 Customer Churn Risk Distribution",
+                 color_discrete_sequence=['#228B22', '#FF8C00', '#B22222'])
+    fig.update_layout(**TRANSPARENT)
+    return fig
+
+
+# Importance is a property of the model, not of the filter state
+def churn_importance(version, filters):
+    model = train_churn_model(version)
+    return churn_feature_importance(model['version'], version).sort_values('Importance', ascending=True)
+
+
+def build_churn_importance(feature_df):
+    fig = px.bar(feature_df, x='Importance', y='Feature', orientation='h', error_x='Std',
+                 title="🔍 Churn Prediction Feature Importance",
+                 color='Importance',
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(**TRANSPARENT, xaxis_title="Importance Score", yaxis_title="")
+    return fig
+
+
+def build_clv_segments(clv_counts):
+    fig = px.bar(x=clv_counts.index, y=clv_counts.values,
+                 title="💎 Customer Lifetime Value Segments",
+                 color=clv_counts.values,
+                 color_continuous_scale=NAVY_SCALE[:3])
+    fig.update_layout(**TRANSPARENT, xaxis_title="CLV Segment", yaxis_title="Number of Customers",
+                      showlegend=False)
+    return fig
+
+
+def clv_by_age(version, filters):
+    return clv_by_group(version, filters, 'Age_Group').sort_values(ascending=True)
+
+
+def build_clv_by_age(clv_values):
+    fig = px.bar(x=clv_values.values, y=clv_values.index, orientation='h',
+                 title="👥 Average CLV by Age Group",
+                 color=clv_values.values,
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(**TRANSPARENT, xaxis_title="Average CLV Score", yaxis_title="Age Group",
+                      showlegend=False)
+    return fig
+
+
+def build_top_words(word_freq):
+    fig = px.bar(x=word_freq.values, y=word_freq.index, orientation='h',
+                 title="🔤 Most Frequent Words in Customer Feedback",
+                 color=word_freq.values,
+                 color_continuous_scale=NAVY_SCALE)
+    fig.update_layout(**TRANSPARENT, xaxis_title="Frequency", yaxis_title="Words",
+                      showlegend=False)
+    return fig
+
+
+def build_topics(topic_mix):
+    fig = px.pie(values=topic_mix.values, names=topic_mix.index,
+                 title="☁️ Top Topics in Customer Feedback",
+                 color_discrete_sequence=NAVY_PALETTE[:4] + ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'])
+    fig.update_layout(**TRANSPARENT)
+    return fig
+
+
+# LGA choropleth of shrunk SYNLAB rates
+def build_area_opportunity(geo_df, metric='Penetration'):
+    geo_df = geo_df.reset_index()
+    fig = px.choropleth_mapbox(geo_df, geojson=load_regions(), locations=REGION_PROPERTY,
+                               featureidkey=f'properties.{REGION_PROPERTY}', color=f'{metric}_Est',
+                               hover_name=REGION_PROPERTY,
+                               hover_data={REGION_PROPERTY: False, 'Respondents': True, metric: ':.1f',
+                                           f'{metric}_Low': ':.1f', f'{metric}_High': ':.1f'},
+                               labels={f'{metric}_Est': f'{metric} (%)', metric: 'Raw (%)',
+                                       f'{metric}_Low': f'{INTERVAL_LEVEL:.0%} low',
+                                       f'{metric}_High': f'{INTERVAL_LEVEL:.0%} high'},
+                               color_continuous_scale=['#B22222', '#FF8C00', '#228B22'],
+                               center={'lat': 6.55, 'lon': 3.40}, zoom=9, opacity=0.6,
+                               title="🗺️ Geographic Opportunity Analysis")
+    fig.update_layout(mapbox_style="open-street-map", margin={'l': 0, 'r': 0, 'b': 0},
+                      paper_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+register_chart('lab_awareness', lab_rates, build_awareness_counts)
+register_chart('rating_distribution', rating_counts, build_rating_distribution)
+register_chart('recommendation_likelihood', recommendation_counts, build_recommendation)
+register_chart('sentiment_by_age', age_sentiment, build_sentiment_by_age)
+register_chart('segment_distribution', segment_shares, build_segment_distribution)
+register_chart('age_distribution', age_counts, build_age_distribution)
+register_chart('gender_distribution', gender_counts, build_gender_distribution)
+register_chart('occupation_distribution', occupation_counts, build_occupation_distribution)
+register_chart('awareness_share', lab_rates, build_awareness_share)
+register_chart('usage_rates', lab_rates, build_usage_rates)
+register_chart('positioning', lab_rates, build_positioning)
+register_chart('named_competitors', named_competitors, build_named_competitors)
+register_chart('catchments', catchment_kpis, build_catchments)
+register_chart('distance_usage', branch_distance_usage, build_distance_usage)
+register_chart('beliefs', belief_counts, build_beliefs)
+register_chart('improvements', improvement_counts, build_improvements)
+register_chart('churn_risk', churn_risk_counts, build_churn_risk)
+register_chart('churn_importance', churn_importance, build_churn_importance)
+register_chart('clv_segments', clv_segment_counts, build_clv_segments)
+register_chart('clv_by_age', clv_by_age, build_clv_by_age)
+register_chart('top_words', top_words, build_top_words)
+register_chart('topics', topic_weights, build_topics)
+register_chart('area_opportunity', region_kpis, build_area_opportunity)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import filter_rows, load_dataset
+from synlab.perf import counts_calls, counts_misses
+from synlab.snapshot import snapshot_resource
+
+# Display name -> survey column for each model input. Total_Labs_Used is
+# left out: it counts SYNLAB itself, and even net of SYNLAB every
+# respondent with no other lab is a SYNLAB user, so it encodes the label.
+CHURN_FEATURES = {
+    'Rating': 'SYNLAB_Rating_1_5',
+    'Familiarity': 'Familiarity_Score',
+    'Recommendation': 'Likelihood_to_Recommend',
+    'Age': 'Age_Group',
+    'Service Quality': 'Belief_Quality_Service',
+}
+
+AGE_ORDER = ['under-18', '18-24', '25-34', '35-44', '45-54', '55']
+
+RISK_SEGMENTS = ['Low Risk', 'Medium Risk', 'High Risk']
+RISK_BINS = [0.2, 0.5]
+
+MODEL_PARAMS = {'n_estimators': 100, 'max_depth': 8, 'min_samples_leaf': 5, 'oob_score': True, 'random_state': 42}
+
+# Permutation importance settings; scoring sets larger than
+# IMPORTANCE_MAX_SAMPLES are subsampled for each repeat
+IMPORTANCE_REPEATS = 5
+IMPORTANCE_MAX_SAMPLES = 200_000
+
+
+def churn_feature_matrix(data):
+    columns = []
+    for column in CHURN_FEATURES.values():
+        if column == 'Age_Group':
+            values = pd.Categorical(data[column], categories=AGE_ORDER).codes
+        else:
+            values = data[column].to_numpy(dtype=np.float64, na_value=0.0)
+        columns.append(values)
+    return np.column_stack(columns).astype(np.float32)
+
+
+# There is no observed churn in the survey, so the model learns which
+# respondents are not (or no longer) SYNLAB customers
+def churn_labels(data):
+    return (~data['Used_SYNLAB'].astype(bool)).to_numpy()
+
+
+def model_version(version):
+    params = json.dumps([MODEL_PARAMS, list(CHURN_FEATURES)], sort_keys=True)
+    return f"{version}:{hashlib.sha1(params.encode()).hexdigest()[:10]}"
+
+
+# Train once per dataset version; returns the model, holdout set,
+# accuracy and the out-of-bag churn probability of every training row
+@counts_calls
+@st.cache_resource(show_spinner="Training churn model...", max_entries=2)
+@counts_misses
+def train_churn_model(version):
+    trained = snapshot_resource(version, 'churn_model')
+    if trained is not None and trained['version'] == model_version(version):
+        return trained
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    data = load_dataset(version)
+    X, y = churn_feature_matrix(data), churn_labels(data)
+    train_rows, test_rows = train_test_split(np.arange(len(data)), test_size=0.25, random_state=42, stratify=y)
+    model = RandomForestClassifier(n_jobs=-1, **MODEL_PARAMS).fit(X[train_rows], y[train_rows])
+    # Predict single-threaded so permutation workers don't oversubscribe
+    model.set_params(n_jobs=1)
+    train_risk = model.oob_decision_function_[:, 1].astype(np.float32)
+    del model.oob_decision_function_
+    accuracy = model.score(X[test_rows], y[test_rows])
+    return {'model': model, 'version': model_version(version),
+            'X_test': X[test_rows], 'y_test': y[test_rows], 'accuracy': accuracy,
+            'train_rows': train_rows, 'test_rows': test_rows, 'train_risk': train_risk}
+
+
+# Permutation importance on the holdout set. Features are shuffled in
+# parallel worker processes and the baseline score is computed once.
+@counts_calls
+@st.cache_data(show_spinner="Computing feature importance...")
+@counts_misses
+def churn_feature_importance(model_key, version):
+    cached = snapshot_resource(version, 'churn_importance')
+    if cached is not None and cached['model_key'] == model_key:
+        return cached['importance']
+    from sklearn.inspection import permutation_importance
+
+    trained = train_churn_model(version)
+    X_test, y_test = trained['X_test'], trained['y_test']
+    result = permutation_importance(
+        trained['model'], X_test, y_test,
+        n_repeats=IMPORTANCE_REPEATS,
+        max_samples=min(1.0, IMPORTANCE_MAX_SAMPLES / len(X_test)),
+        n_jobs=-1, random_state=42)
+    return pd.DataFrame({
+        'Feature': list(CHURN_FEATURES),
+        'Importance': result.importances_mean,
+        'Std': result.importances_std,
+    })
+
+
+# Out-of-sample churn probability for every respondent: out-of-bag
+# estimates for the training rows, model predictions for the holdout
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def churn_risk(version):
+    trained = train_churn_model(version)
+    risk = np.empty(len(load_dataset(version)), dtype=np.float32)
+    risk[trained['train_rows']] = trained['train_risk']
+    risk[trained['test_rows']] = trained['model'].predict_proba(trained['X_test'])[:, 1]
+    return risk
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def churn_risk_counts(version, filters):
+    codes = np.searchsorted(RISK_BINS, churn_risk(version)[filter_rows(version, filters)], side='right')
+    return pd.Series(np.bincount(codes, minlength=len(RISK_SEGMENTS)), index=RISK_SEGMENTS)
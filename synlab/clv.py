@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import filter_rows, load_dataset
+from synlab.perf import counts_calls, counts_misses
+
+CLV_SEGMENTS = ['Low Value', 'Medium Value', 'High Value']
+
+# Weight of each survey signal in the CLV estimate (sums to 1)
+CLV_WEIGHTS = {
+    'rating': 0.30,
+    'recommendation': 0.25,
+    'familiarity': 0.20,
+    'share_of_wallet': 0.25,
+}
+
+# Scores are scaled into the same 20-150 band the dashboard has always shown
+CLV_MIN, CLV_MAX = 20, 150
+
+
+# Score every respondent in one vectorized pass over the survey signals
+def score_clv(data):
+    rating = data['SYNLAB_Rating_1_5'].to_numpy(dtype=np.float64, na_value=3.0)
+    recommendation = data['Likelihood_to_Recommend'].to_numpy(dtype=np.float64, na_value=3.0)
+    familiarity = data['Familiarity_Score'].to_numpy(dtype=np.float64, na_value=1.0)
+    used = data['Used_SYNLAB'].to_numpy(dtype=np.float64, na_value=0.0)
+    labs_used = data['Total_Labs_Used'].to_numpy(dtype=np.float64, na_value=1.0)
+
+    # SYNLAB users who spread their tests over fewer labs are worth more
+    share_of_wallet = used / np.maximum(labs_used, 1.0)
+
+    score = (
+        CLV_WEIGHTS['rating'] * np.clip((rating - 1) / 4, 0, 1)
+        + CLV_WEIGHTS['recommendation'] * np.clip((recommendation - 1) / 4, 0, 1)
+        + CLV_WEIGHTS['familiarity'] * np.clip((familiarity - 1) / 2, 0, 1)
+        + CLV_WEIGHTS['share_of_wallet'] * share_of_wallet
+    )
+    return (CLV_MIN + (CLV_MAX - CLV_MIN) * score).astype(np.float32)
+
+
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def clv_scores(version):
+    return score_clv(load_dataset(version))
+
+
+# Segment cut points are tertiles of the whole dataset so that a
+# respondent keeps the same segment whatever filters are applied
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def clv_boundaries(version):
+    return np.quantile(clv_scores(version), [1 / 3, 2 / 3]).tolist()
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def clv_segment_counts(version, filters):
+    rows = filter_rows(version, filters)
+    codes = np.searchsorted(clv_boundaries(version), clv_scores(version)[rows], side='right')
+    return pd.Series(np.bincount(codes, minlength=len(CLV_SEGMENTS)), index=CLV_SEGMENTS)
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def clv_by_group(version, filters, column='Age_Group'):
+    rows = filter_rows(version, filters)
+    groups = load_dataset(version)[column].to_numpy()[rows]
+    return pd.Series(clv_scores(version)[rows]).groupby(groups).mean()
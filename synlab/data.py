@@ -0,0 +1,89 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.metrics import record_dataset_load
+from synlab.perf import counts_calls, counts_misses
+
+# Resolved from the package so scripts run from other directories
+# (e.g. data/synlab_dashboard.py) share the same dataset. SYNLAB_DATA_PATH
+# points every page at another survey file with the same columns (the
+# benchmarks use it for synthetic datasets).
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.environ.get('SYNLAB_DATA_PATH', os.path.join(ROOT, "data", "SYNLAB_Surveydata_AUGMENTED_500.csv"))
+
+# Global sidebar filters kept in session state by app.py
+GLOBAL_FILTERS = {
+    'age_filter': 'Age_Group',
+    'occupation_filter': 'Occupation',
+    'gender_filter': 'Gender',
+    'familiarity_filter': 'Familiarity_with_SYNLAB',
+}
+
+
+# Identify a dataset by file name, size and modification time
+def data_version(path=DATA_PATH):
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+# Load the survey once per dataset version (shared, treat as read-only)
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def load_dataset(version, path=DATA_PATH):
+    started = time.perf_counter()
+    data = pd.read_csv(path)
+    record_dataset_load(time.perf_counter() - started, len(data))
+    return data
+
+
+def get_data(path=DATA_PATH):
+    version = data_version(path)
+    return version, load_dataset(version, path)
+
+
+# Hashable snapshot of the global filters, used as a cache key
+def filter_state():
+    filters = []
+    for key, column in GLOBAL_FILTERS.items():
+        if key in st.session_state:
+            filters.append((column, tuple(sorted(str(v) for v in st.session_state[key]))))
+    return tuple(filters)
+
+
+# Filter state the sidebar produces with every value selected, except
+# the columns given in selected ({column: values}); used to prebuild
+# caches for presets under the same keys the pages use
+def default_filter_state(version, selected=None):
+    data = load_dataset(version)
+    selected = dict(selected or {})
+    filters = []
+    for column in GLOBAL_FILTERS.values():
+        values = selected.pop(column, data[column].unique())
+        filters.append((column, tuple(sorted(str(v) for v in values))))
+    for column, values in sorted(selected.items()):
+        filters.append((column, tuple(sorted(str(v) for v in values))))
+    return tuple(filters)
+
+
+# Row positions matching a filter state
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=32)
+@counts_misses
+def filter_rows(version, filters):
+    data = load_dataset(version)
+    mask = np.ones(len(data), dtype=bool)
+    for column, values in filters:
+        mask &= data[column].astype(str).isin(values).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def filtered_frame(version, filters):
+    data = load_dataset(version)
+    if not filters:
+        return data
+    return data.iloc[filter_rows(version, filters)]
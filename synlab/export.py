@@ -0,0 +1,170 @@
+import importlib.util
+import os
+import secrets
+import shutil
+import threading
+import time
+import weakref
+
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.web.server.app_static_file_handler import MAX_APP_STATIC_FILE_SIZE
+
+from synlab.data import ROOT, load_dataset
+
+# Format -> (file extension, MIME type, optional dependency)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv', None),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', None),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'openpyxl'),
+}
+# Personal data left out of exports unless explicitly selected
+PII_COLUMNS = ['Email_Address']
+EXPORT_CHUNK_ROWS = 50_000
+# Exports larger than this (rows x columns) are written in a background thread
+BACKGROUND_EXPORT_CELLS = 2_000_000
+EXCEL_MAX_ROWS = 1_048_575
+
+# Finished exports are served by Streamlit's static file handler
+# (server.enableStaticServing) from a random per-export folder, so the
+# browser streams the file from disk instead of the app reading it into
+# a download button. Streamlit refuses static files over 200 MB.
+EXPORT_DIR = os.path.join(ROOT, 'static', 'exports')
+EXPORT_URL = 'app/static/exports'
+EXPORT_MAX_BYTES = MAX_APP_STATIC_FILE_SIZE
+# Exports left behind by sessions that never ended cleanly
+EXPORT_MAX_AGE_SECONDS = 3600
+
+
+def available_formats():
+    return [name for name, (_, _, module) in EXPORT_FORMATS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def default_export_columns(columns):
+    return [column for column in columns if column not in PII_COLUMNS]
+
+
+# Row/column slices of the dataset, one chunk at a time, so the export
+# never holds a second copy of the whole filtered view
+def export_chunks(version, rows, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    data = load_dataset(version)
+    positions = data.columns.get_indexer(columns)
+    for start in range(0, len(rows), chunk_rows):
+        yield start, data.iloc[rows[start:start + chunk_rows], positions]
+
+
+# CSV and Parquet go through Arrow, which encodes without holding the
+# GIL so a background export does not stall other sessions
+def write_csv(chunks, path, progress, schema):
+    with pcsv.CSVWriter(path, schema, write_options=pcsv.WriteOptions(quoting_style='needed')) as writer:
+        for start, chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            progress(start + len(chunk))
+
+
+def write_parquet(chunks, path, progress, schema):
+    with pq.ParquetWriter(path, schema) as writer:
+        for start, chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            progress(start + len(chunk))
+
+
+def write_excel(chunks, path, progress, columns):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Respondents')
+    sheet.append(columns)
+    for start, chunk in chunks:
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+            sheet.append(list(row))
+        progress(start + len(chunk))
+    workbook.save(path)
+
+
+# Arrow schema from the full column dtypes, so chunks where a text
+# column happens to be empty still match
+def arrow_schema(version, columns):
+    sample = load_dataset(version)[columns].iloc[:0]
+    schema = pa.Schema.from_pandas(sample, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, pa.field(field.name, pa.string()))
+    return schema
+
+
+# Write the selected rows/columns to path in the given format
+def write_export(version, rows, columns, fmt, path, progress=lambda written: None):
+    if fmt == 'Excel' and len(rows) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS:,} rows; export {len(rows):,} rows as CSV or Parquet")
+    chunks = export_chunks(version, rows, columns)
+    if fmt == 'CSV':
+        write_csv(chunks, path, progress, arrow_schema(version, columns))
+    elif fmt == 'Parquet':
+        write_parquet(chunks, path, progress, arrow_schema(version, columns))
+    elif fmt == 'Excel':
+        write_excel(chunks, path, progress, columns)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+# Start an export into its own folder under EXPORT_DIR. Large exports
+# run in a background thread; the returned job dict reports progress.
+def start_export(version, rows, columns, fmt):
+    sweep_exports()
+    extension, mime, _ = EXPORT_FORMATS[fmt]
+    token = secrets.token_urlsafe(16)
+    file_name = f"synlab_respondents.{extension}"
+    path = os.path.join(EXPORT_DIR, token, file_name)
+    os.makedirs(os.path.dirname(path))
+    job = {'path': path, 'url': f"{EXPORT_URL}/{token}/{file_name}", 'file_name': file_name,
+           'format': fmt, 'mime': mime, 'rows': len(rows), 'written': 0,
+           'error': None, 'done': threading.Event(), 'discarded': False}
+
+    def progress(written):
+        job['written'] = written
+
+    def run():
+        try:
+            write_export(version, rows, columns, fmt, path, progress)
+        except Exception as e:
+            job['error'] = e
+        finally:
+            job['done'].set()
+            if job['discarded']:
+                discard_export(job)
+
+    if len(rows) * len(columns) > BACKGROUND_EXPORT_CELLS:
+        threading.Thread(target=run, name='synlab-export', daemon=True).start()
+    else:
+        run()
+    return job
+
+
+# Remove an export's folder; a job still writing removes it when done
+def discard_export(job):
+    if not job:
+        return
+    job['discarded'] = True
+    if job['done'].is_set():
+        shutil.rmtree(os.path.dirname(job['path']), ignore_errors=True)
+
+
+# Discard the export when the browser session that started it ends
+def discard_with_session(job):
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        weakref.finalize(ctx.session_state, discard_export, job)
+
+
+def sweep_exports(max_age=EXPORT_MAX_AGE_SECONDS):
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        if entry.is_dir() and entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,104 @@
+import hashlib
+import inspect
+import json
+import logging
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from synlab.data import filter_rows
+from synlab.perf import counts_calls, counts_misses, current_run, timed
+from synlab.snapshot import figure_key, snapshot_figure
+
+# Charts are declared as (aggregate query, figure builder):
+#   query(version, filters, *args) -> aggregate
+#   build(aggregate, **spec) -> go.Figure
+# Built figures are cached as Plotly JSON keyed by data version, filter
+# state, query arguments and spec, so reruns triggered by unrelated
+# widgets skip both the aggregation and the figure construction.
+CHARTS = {}
+
+logger = logging.getLogger(__name__)
+
+
+# Fingerprint of a function's code, so editing a query or builder
+# invalidates its cached figures. Nested code objects (comprehensions,
+# lambdas) are hashed by content: their repr holds a memory address,
+# which would give every process a different fingerprint.
+def code_fingerprint(*functions):
+    digest = hashlib.sha1()
+    for function in functions:
+        update_code_digest(digest, inspect.unwrap(function).__code__)
+    return digest.hexdigest()
+
+
+def update_code_digest(digest, code):
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            update_code_digest(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+
+def register_chart(name, query, build):
+    CHARTS[name] = {'query': query, 'build': build, 'code': code_fingerprint(query, build)}
+    return name
+
+
+# None when the aggregate is empty (nothing to plot for these filters)
+@counts_calls
+@st.cache_data(show_spinner=False, max_entries=256)
+@counts_misses
+def figure_json(name, code, version, filters, args, spec):
+    chart = CHARTS[name]
+    aggregate = chart['query'](version, filters, *args)
+    if getattr(aggregate, 'empty', False):
+        return None
+    return chart['build'](aggregate, **dict(spec)).to_json()
+
+
+# Cached figure for a registered chart, taken from the prebuilt snapshot
+# when it covers this state. The JSON was produced by a validated
+# figure, so it is loaded back without re-validation.
+def figure(name, version, filters, *args, **spec):
+    if name not in CHARTS:
+        # Chart declarations live in synlab.charts, which imports this module
+        import synlab.charts
+    code = CHARTS[name]['code']
+    spec = tuple(sorted(spec.items()))
+    key = figure_key(name, code, filters, args, spec)
+    serialized = snapshot_figure(version, key)
+    if serialized is None:
+        serialized = figure_json(name, code, version, filters, args, spec)
+    elif serialized == '':
+        # The snapshot records empty aggregates as ''
+        return None
+    if serialized is None:
+        return None
+    return go.Figure(json.loads(serialized), _validate=False)
+
+
+# Size of the figure JSON sent to the browser; only serialized when a
+# rerun is being timed or INFO logging is enabled for this module
+def render(fig, name, section):
+    if current_run() is not None or logger.isEnabledFor(logging.INFO):
+        section['bytes'] = len(fig.to_json().encode())
+        logger.info("figure %s: %d bytes", name, section['bytes'])
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def show(fig, name):
+    with timed(f"chart: {name}") as section:
+        render(fig, name, section)
+
+
+def plot(name, version, filters, *args, **spec):
+    with timed(f"chart: {name}") as section:
+        if current_run() is not None:
+            section['rows'] = len(filter_rows(version, filters))
+        fig = figure(name, version, filters, *args, **spec)
+        if fig is None:
+            st.info("No data for the current filters.")
+        else:
+            render(fig, name, section)
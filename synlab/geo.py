@@ -0,0 +1,191 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import ROOT, filter_rows, load_dataset
+from synlab.kpis import LABS, grouped_sums, kpi_frame, kpi_inputs
+from synlab.perf import counts_calls, counts_misses
+from synlab.segments import SEGMENTS, segment_codes
+
+# Above this many respondents the map switches to aggregated grid cells
+MAP_POINT_THRESHOLD = int(os.environ.get('SYNLAB_MAP_POINT_THRESHOLD', 2000))
+
+# Roughly this many grid cells span the map width at any zoom level
+CELLS_PER_VIEW = 32
+
+BRANCHES_PATH = os.path.join(ROOT, "data", "branches.csv")
+
+EARTH_RADIUS_KM = 6371.0
+
+# Respondents are indexed by ~110 m location cells. Catchment radii are
+# kilometres, so the boundary error stays small while the tree and the
+# branch x cell membership matrix shrink by orders of magnitude.
+LOCATION_CELL_DEGREES = 1e-3
+
+
+def cell_size(zoom):
+    return 360 / (2 ** zoom) / CELLS_PER_VIEW
+
+
+def coordinates(data):
+    return data['Latitude'].to_numpy(dtype=np.float64), data['Longitude'].to_numpy(dtype=np.float64)
+
+
+# Factorize integer grid coordinates into cell ids, packing each
+# (row, column) pair into one int64 key so hashing replaces sorting
+def grid_cells(cell_y, cell_x):
+    cell_y, cell_x = cell_y.astype(np.int64), cell_x.astype(np.int64)
+    offset = int(-cell_x.min()) if len(cell_x) else 0
+    width = int(cell_x.max()) + offset + 1 if len(cell_x) else 1
+    inverse, keys = pd.factorize(cell_y * width + (cell_x + offset))
+    cells = np.column_stack([np.floor_divide(keys, width), np.mod(keys, width) - offset])
+    return inverse, cells
+
+
+# Bin respondents into a square lat/lon grid sized for the zoom level.
+# Returns one row per occupied cell with its count and segment mix.
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def spatial_bins(version, filters, zoom):
+    rows = filter_rows(version, filters)
+    lat, lon = coordinates(load_dataset(version))
+    lat, lon = lat[rows], lon[rows]
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon = lat[valid], lon[valid]
+    segments = segment_codes(version)[rows][valid]
+
+    size = cell_size(zoom)
+    inverse, cells = grid_cells(np.floor(lat / size), np.floor(lon / size))
+
+    counts = np.bincount(inverse, minlength=len(cells))
+    mix = np.bincount(inverse * len(SEGMENTS) + segments,
+                      minlength=len(cells) * len(SEGMENTS)).reshape(len(cells), len(SEGMENTS))
+
+    bins = pd.DataFrame({
+        'Latitude': (cells[:, 0] + 0.5) * size,
+        'Longitude': (cells[:, 1] + 0.5) * size,
+        'Respondents': counts,
+        'Segment': np.array(SEGMENTS)[mix.argmax(axis=1)],
+    })
+    for i, segment in enumerate(SEGMENTS):
+        bins[segment] = (mix[:, i] / counts * 100).round(1)
+    return bins
+
+
+# Equirectangular projection to kilometres around the reference
+# latitude; accurate to well under 1% across a city
+def project(lat, lon, lat0):
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([EARTH_RADIUS_KM * lon * np.cos(np.radians(lat0)),
+                            EARTH_RADIUS_KM * lat])
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def load_branches(path=BRANCHES_PATH):
+    return pd.read_csv(path)
+
+
+# Spatial index over respondent location cells, built once per dataset version
+@counts_calls
+@st.cache_resource(show_spinner="Building spatial index...", max_entries=2)
+@counts_misses
+def location_index(version):
+    from sklearn.neighbors import KDTree
+
+    lat, lon = coordinates(load_dataset(version))
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    inverse, cells = grid_cells(np.round(lat[valid] / LOCATION_CELL_DEGREES),
+                                np.round(lon[valid] / LOCATION_CELL_DEGREES))
+    cell_of_row = np.full(len(lat), -1, dtype=np.int64)
+    cell_of_row[valid] = inverse
+    cell_lat = cells[:, 0] * LOCATION_CELL_DEGREES
+    cell_lon = cells[:, 1] * LOCATION_CELL_DEGREES
+    lat0 = float(np.mean(cell_lat)) if len(cells) else 0.0
+    return {
+        'tree': KDTree(project(cell_lat, cell_lon, lat0)),
+        'cell_of_row': cell_of_row,
+        'n_cells': len(cells),
+        'lat0': lat0,
+    }
+
+
+# Batch radius query: sparse (points x cells) membership matrix
+def radius_query(index, lat, lon, radius_km):
+    members = index['tree'].query_radius(project(lat, lon, index['lat0']), r=radius_km)
+    lengths = np.array([len(m) for m in members])
+    rows = np.repeat(np.arange(len(members)), lengths)
+    cols = np.concatenate(members) if len(members) else np.empty(0, dtype=np.int64)
+    import scipy.sparse as sp
+    return sp.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(len(members), index['n_cells']))
+
+
+# KPI input sums per location cell for the filtered respondents
+def cell_sums(version, filters, lab):
+    index = location_index(version)
+    rows = filter_rows(version, filters)
+    cells = index['cell_of_row'][rows]
+    located = cells >= 0
+    inputs = kpi_inputs(load_dataset(version), lab, rows[located])
+    return grouped_sums(inputs, cells[located], index['n_cells'])
+
+
+# Awareness and usage within radius_km of every branch, for SYNLAB and
+# for the branch's own lab, via the shared KPI code
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def catchment_kpis(version, filters, radius_km, branches_path=BRANCHES_PATH):
+    branches = load_branches(branches_path)
+    index = location_index(version)
+    membership = radius_query(index, branches['Latitude'].to_numpy(), branches['Longitude'].to_numpy(), radius_km)
+
+    synlab = kpi_frame({name: membership @ sums for name, sums in cell_sums(version, filters, 'SYNLAB').items()})
+    own = pd.DataFrame(index=branches.index, columns=['Lab_Awareness', 'Lab_Usage'], dtype=float)
+    for lab in branches['Lab'].unique():
+        if lab not in LABS:
+            continue
+        mask = (branches['Lab'] == lab).to_numpy()
+        lab_kpis = kpi_frame({name: membership[mask] @ sums for name, sums in cell_sums(version, filters, lab).items()})
+        own.loc[mask, 'Lab_Awareness'] = lab_kpis['Awareness'].to_numpy()
+        own.loc[mask, 'Lab_Usage'] = lab_kpis['Usage'].to_numpy()
+
+    table = branches[['Lab', 'Branch']].copy()
+    table['Respondents'] = synlab['Respondents'].to_numpy()
+    table['SYNLAB_Awareness'] = synlab['Awareness'].to_numpy()
+    table['SYNLAB_Usage'] = synlab['Usage'].to_numpy()
+    table['Lab_Awareness'] = own['Lab_Awareness'].to_numpy()
+    table['Lab_Usage'] = own['Lab_Usage'].to_numpy()
+    return table
+
+
+# SYNLAB usage by distance from each respondent to the nearest SYNLAB branch
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def usage_by_branch_distance(version, filters, bands_km=(1, 3, 5, 10), branches_path=BRANCHES_PATH):
+    from sklearn.neighbors import KDTree
+
+    branches = load_branches(branches_path)
+    synlab = branches[branches['Lab'] == 'SYNLAB']
+    index = location_index(version)
+    lat0 = index['lat0']
+    branch_tree = KDTree(project(synlab['Latitude'].to_numpy(), synlab['Longitude'].to_numpy(), lat0))
+
+    rows = filter_rows(version, filters)
+    data = load_dataset(version)
+    lat, lon = coordinates(data)
+    lat, lon = lat[rows], lon[rows]
+    located = ~(np.isnan(lat) | np.isnan(lon))
+    distance = np.empty(0)
+    if located.any():
+        distance, _ = branch_tree.query(project(lat[located], lon[located], lat0), k=1)
+    edges = list(bands_km)
+    labels = [f"< {edges[0]} km"] + [f"{a}-{b} km" for a, b in zip(edges, edges[1:])] + [f"> {edges[-1]} km"]
+    band = np.searchsorted(edges, distance.ravel(), side='right')
+    sums = grouped_sums(kpi_inputs(data, 'SYNLAB', rows[located]), band, len(labels))
+    return kpi_frame(sums, index=labels)
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import ROOT, filter_rows, load_dataset
+from synlab.geo import project
+from synlab.kpis import grouped_sums, kpi_frame, kpi_inputs
+from synlab.perf import counts_calls, counts_misses
+from synlab.shrinkage import rate_estimates
+
+AREAS_PATH = os.path.join(ROOT, "data", "lagos_areas.csv")
+
+# Respondents farther than this from every centroid are left unassigned
+MAX_MATCH_KM = 8.0
+
+
+def area_key(name):
+    return re.sub(r'[^a-z0-9]', '', str(name).lower())
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def load_areas(path=AREAS_PATH):
+    return pd.read_csv(path, keep_default_na=False)
+
+
+# Survey spelling -> reference area name, including the Aliases column
+def area_lookup(areas):
+    lookup = {}
+    for area, aliases in zip(areas['Area'], areas['Aliases']):
+        lookup[area_key(area)] = area
+        for alias in filter(None, aliases.split('|')):
+            lookup[area_key(alias)] = area
+    return lookup
+
+
+def areas_fingerprint(areas):
+    return hashlib.sha1(pd.util.hash_pandas_object(areas, index=False).to_numpy().tobytes()).hexdigest()
+
+
+# Nearest reference centroid for every point in one batched KD-tree query.
+# Points with missing coordinates but a known area label fall back to that
+# area's centroid; the label is then validated against the assignment.
+def geocode_points(lat, lon, labels, areas):
+    lat = np.asarray(lat, dtype=np.float64).copy()
+    lon = np.asarray(lon, dtype=np.float64).copy()
+    labels = pd.Series(labels).reset_index(drop=True)
+
+    lookup = area_lookup(areas)
+    label_area = labels.map(lambda label: lookup.get(area_key(label)) if pd.notna(label) else None)
+    centroids = areas.set_index('Area')[['Latitude', 'Longitude']]
+
+    source = np.where(np.isnan(lat) | np.isnan(lon), 'Missing', 'Survey').astype(object)
+    fill = (source == 'Missing') & label_area.notna().to_numpy()
+    if fill.any():
+        lat[fill] = centroids.loc[label_area[fill], 'Latitude'].to_numpy()
+        lon[fill] = centroids.loc[label_area[fill], 'Longitude'].to_numpy()
+        source[fill] = 'Area Centroid'
+
+    from sklearn.neighbors import KDTree
+
+    lat0 = float(areas['Latitude'].mean())
+    tree = KDTree(project(areas['Latitude'].to_numpy(), areas['Longitude'].to_numpy(), lat0))
+    located = ~(np.isnan(lat) | np.isnan(lon))
+    distance = np.full(len(lat), np.nan)
+    nearest = np.full(len(lat), -1)
+    if located.any():
+        dist, idx = tree.query(project(lat[located], lon[located], lat0), k=1)
+        distance[located] = dist.ravel()
+        nearest[located] = idx.ravel()
+    matched = located & (distance <= MAX_MATCH_KM)
+
+    assigned = pd.Series(np.where(matched, areas['Area'].to_numpy()[nearest], None), dtype=object)
+    lga = pd.Series(np.where(matched, areas['LGA'].to_numpy()[nearest], None), dtype=object)
+    lga_of = dict(zip(areas['Area'], areas['LGA']))
+    label_lga = label_area.map(lga_of)
+    return pd.DataFrame({
+        'Area_Label': label_area,
+        'Area_Assigned': assigned,
+        'LGA': lga,
+        'Distance_km': distance,
+        'Location_Source': source,
+        'Area_Matches': (label_area == assigned).to_numpy() & matched,
+        'LGA_Matches': (label_lga == lga).to_numpy() & matched,
+        'Latitude': lat,
+        'Longitude': lon,
+    })
+
+
+# Assignment of every respondent in a dataset version (shared, treat as
+# read-only); keyed on the version and the reference table, so reruns
+# neither hash the rows nor copy the result
+@counts_calls
+@st.cache_resource(show_spinner="Geocoding respondents...", max_entries=2)
+@counts_misses
+def dataset_assignments(version, areas_hash, _areas):
+    data = load_dataset(version)
+    return geocode_points(data['Latitude'].to_numpy(), data['Longitude'].to_numpy(), data['Area'].to_numpy(), _areas)
+
+
+def area_assignments(version):
+    areas = load_areas()
+    return dataset_assignments(version, areas_fingerprint(areas), areas)
+
+
+# Agreement between the survey Area label and the coordinates, per label
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def area_validation(version, filters):
+    rows = filter_rows(version, filters)
+    assigned = area_assignments(version).iloc[rows]
+    table = pd.DataFrame({
+        'Survey_Area': load_dataset(version)['Area'].fillna('Missing').to_numpy()[rows],
+        'Assigned_Area': assigned['Area_Assigned'].fillna('Outside Lagos reference').to_numpy(),
+        'Matches': assigned['Area_Matches'].to_numpy(),
+        'Distance_km': assigned['Distance_km'].to_numpy(),
+    })
+    summary = table.groupby('Survey_Area').agg(
+        Respondents=('Matches', 'size'),
+        Match_Rate=('Matches', 'mean'),
+        Median_Distance_km=('Distance_km', 'median'),
+        Most_Common_Assignment=('Assigned_Area', lambda s: s.value_counts().index[0]),
+    )
+    summary['Match_Rate'] *= 100
+    return summary.sort_values('Respondents', ascending=False)
+
+
+# SYNLAB KPIs per assigned area with shrunk rate estimates; small areas
+# are pulled towards the across-area rate instead of swinging to 0/100%
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def area_kpis(version, filters):
+    rows = filter_rows(version, filters)
+    codes, names = pd.factorize(area_assignments(version)['Area_Assigned'].to_numpy()[rows])
+    known = codes >= 0
+    sums = grouped_sums(kpi_inputs(load_dataset(version), 'SYNLAB', rows[known]), codes[known], len(names))
+    index = pd.Index(names, name='Area')
+    table = kpi_frame(sums, index=index).join(rate_estimates(sums, index=index))
+    return table.sort_values('Respondents', ascending=False)
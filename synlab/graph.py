@@ -0,0 +1,74 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from synlab.figures import code_fingerprint
+from synlab.perf import timed
+
+# A small computation graph for a page script. Inputs are the values a
+# rerun can change (data version, filter state, widget values); nodes
+# declare which inputs or other nodes they depend on. On a rerun a node
+# is re-evaluated only if one of its dependencies changed, otherwise its
+# value comes from a per-session memo table.
+#
+#   g = page_graph('dashboard')
+#   graph_input(g, 'filters', active_filters)
+#   rows = graph_node(g, 'rows', ['filters'], lambda filters: ...)
+#
+# Input values must be comparable with == (strings, numbers, tuples).
+
+
+def page_graph(name):
+    memo = st.session_state.setdefault(f'_graph_{name}', {})
+    return {'name': name, 'memo': memo, 'inputs': {}, 'nodes': {}, 'timings': []}
+
+
+def graph_input(graph, name, value):
+    graph['inputs'][name] = value
+    return value
+
+
+# A dependency's fingerprint: its value for inputs, its version (bumped
+# on every re-evaluation) for nodes
+def dependency_key(graph, name):
+    if name in graph['inputs']:
+        return ('input', graph['inputs'][name])
+    if name in graph['nodes']:
+        return ('node', graph['memo'][name]['version'])
+    raise KeyError(f"{name!r} is not an input or an earlier node of graph {graph['name']!r}")
+
+
+def graph_node(graph, name, dependencies, function):
+    key = (code_fingerprint(function),) + tuple(dependency_key(graph, dep) for dep in dependencies)
+    entry = graph['memo'].get(name)
+    started = time.perf_counter()
+    if entry is not None and entry['key'] == key:
+        status = 'memo'
+    else:
+        with timed(f"node: {name}"):
+            value = function(*(graph['inputs'][dep] if dep in graph['inputs'] else graph['nodes'][dep]
+                               for dep in dependencies))
+        entry = {'key': key, 'value': value, 'version': entry['version'] + 1 if entry else 0}
+        graph['memo'][name] = entry
+        status = 'computed'
+    graph['nodes'][name] = entry['value']
+    graph['timings'].append({'Node': name, 'Depends on': ', '.join(dependencies), 'Status': status,
+                             'ms': (time.perf_counter() - started) * 1000})
+    return entry['value']
+
+
+def graph_timings(graph):
+    return pd.DataFrame(graph['timings'], columns=['Node', 'Depends on', 'Status', 'ms'])
+
+
+# Per-node timings for the last rerun; add ?debug=1 to the URL to show it
+def graph_panel(graph):
+    if st.query_params.get('debug') != '1':
+        return
+    with st.sidebar.expander("🛠 Computation graph"):
+        timings = graph_timings(graph)
+        computed = timings['Status'] == 'computed'
+        st.caption(f"{computed.sum()} of {len(timings)} nodes re-evaluated in "
+                   f"{timings.loc[computed, 'ms'].sum():.1f} ms")
+        st.dataframe(timings.style.format({'ms': '{:.1f}'}), hide_index=True, use_container_width=True)
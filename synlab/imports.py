@@ -0,0 +1,66 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import streamlit as st
+
+from synlab.data import ROOT
+
+# Modules expensive enough to keep off the page import path; they are
+# imported inside the functions that need them. plotly.express is not
+# one of them: the chart declarations and the pages' own charts import
+# it at module level, so it shows up in the timings table instead.
+HEAVY_MODULES = ['sklearn', 'scipy.stats', 'scipy.special', 'scipy.sparse']
+
+# Runs in a fresh interpreter: executes the import statements one at a
+# time, so each row is what that import adds on top of the ones above
+PROBE = """
+import json, sys, time
+statements, heavy = json.load(sys.stdin)
+seconds = []
+for statement in statements:
+    started = time.perf_counter()
+    exec(statement, {})
+    seconds.append(time.perf_counter() - started)
+print(json.dumps({'seconds': seconds, 'heavy': [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def import_statements(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+# Cold import cost of a script's top-level imports, measured once per
+# version of the file
+@st.cache_data(show_spinner="Timing imports in a fresh interpreter...")
+def import_times(path, mtime):
+    statements = import_statements(path)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', PROBE], input=json.dumps([statements, HEAVY_MODULES]),
+                            capture_output=True, text=True, cwd=ROOT, env=env, timeout=300, check=True)
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    times = pd.DataFrame({'Import': statements, 'Seconds': probe['seconds']})
+    return times.sort_values('Seconds', ascending=False, kind='stable'), probe['heavy']
+
+
+# Debug panel with the page's import budget; add ?debug=1 to the URL to show it
+def import_panel(script):
+    if st.query_params.get('debug') != '1':
+        return
+    with st.sidebar.expander("🛠 Import timings"):
+        path = os.path.abspath(script)
+        try:
+            times, heavy = import_times(path, os.path.getmtime(path))
+        except (subprocess.SubprocessError, OSError, ValueError) as e:
+            st.warning(f"Could not time imports: {e}")
+            return
+        st.caption(f"Cold imports for {os.path.basename(path)}: {times['Seconds'].sum():.2f}s")
+        st.dataframe(times.style.format({'Seconds': '{:.3f}'}), hide_index=True, use_container_width=True)
+        st.caption("Heavy modules loaded at import: " + (', '.join(heavy) or "none"))
+        resident = [module for module in HEAVY_MODULES if module in sys.modules]
+        st.caption("Loaded in this worker so far: " + (', '.join(resident) or "none"))
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+LABS = ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal']
+SCALE_LEVELS = np.arange(1, 6)
+
+
+def lab_column(prefix, lab):
+    return f"{prefix}_{lab.replace(' ', '_')}"
+
+
+# Per-respondent KPI inputs; every KPI is a ratio of sums of these,
+# so any grouping (segment, area, catchment) only needs grouped sums.
+# rows selects respondents without copying the rest of the frame.
+def kpi_inputs(data, lab='SYNLAB', rows=None):
+    def column(name):
+        values = data[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        return values if rows is None else values[rows]
+
+    rating = column('SYNLAB_Rating_1_5')
+    recommend = column('Likelihood_to_Recommend')
+    aware = column(lab_column('Heard', lab))
+    users = column(lab_column('Used', lab))
+    return {
+        'Respondents': np.ones(len(rating)),
+        'Aware': aware,
+        'Users': users,
+        # Some users report never having heard of the lab
+        'Aware_Users': aware * users,
+        'Rating_Sum': np.nan_to_num(rating),
+        'Rated': (~np.isnan(rating)).astype(np.float64),
+        'Promoters': (recommend >= 3).astype(np.float64),
+        'Detractors': (recommend <= 2).astype(np.float64),
+    }
+
+
+# Sum KPI inputs per group id in one bincount per input
+def grouped_sums(inputs, groups, n_groups):
+    return {name: np.bincount(groups, weights=values, minlength=n_groups)
+            for name, values in inputs.items()}
+
+
+# KPI table from (grouped) sums
+def kpi_frame(sums, index=None):
+    respondents = np.asarray(sums['Respondents'], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'Respondents': respondents.astype(np.int64),
+            'Aware': np.asarray(sums['Aware']).astype(np.int64),
+            'Users': np.asarray(sums['Users']).astype(np.int64),
+            'Awareness': sums['Aware'] / respondents * 100,
+            'Usage': sums['Users'] / respondents * 100,
+            # Share of aware respondents who use the lab
+            'Penetration': sums['Aware_Users'] / sums['Aware'] * 100,
+            'Avg_Rating': sums['Rating_Sum'] / sums['Rated'],
+            'NPS': (sums['Promoters'] - sums['Detractors']) / respondents * 100,
+        }, index=index)
+
+
+# Respondents per level of a 1-5 survey scale, binned server-side so
+# charts get a fixed-size payload; missing or off-scale answers are dropped
+def scale_counts(values, levels=SCALE_LEVELS):
+    values = np.asarray(values, dtype=np.float64)
+    values = values[(values >= levels[0]) & (values <= levels[-1])]
+    counts = np.bincount(np.rint(values - levels[0]).astype(np.int64), minlength=len(levels))
+    return pd.Series(counts, index=levels)
+
+
+def brand_kpis(data, lab='SYNLAB'):
+    sums = {name: values.sum(keepdims=True) for name, values in kpi_inputs(data, lab).items()}
+    return kpi_frame(sums).iloc[0]
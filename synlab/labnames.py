@@ -0,0 +1,238 @@
+import json
+import os
+import re
+from collections import Counter
+from string import capwords
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import ROOT, filter_rows, load_dataset
+from synlab.perf import counts_calls, counts_misses
+from synlab.text import PLACEHOLDER_TEXT
+
+LAB_NAME_COLUMNS = ['Other_Labs_Named', 'Other_Labs_Mentioned']
+
+# Reviewed key -> canonical name mapping. The app starts from it and only
+# clusters spellings it doesn't contain; `python -m synlab lab-names
+# --write` adds a dataset's new spellings for review.
+LAB_MAPPING_PATH = os.environ.get('SYNLAB_LAB_MAPPING_PATH', os.path.join(ROOT, "data", "lab_name_mapping.json"))
+
+# Labs tracked by the dashboard; clusters containing one take its spelling
+KNOWN_LABS = ['SYNLAB', 'Clinix', 'Mecure', 'Clina Lancet', 'Afriglobal']
+
+# Short forms edit distance can't reach
+LAB_ALIASES = {
+    'synlabnigeria': 'SYNLAB',
+    'lancet': 'Clina Lancet',
+}
+
+LIST_SEPARATORS = re.compile(r'\s*[,;/\n]+\s*')
+WORD_SEPARATORS = re.compile(r'\s+(?:and|&)\s+', re.IGNORECASE)
+
+# Blocking and matching thresholds
+MIN_SHARED_NGRAMS = 2
+MAX_EDIT_RATIO = 0.25
+MAX_NAME_WORDS = 5
+
+
+# Words shared by many lab names that carry no identity
+GENERIC_WORDS = re.compile(
+    r"\b(?:lab|labs|laboratory|laboratories|diagnostic|diagnostics|medical|centre|center|"
+    r"clinic|nigeria|ltd|limited|services?)\b")
+
+NON_ANSWERS = {"i don't know", "don't know", "don't know any", "can't remember", "not sure", "nill"}
+
+
+# Matching key without case, punctuation, spaces or generic words:
+# "Afri Global Laboratory" -> "afriglobal"
+def name_key(name):
+    name = name.lower()
+    key = re.sub(r'[^a-z0-9]', '', GENERIC_WORDS.sub(' ', name))
+    return key or re.sub(r'[^a-z0-9]', '', name)
+
+
+# Split one free-text answer into individual lab names. "X and Y" is only
+# treated as a list when every part is short, so multi-word names such
+# as "Harly And Rainbow Specialized Laboratory" survive intact.
+def split_names(answer):
+    names = []
+    for part in LIST_SEPARATORS.split(str(answer).strip()):
+        pieces = WORD_SEPARATORS.split(part)
+        if len(pieces) > 1 and any(len(piece.split()) > 2 for piece in pieces):
+            pieces = [part]
+        for piece in pieces:
+            piece = piece.strip(' .-')
+            lowered = piece.lower().replace('’', "'")
+            if (piece and lowered not in PLACEHOLDER_TEXT and lowered not in NON_ANSWERS
+                    and len(piece.split()) <= MAX_NAME_WORDS):
+                names.append(piece)
+    return names
+
+
+# Keep the respondent's casing unless it carries none ("afriglobal")
+def display_name(name):
+    name = ' '.join(name.split())
+    return capwords(name) if name.islower() else name
+
+
+def edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+# Candidate pairs share at least MIN_SHARED_NGRAMS character trigrams;
+# only those pairs are compared by edit distance
+def candidate_pairs(keys):
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    signatures = CountVectorizer(analyzer='char', ngram_range=(3, 3), binary=True,
+                                 dtype=np.int32).fit_transform([f' {key} ' for key in keys])
+    shared = sp.triu(signatures @ signatures.T, k=1).tocoo()
+    keep = shared.data >= MIN_SHARED_NGRAMS
+    return zip(shared.row[keep], shared.col[keep])
+
+
+def find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+# Extend a key -> canonical name mapping with new spellings, given as
+# (name, count) pairs. Existing canonical names take part in the
+# clustering, so a new batch only compares its unseen keys against what
+# is already known.
+def update_mapping(mapping, mentions):
+    spellings = Counter()
+    for name, count in mentions:
+        key = name_key(name)
+        if key and key not in mapping:
+            spellings[(key, display_name(name))] += count
+    if not spellings:
+        return mapping
+
+    variants = {}
+    for (key, spelling), count in spellings.most_common():
+        variants.setdefault(key, spelling)
+    new_keys = list(variants)
+
+    canonical_names = sorted(set(mapping.values()) | set(KNOWN_LABS))
+    anchors = [name_key(name) for name in canonical_names]
+    keys = anchors + new_keys
+    parents = list(range(len(keys)))
+    for i, j in candidate_pairs(keys):
+        if i < len(anchors) and j < len(anchors):
+            continue
+        a, b = keys[i], keys[j]
+        limit = int(MAX_EDIT_RATIO * max(len(a), len(b)))
+        if edit_distance(a, b, limit) <= limit:
+            root_i, root_j = find(parents, i), find(parents, j)
+            # Keep an anchor (or the most frequent spelling) as the root
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    frequency = Counter()
+    for (key, _), count in spellings.items():
+        frequency[key] += count
+    clusters = {}
+    for position, key in enumerate(new_keys, start=len(anchors)):
+        clusters.setdefault(find(parents, position), []).append(key)
+    updated = dict(mapping)
+    for root, cluster in clusters.items():
+        # The cluster's most frequent spelling, unless an anchor is its root
+        name = canonical_names[root] if root < len(anchors) else variants[max(cluster, key=frequency.__getitem__)]
+        for key in cluster:
+            updated[key] = LAB_ALIASES.get(key, name)
+    return updated
+
+
+# (name, count) for every lab name in the free-text answers
+def all_mentions(data):
+    for column in LAB_NAME_COLUMNS:
+        for answer, count in data[column].dropna().value_counts().items():
+            for name in split_names(answer):
+                yield name, count
+
+
+def load_mapping(path=LAB_MAPPING_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_mapping(mapping, path=LAB_MAPPING_PATH):
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(mapping.items())), f, indent=1, ensure_ascii=False)
+        f.write('\n')
+    os.replace(temporary, path)
+
+
+# Canonical mapping for a dataset version: the reviewed mapping extended
+# with this dataset's unseen spellings, from distinct answers
+@counts_calls
+@st.cache_data(show_spinner="Canonicalizing lab names...")
+@counts_misses
+def lab_name_mapping(version, path=LAB_MAPPING_PATH):
+    mapping = {name_key(name): name for name in KNOWN_LABS}
+    mapping.update(load_mapping(path))
+    return update_mapping(mapping, all_mentions(load_dataset(version)))
+
+
+# Mapping for review; New marks spellings the reviewed mapping lacks
+def mapping_table(mapping, reviewed):
+    table = pd.DataFrame(list(mapping.items()), columns=['Key', 'Canonical_Lab'])
+    table['New'] = ~table['Key'].isin(list(reviewed))
+    return table.sort_values(['New', 'Canonical_Lab', 'Key'], ascending=[False, True, True], ignore_index=True)
+
+
+# Respondent x canonical lab indicator matrix: distinct answers are
+# resolved once and expanded to rows by their factorized codes
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def lab_mentions(version):
+    import scipy.sparse as sp
+
+    data = load_dataset(version)
+    mapping = lab_name_mapping(version)
+    labs = sorted(set(mapping.values()))
+    lab_ids = {lab: i for i, lab in enumerate(labs)}
+    matrix = None
+    for column in LAB_NAME_COLUMNS:
+        codes, uniques = pd.factorize(data[column])
+        rows, cols = [], []
+        for i, answer in enumerate(uniques):
+            for lab in {mapping[name_key(name)] for name in split_names(answer) if name_key(name) in mapping}:
+                rows.append(i)
+                cols.append(lab_ids[lab])
+        per_answer = sp.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)),
+                                   shape=(len(uniques) + 1, len(labs)))
+        # Missing answers (code -1) map to the trailing empty row
+        column_matrix = per_answer[np.where(codes < 0, len(uniques), codes)]
+        matrix = column_matrix if matrix is None else matrix.maximum(column_matrix)
+    return matrix.tocsr(), labs
+
+
+# Respondents mentioning each lab under the given filters
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def competitor_mention_counts(version, filters):
+    matrix, labs = lab_mentions(version)
+    counts = np.asarray(matrix[filter_rows(version, filters)].sum(axis=0)).ravel()
+    return pd.Series(counts, index=labs).sort_values(ascending=False)
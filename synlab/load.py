@@ -0,0 +1,358 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from synlab.bench import BENCH_RESULTS_DIR, DROP_FIRST, environment, synthetic_dataset, write_results
+from synlab.data import ROOT
+
+# Concurrent-session load test. N simulated users connect to a local
+# Streamlit server over the same websocket protocol the browser uses and
+# replay click paths across the five pages: page switches, filter
+# changes and widget interactions (fragment widgets rerun only their
+# fragment, as in the browser). Each level of N reports throughput,
+# client-side latency percentiles, payload size, server memory per
+# session and cache hit rates scraped from the metrics endpoint:
+#
+#   python -m synlab load --sessions 1,10,50,100,200
+#
+# The client runs on the same machine as the server, so on a small box
+# the numbers include the client's share of the CPU.
+LOAD_SESSIONS = (1, 10, 50, 100, 200)
+LOAD_ITERATIONS = 2
+LOAD_THINK_S = 1.0
+LOAD_PORT = 8599
+LOAD_METRICS_PORT = 9465
+STEP_TIMEOUT = 300
+SERVER_START_TIMEOUT = 60
+MEMORY_SAMPLE_S = 0.5
+
+WIDGET_KINDS = ('multiselect', 'slider', 'selectbox', 'text_input', 'button', 'checkbox')
+
+# Click paths: (kind, target, value) steps. 'page' switches to a page by
+# name; other kinds act on the widget with that label on the current
+# page (DROP_FIRST deselects the first selected option). Every path
+# starts on the landing page, where the global filters live.
+CLICK_PATHS = {
+    'executive review': [
+        ('page', 'app', None),
+        ('page', 'Executive Overview', None),
+        ('multiselect', 'Feedback Sentiment', DROP_FIRST),
+        ('page', 'Strategic Analytics', None),
+    ],
+    'segment deep dive': [
+        ('page', 'app', None),
+        ('multiselect', 'Age Group', DROP_FIRST),
+        ('page', 'Customer Insights', None),
+        ('slider', 'Map detail (zoom level)', 12),
+        ('page', 'Competitive Intelligence', None),
+        ('slider', 'Catchment radius (km)', 5.0),
+    ],
+    'model review': [
+        ('page', 'app', None),
+        ('page', 'Advanced Models', None),
+        ('text_input', 'Search suggestions and lab preference reasons', 'results'),
+        ('selectbox', 'Area metric', 'Awareness'),
+        ('button', '🔮 Predict Customer Behavior', None),
+    ],
+    'campaign filters': [
+        ('page', 'app', None),
+        ('multiselect', 'Occupation', DROP_FIRST),
+        ('multiselect', 'Gender', DROP_FIRST),
+        ('page', 'Executive Overview', None),
+        ('page', 'Customer Insights', None),
+    ],
+}
+
+
+def start_server(port=LOAD_PORT, metrics_port=LOAD_METRICS_PORT, data_path=None):
+    env = dict(os.environ, SYNLAB_METRICS_PORT=str(metrics_port))
+    if data_path:
+        env['SYNLAB_DATA_PATH'] = data_path
+    server = subprocess.Popen([sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+                               '--server.port', str(port), '--server.fileWatcherType', 'none',
+                               '--browser.gatherUsageStats', 'false'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not answer on port {port} within {SERVER_START_TIMEOUT}s")
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+# {(name, labels): value} from the Prometheus text endpoint; {} if it
+# is not reachable
+def scrape_metrics(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            text = response.read().decode()
+    except OSError:
+        return {}
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            name, _, labels = series.partition('{')
+            values[(name, labels.rstrip('}'))] = float(value)
+    return values
+
+
+def cache_rates(before, after):
+    rates = {}
+    for (name, labels), calls in after.items():
+        if name != 'synlab_cache_calls_total':
+            continue
+        function = labels.split('"')[1]
+        calls -= before.get((name, labels), 0)
+        misses = after.get(('synlab_cache_misses_total', labels), 0) - before.get(('synlab_cache_misses_total', labels), 0)
+        if calls:
+            rates[function] = {'calls': int(calls), 'misses': int(misses), 'hit_rate': 1 - misses / calls}
+    return rates
+
+
+# Mean script time of the full reruns the server finished in between,
+# from the rerun histogram; client latency above it is queueing and
+# transfer
+def server_rerun_mean(before, after):
+    total = {}
+    for suffix in ('sum', 'count'):
+        name = f'synlab_rerun_duration_seconds_{suffix}'
+        total[suffix] = sum(value - before.get(key, 0) for key, value in after.items() if key[0] == name)
+    return total['sum'] / total['count'] if total['count'] else None
+
+
+# The widget state the browser would send after the action, as a
+# WidgetState proto
+def widget_state(widget, value, previous):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    kind, element = widget['kind'], widget['element']
+    state = WidgetState(id=element.id)
+    if kind == 'multiselect':
+        if previous is not None:
+            selected = list(previous.string_array_value.data)
+        else:
+            selected = [element.options[index] for index in element.default]
+        state.string_array_value.data.extend(selected[1:] if value == DROP_FIRST else value)
+    elif kind == 'slider':
+        state.double_array_value.data.extend(value if isinstance(value, (list, tuple)) else [value])
+    elif kind in ('selectbox', 'text_input'):
+        state.string_value = value
+    elif kind == 'checkbox':
+        state.bool_value = value
+    elif kind == 'button':
+        state.trigger_value = True
+    return state
+
+
+def new_session():
+    return {'socket': None, 'pages': {}, 'page': '', 'widgets': {}, 'states': {}}
+
+
+# Send one rerun request and read until the script (or fragment)
+# finishes; returns (seconds, bytes received, finish status)
+async def rerun(session, page=None, states=(), fragment=''):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    message = BackMsg()
+    message.rerun_script.page_script_hash = session['page'] if page is None else page
+    message.rerun_script.fragment_id = fragment
+    message.rerun_script.widget_states.widgets.extend(states)
+    started = time.perf_counter()
+    await session['socket'].write_message(message.SerializeToString(), binary=True)
+    if not fragment:
+        session['widgets'] = {}
+    received = 0
+    while True:
+        raw = await session['socket'].read_message()
+        if raw is None:
+            raise ConnectionError("server closed the connection")
+        received += len(raw)
+        forward = ForwardMsg()
+        forward.ParseFromString(raw)
+        kind = forward.WhichOneof('type')
+        if kind == 'navigation':
+            session['pages'] = {page.page_name: page.page_script_hash for page in forward.navigation.app_pages}
+        elif kind == 'new_session':
+            session['page'] = forward.new_session.page_script_hash
+        elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+            element_kind = forward.delta.new_element.WhichOneof('type')
+            if element_kind in WIDGET_KINDS:
+                element = getattr(forward.delta.new_element, element_kind)
+                session['widgets'][element.label] = {'kind': element_kind, 'element': element,
+                                                     'fragment': forward.delta.fragment_id}
+        elif kind == 'script_finished':
+            status = ForwardMsg.ScriptFinishedStatus.Name(forward.script_finished)
+            return time.perf_counter() - started, received, status
+
+
+async def step(session, kind, target, value):
+    if kind == 'page':
+        session['states'] = {}
+        return await rerun(session, page=session['pages'][target])
+    widget = session['widgets'].get(target)
+    if widget is None:
+        raise LookupError(f"no widget labelled {target!r} on this page")
+    state = widget_state(widget, value, session['states'].get(widget['element'].id))
+    session['states'][state.id] = state
+    states = list(session['states'].values())
+    if kind == 'button':
+        # Triggers are sent once
+        del session['states'][state.id]
+    return await rerun(session, states=states, fragment=widget['fragment'])
+
+
+async def simulate_user(url, user, paths, think, rng, steps):
+    from tornado.websocket import websocket_connect
+
+    session = new_session()
+    try:
+        session['socket'] = await websocket_connect(url, subprotocols=['streamlit'], max_message_size=1 << 30)
+        await asyncio.wait_for(rerun(session, page=''), STEP_TIMEOUT)
+    except Exception as error:
+        steps.append({'user': user, 'path': None, 'step': 'connect', 'error': f'{type(error).__name__}: {error}'})
+        if session['socket'] is not None:
+            session['socket'].close()
+        return
+    try:
+        for path in paths:
+            for kind, target, value in CLICK_PATHS[path]:
+                await asyncio.sleep(rng.uniform(0, 2 * think))
+                record = {'user': user, 'path': path, 'step': f'{kind}: {target}'}
+                try:
+                    seconds, received, status = await asyncio.wait_for(step(session, kind, target, value),
+                                                                       STEP_TIMEOUT)
+                    record.update(seconds=seconds, bytes=received, status=status)
+                except Exception as error:
+                    record.update(error=f'{type(error).__name__}: {error}')
+                steps.append(record)
+                if 'error' in record:
+                    return
+    finally:
+        session['socket'].close()
+
+
+async def sample_memory(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(rss_mb(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), MEMORY_SAMPLE_S)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(url, sessions, iterations, think, seed, pid=None):
+    steps, samples, stop = [], [], asyncio.Event()
+    sampler = asyncio.create_task(sample_memory(pid, samples, stop)) if pid else None
+    started = time.perf_counter()
+    users = []
+    for user in range(sessions):
+        rng = random.Random(seed * 1000 + user)
+        paths = [rng.choice(sorted(CLICK_PATHS)) for _ in range(iterations)]
+        users.append(simulate_user(url, user, paths, think, rng, steps))
+    await asyncio.gather(*users)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampler:
+        await sampler
+    return steps, elapsed, samples
+
+
+def summarize(sessions, steps, elapsed, idle_mb, samples, before, after):
+    ok = [record for record in steps if 'error' not in record]
+    latencies = np.array([record['seconds'] for record in ok]) if ok else np.array([np.nan])
+    peak_mb = max(samples) if samples else None
+    return {
+        'sessions': sessions,
+        'steps': len(ok),
+        'errors': len(steps) - len(ok),
+        'elapsed_s': elapsed,
+        'throughput_per_s': len(ok) / elapsed if elapsed else None,
+        'p50_s': float(np.percentile(latencies, 50)),
+        'p95_s': float(np.percentile(latencies, 95)),
+        'p99_s': float(np.percentile(latencies, 99)),
+        'max_s': float(latencies.max()),
+        'mean_kb': float(np.mean([record['bytes'] for record in ok]) / 1024) if ok else None,
+        'server_idle_mb': idle_mb,
+        'server_peak_mb': peak_mb,
+        'mb_per_session': (peak_mb - idle_mb) / sessions if peak_mb and idle_mb else None,
+        'server_rerun_mean_s': server_rerun_mean(before, after),
+        'cache': cache_rates(before, after),
+    }
+
+
+def run_load(levels=LOAD_SESSIONS, iterations=LOAD_ITERATIONS, think=LOAD_THINK_S, rows=None, url=None,
+             metrics_url=None, seed=0, out=None, log=print):
+    server = None
+    if url is None:
+        data_path = synthetic_dataset(rows, log=log) if rows else None
+        server = start_server(data_path=data_path)
+        url = f'ws://localhost:{LOAD_PORT}/_stcore/stream'
+        metrics_url = metrics_url or f'http://localhost:{LOAD_METRICS_PORT}/metrics'
+        log(f"Streamlit started (pid {server.pid})" + (f" on {rows:,} synthetic rows" if rows else ""))
+    pid = server.pid if server else None
+
+    document = {'meta': {**environment(), 'rows': rows, 'iterations': iterations, 'think_s': think,
+                         'click_paths': sorted(CLICK_PATHS)}, 'levels': []}
+    try:
+        # One untimed pass over every click path, so the first level
+        # measures sessions rather than imports and cold caches
+        warm_up = []
+        asyncio.run(simulate_user(url, 0, sorted(CLICK_PATHS), 0, random.Random(seed), warm_up))
+        failed = [record for record in warm_up if 'error' in record]
+        if failed:
+            raise RuntimeError(f"warm-up failed at {failed[0]['step']}: {failed[0]['error']}")
+        for sessions in levels:
+            before = scrape_metrics(metrics_url) if metrics_url else {}
+            idle_mb = rss_mb(pid) if pid else None
+            steps, elapsed, samples = asyncio.run(run_level(url, sessions, iterations, think, seed, pid))
+            after = scrape_metrics(metrics_url) if metrics_url else {}
+            level = summarize(sessions, steps, elapsed, idle_mb, samples, before, after)
+            level['step_records'] = steps
+            document['levels'].append(level)
+            log(f"{sessions:>4} sessions: {level['throughput_per_s']:.1f} steps/s, p50 {level['p50_s']:.2f}s, "
+                f"p95 {level['p95_s']:.2f}s, p99 {level['p99_s']:.2f}s, {level['errors']} errors"
+                + (f", {level['mb_per_session']:.1f} MB/session" if level['mb_per_session'] is not None else ""))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    out = out or os.path.join(BENCH_RESULTS_DIR, 'load-' + time.strftime('%Y%m%d-%H%M%S') + '.json')
+    write_results(document, out)
+    log(f"Results written to {out}")
+    log(levels_frame(document).to_string(index=False, float_format='{:.2f}'.format))
+    return document
+
+
+def levels_frame(document):
+    rows = []
+    for level in document['levels']:
+        hits = {function: rate['hit_rate'] for function, rate in level['cache'].items()}
+        rows.append({'Sessions': level['sessions'], 'Steps/s': level['throughput_per_s'], 'p50 s': level['p50_s'],
+                     'p95 s': level['p95_s'], 'p99 s': level['p99_s'], 'Server s': level['server_rerun_mean_s'],
+                     'Errors': level['errors'],
+                     'KB/step': level['mean_kb'], 'MB/session': level['mb_per_session'],
+                     **{f'{function} hits': rate for function, rate in sorted(hits.items())}})
+    return pd.DataFrame(rows)
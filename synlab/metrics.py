@@ -0,0 +1,196 @@
+import bisect
+import json
+import logging
+import os
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+# Process-wide counters, gauges and histograms for production monitoring,
+# served in Prometheus text format from a small HTTP endpoint that the
+# first rerun starts next to Streamlit:
+#
+#   curl -s localhost:9464/metrics
+#
+# Rerun latency is a histogram per page (p50/p95 with histogram_quantile
+# in Prometheus; in-process quantiles over the recent reruns are exposed
+# too), alongside cache calls and misses per cached function, dataset
+# load time and active sessions. SYNLAB_METRICS_PORT=0 turns the endpoint
+# off. Every rerun is also logged as one JSON line to a rotating file.
+METRICS_HOST = os.environ.get('SYNLAB_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.environ.get('SYNLAB_METRICS_PORT', '9464'))
+RERUN_LOG = os.environ.get('SYNLAB_METRICS_LOG') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'metrics.jsonl')
+RERUN_LOG_BYTES = 10 * 1024 * 1024
+RERUN_LOG_BACKUPS = 5
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95)
+QUANTILE_WINDOW = 1024
+
+METRICS = {
+    'synlab_rerun_duration_seconds': ('histogram', "Wall time of a full script rerun"),
+    'synlab_rerun_recent_seconds': ('summary', f"Rerun wall time over the last {QUANTILE_WINDOW} reruns of a page"),
+    'synlab_cache_calls_total': ('counter', "Calls to a cached function"),
+    'synlab_cache_misses_total': ('counter', "Calls to a cached function that ran its body"),
+    'synlab_dataset_loads_total': ('counter', "Survey dataset reads from disk"),
+    'synlab_dataset_load_seconds': ('gauge', "Duration of the most recent dataset read"),
+    'synlab_dataset_rows': ('gauge', "Rows in the most recently read dataset"),
+    'synlab_active_sessions': ('gauge', "Browser sessions connected to this server"),
+}
+
+logger = logging.getLogger(__name__)
+
+# {name: {labels: value}}; labels are tuples of (label, value) pairs.
+# Histograms hold {'buckets': [...], 'sum': s, 'count': n, 'recent': deque}
+_values = {name: {} for name in METRICS}
+_lock = threading.Lock()
+_server = None
+
+
+def increment(name, labels=(), amount=1):
+    with _lock:
+        _values[name][labels] = _values[name].get(labels, 0) + amount
+
+
+def set_gauge(name, value, labels=()):
+    with _lock:
+        _values[name][labels] = value
+
+
+def observe(name, seconds, labels=()):
+    with _lock:
+        histogram = _values[name].get(labels)
+        if histogram is None:
+            histogram = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0,
+                         'recent': deque(maxlen=QUANTILE_WINDOW)}
+            _values[name][labels] = histogram
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(LATENCY_BUCKETS):
+            histogram['buckets'][index] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+        histogram['recent'].append(seconds)
+
+
+def record_dataset_load(seconds, rows):
+    increment('synlab_dataset_loads_total')
+    set_gauge('synlab_dataset_load_seconds', seconds)
+    set_gauge('synlab_dataset_rows', rows)
+
+
+# Sessions the Streamlit runtime holds open; None outside a server
+def active_sessions():
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return None
+    session_manager = getattr(Runtime.instance(), '_session_mgr', None)
+    return None if session_manager is None else session_manager.num_active_sessions()
+
+
+def quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def label_text(labels, extra=()):
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + '}'
+
+
+# Prometheus text exposition format (version 0.0.4)
+def render_metrics():
+    sessions = active_sessions()
+    if sessions is not None:
+        set_gauge('synlab_active_sessions', sessions)
+    with _lock:
+        snapshot = {name: {labels: dict(value, recent=list(value['recent']), buckets=list(value['buckets']))
+                           if isinstance(value, dict) else value
+                           for labels, value in series.items()}
+                    for name, series in _values.items()}
+    snapshot['synlab_rerun_recent_seconds'] = snapshot['synlab_rerun_duration_seconds']
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in snapshot[name].items():
+            if kind == 'histogram':
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, value['buckets']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{label_text(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_bucket{label_text(labels, [("le", "+Inf")])} {value["count"]}')
+            elif kind == 'summary':
+                for q in QUANTILES:
+                    lines.append(f'{name}{label_text(labels, [("quantile", q)])} {quantile(value["recent"], q):.6f}')
+            else:
+                lines.append(f'{name}{label_text(labels)} {value}')
+                continue
+            lines.append(f'{name}_sum{label_text(labels)} {value["sum"]:.6f}')
+            lines.append(f'{name}_count{label_text(labels)} {value["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = render_metrics().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Start the endpoint once per process; a port already in use (another
+# Streamlit process on this host) is logged and not retried
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    global _server
+    if _server is not None or not port:
+        return _server
+    with _lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as error:
+            logger.warning("metrics endpoint not started on %s:%d: %s", host, port, error)
+            _server = False
+            return _server
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name='synlab-metrics', daemon=True).start()
+        logger.info("metrics endpoint on http://%s:%d/metrics", host, port)
+    return _server
+
+
+def rerun_log():
+    log = logging.getLogger('synlab.reruns')
+    if log.handlers:
+        return log
+    with _lock:
+        if not log.handlers:
+            os.makedirs(os.path.dirname(os.path.abspath(RERUN_LOG)), exist_ok=True)
+            handler = RotatingFileHandler(RERUN_LOG, maxBytes=RERUN_LOG_BYTES, backupCount=RERUN_LOG_BACKUPS,
+                                          encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            log.addHandler(handler)
+            log.setLevel(logging.INFO)
+            log.propagate = False
+    return log
+
+
+# One finished rerun: {time, page, session, total_ms, sections?}
+def record_rerun(record):
+    observe('synlab_rerun_duration_seconds', record['total_ms'] / 1000, (('page', record['page']),))
+    rerun_log().info(json.dumps(record, default=float))
@@ -0,0 +1,169 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from synlab.metrics import increment, record_rerun, start_metrics_server
+
+# Per-rerun timings of the expensive steps on each page: data load,
+# filtering, aggregates and chart builds. Every rerun's total time feeds
+# the metrics endpoint and the rerun log (synlab.metrics); the per-step
+# breakdown is recorded while the sidebar performance panel is toggled
+# on, or always when SYNLAB_METRICS_LOG names the rerun log file.
+PERF_PANEL_KEY = 'perf_panel'
+METRICS_LOG = os.environ.get('SYNLAB_METRICS_LOG')
+
+_local = threading.local()
+
+
+# Counts executions of a cached function's body, i.e. cache misses.
+# Goes under the st.cache_* decorator so hits never reach it; put
+# counts_calls above the decorator to get hit rates:
+#
+#   @counts_calls
+#   @st.cache_data
+#   @counts_misses
+#   def query(...):
+def counts_misses(function):
+    labels = (('function', function.__name__),)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        _local.misses = getattr(_local, 'misses', 0) + 1
+        increment('synlab_cache_misses_total', labels)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def counts_calls(function):
+    labels = (('function', function.__name__),)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        increment('synlab_cache_calls_total', labels)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+# The rerun whose steps are being recorded, if any
+def current_run():
+    if get_script_run_ctx() is None:
+        return None
+    run = st.session_state.get('_perf_run')
+    return run if run is not None and run['sections'] is not None else None
+
+
+def new_run(page):
+    recording = st.session_state.get(PERF_PANEL_KEY, False) or METRICS_LOG is not None
+    return {
+        'page': page,
+        'started': time.perf_counter(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sections': [] if recording else None,
+    }
+
+
+def start_rerun(script):
+    start_metrics_server()
+    page = os.path.splitext(os.path.basename(script))[0]
+    st.session_state['_perf_page'] = page
+    st.session_state['_perf_run'] = new_run(page)
+
+
+# Log a finished run to the metrics endpoint and the rerun log
+def finish_run(run):
+    ctx = get_script_run_ctx()
+    record = {'time': run['time'], 'page': run['page'], 'session': ctx.session_id if ctx else None,
+              'total_ms': (time.perf_counter() - run['started']) * 1000}
+    if run['sections'] is not None:
+        record['sections'] = run['sections']
+    record_rerun(record)
+    return record
+
+
+# Fragment reruns skip start_rerun and perf_panel, so a fragment records
+# its own runs, logged as page "<page>:<fragment>". Goes under the
+# fragment decorator:
+#
+#   @st.fragment
+#   @records_fragment
+#   def section(...):
+def records_fragment(function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        ctx = get_script_run_ctx()
+        if ctx is None or not ctx.fragment_ids_this_run:
+            # Part of a full rerun, timed by the page's own record
+            return function(*args, **kwargs)
+        run = new_run(f"{st.session_state.get('_perf_page', 'app')}:{function.__name__}")
+        st.session_state['_perf_run'] = run
+        try:
+            return function(*args, **kwargs)
+        finally:
+            st.session_state['_perf_run'] = None
+            st.session_state['_perf_fragment'] = finish_run(run)
+    return wrapper
+
+
+# Time a step of the current rerun:
+#
+#   with timed('load data') as section:
+#       data = load_data()
+#       section['rows'] = len(data)
+#
+# Callers may set 'rows' (rows scanned) and 'bytes' (payload sent to the
+# browser). Outside a recorded rerun this only yields a throwaway dict.
+@contextmanager
+def timed(name):
+    run = current_run()
+    section = {'section': name, 'ms': None, 'rows': None, 'cache_misses': None, 'bytes': None}
+    if run is None:
+        yield section
+        return
+    misses = getattr(_local, 'misses', 0)
+    started = time.perf_counter()
+    try:
+        yield section
+    finally:
+        section['ms'] = (time.perf_counter() - started) * 1000
+        section['cache_misses'] = getattr(_local, 'misses', 0) - misses
+        run['sections'].append(section)
+
+
+def sections_frame(sections):
+    frame = pd.DataFrame(sections, columns=['section', 'ms', 'rows', 'cache_misses', 'bytes'])
+    return frame.rename(columns={'section': 'Section', 'rows': 'Rows', 'cache_misses': 'Cache misses',
+                                 'bytes': 'Bytes'})
+
+
+def show_sections(record):
+    frame = sections_frame(record['sections'])
+    st.caption(f"{record['total_ms']:.0f} ms total, {frame['ms'].sum():.0f} ms in {len(frame)} timed sections")
+    st.dataframe(frame.style.format({'ms': '{:.1f}', 'Rows': '{:,.0f}', 'Bytes': '{:,.0f}'}, na_rep='–'),
+                 hide_index=True, use_container_width=True)
+
+
+# End of the script: log the rerun and draw the panel toggle (and the
+# breakdown when it is on, plus the last fragment rerun since then)
+def perf_panel():
+    run = st.session_state.get('_perf_run')
+    st.session_state['_perf_run'] = None
+    if run is not None:
+        record = finish_run(run)
+    fragment = st.session_state.pop('_perf_fragment', None)
+
+    if not st.sidebar.toggle("⏱️ Performance panel", key=PERF_PANEL_KEY):
+        return
+    if run is None or run['sections'] is None:
+        st.sidebar.caption("Timings appear from the next rerun.")
+        return
+    with st.sidebar.expander("⏱️ Last rerun", expanded=True):
+        show_sections(record)
+    if fragment is not None and 'sections' in fragment:
+        with st.sidebar.expander(f"⏱️ Last section rerun ({fragment['page'].split(':')[-1]})"):
+            show_sections(fragment)
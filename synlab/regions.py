@@ -0,0 +1,108 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import ROOT, filter_rows, load_dataset
+from synlab.geo import coordinates, grid_cells
+from synlab.kpis import grouped_sums, kpi_frame, kpi_inputs
+from synlab.perf import counts_calls, counts_misses
+from synlab.shrinkage import rate_estimates
+
+LGA_GEOJSON_PATH = os.path.join(ROOT, "data", "lagos_lgas.geojson")
+REGION_PROPERTY = 'LGA'
+
+# Distinct coordinates are tested once; ~0.1 m snapping only merges
+# exact duplicates
+COORDINATE_PRECISION = 1e-6
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def load_regions(path=LGA_GEOJSON_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+# Rings of every region as (n, 2) lon/lat arrays, with bounding boxes
+def region_rings(geojson):
+    regions = []
+    for feature in geojson['features']:
+        geometry = feature['geometry']
+        polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+        rings = [np.asarray(ring, dtype=np.float64) for polygon in polygons for ring in polygon]
+        stacked = np.vstack(rings)
+        regions.append({
+            'name': feature['properties'][REGION_PROPERTY],
+            'rings': rings,
+            'bbox': (*stacked.min(axis=0), *stacked.max(axis=0)),
+        })
+    return regions
+
+
+# Even-odd ray casting, vectorized over points and looping over edges.
+# Holes and multipolygons work because every ring toggles the parity.
+def points_in_rings(lon, lat, rings):
+    inside = np.zeros(len(lon), dtype=bool)
+    for ring in rings:
+        x1, y1 = ring[:-1, 0], ring[:-1, 1]
+        x2, y2 = ring[1:, 0], ring[1:, 1]
+        for ax, ay, bx, by in zip(x1, y1, x2, y2):
+            crosses = (ay > lat) != (by > lat)
+            if not crosses.any():
+                continue
+            x_cross = ax + (lat[crosses] - ay) * (bx - ax) / (by - ay)
+            toggle = np.zeros(len(lon), dtype=bool)
+            toggle[crosses] = lon[crosses] < x_cross
+            inside ^= toggle
+    return inside
+
+
+# Region index for every point (-1 outside all regions). Each polygon
+# only tests the unassigned points inside its bounding box.
+def assign_regions(lon, lat, regions):
+    assigned = np.full(len(lon), -1, dtype=np.int32)
+    for i, region in enumerate(regions):
+        min_lon, min_lat, max_lon, max_lat = region['bbox']
+        candidates = np.flatnonzero((assigned < 0) & (lon >= min_lon) & (lon <= max_lon)
+                                    & (lat >= min_lat) & (lat <= max_lat))
+        if len(candidates):
+            hits = points_in_rings(lon[candidates], lat[candidates], region['rings'])
+            assigned[candidates[hits]] = i
+    return assigned
+
+
+# Region of every respondent, computed once per dataset version over
+# distinct coordinates only
+@counts_calls
+@st.cache_resource(show_spinner="Assigning respondents to areas...", max_entries=2)
+@counts_misses
+def region_assignment(version, path=LGA_GEOJSON_PATH):
+    regions = region_rings(load_regions(path))
+    lat, lon = coordinates(load_dataset(version))
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    inverse, cells = grid_cells(np.round(lat[valid] / COORDINATE_PRECISION),
+                                np.round(lon[valid] / COORDINATE_PRECISION))
+    cell_regions = assign_regions(cells[:, 1] * COORDINATE_PRECISION, cells[:, 0] * COORDINATE_PRECISION, regions)
+    assigned = np.full(len(lat), -1, dtype=np.int32)
+    assigned[valid] = cell_regions[inverse]
+    return assigned, [region['name'] for region in regions]
+
+
+# Per-region KPIs for the filtered respondents, with shrunk rate
+# estimates; only these aggregates (and the static polygons) are sent
+# to the browser
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def region_kpis(version, filters, path=LGA_GEOJSON_PATH):
+    assigned, names = region_assignment(version, path)
+    rows = filter_rows(version, filters)
+    regions = assigned[rows]
+    inside = regions >= 0
+    sums = grouped_sums(kpi_inputs(load_dataset(version), 'SYNLAB', rows[inside]), regions[inside], len(names))
+    index = pd.Index(names, name=REGION_PROPERTY)
+    return kpi_frame(sums, index=index).join(rate_estimates(sums, index=index))
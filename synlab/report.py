@@ -0,0 +1,267 @@
+import html
+import importlib.util
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from synlab.charts import lab_rates, segment_shares
+from synlab.churn import churn_feature_importance, churn_risk, train_churn_model
+from synlab.clv import clv_scores
+from synlab.data import GLOBAL_FILTERS, data_version, default_filter_state, filter_rows, load_dataset
+from synlab.figures import CHARTS, figure, figure_json
+from synlab.kpis import kpi_frame, kpi_inputs
+from synlab.regions import region_assignment
+from synlab.segments import segment_codes
+from synlab.sentiment import SENTIMENT_LABELS, sentiment_scores
+from synlab.shrinkage import SHRINKAGE_RATES
+from synlab.snapshot import figure_key, write_snapshot
+from synlab.text import text_index
+
+REPORT_RADIUS_KM = 3.0
+
+
+def brand_summary(version, filters):
+    rows = filter_rows(version, filters)
+    sums = {name: values.sum(keepdims=True) for name, values in kpi_inputs(load_dataset(version), 'SYNLAB', rows).items()}
+    return kpi_frame(sums, index=['SYNLAB']).round(1)
+
+
+def segment_summary(version, filters):
+    return segment_shares(version, filters).rename('Share (%)').to_frame()
+
+
+def competitor_summary(version, filters):
+    return lab_rates(version, filters).round(1).set_index('Lab')
+
+
+def model_summary(version, filters):
+    model = train_churn_model(version)
+    return pd.DataFrame({'Churn model accuracy': [f"{model['accuracy']:.0%}"]})
+
+
+# Page -> KPI table and charts (name, query args, builder spec)
+REPORT_PAGES = {
+    'Executive Overview': (brand_summary, [
+        ('lab_awareness', (tuple(sorted(SENTIMENT_LABELS)),), {}),
+        ('rating_distribution', (tuple(sorted(SENTIMENT_LABELS)),), {}),
+        ('recommendation_likelihood', (tuple(sorted(SENTIMENT_LABELS)),), {}),
+        ('sentiment_by_age', (tuple(sorted(SENTIMENT_LABELS)),), {}),
+    ]),
+    'Customer Insights': (segment_summary, [
+        ('segment_distribution', (), {}),
+        ('age_distribution', (), {}),
+        ('gender_distribution', (), {}),
+        ('occupation_distribution', (), {}),
+    ]),
+    'Competitive Intelligence': (competitor_summary, [
+        ('awareness_share', (), {}),
+        ('usage_rates', (), {}),
+        ('positioning', (), {}),
+        ('named_competitors', (), {}),
+        ('catchments', (REPORT_RADIUS_KM,), {'radius_km': REPORT_RADIUS_KM}),
+        ('distance_usage', (), {}),
+    ]),
+    'Strategic Analytics': (None, [
+        ('beliefs', (), {}),
+        ('improvements', (), {}),
+    ]),
+    'Advanced Models': (model_summary, [
+        ('churn_risk', (), {}),
+        ('churn_importance', (), {}),
+        ('clv_segments', (), {}),
+        ('clv_by_age', (), {}),
+        ('top_words', (), {}),
+        ('topics', (), {}),
+        ('area_opportunity', (), {'metric': 'Penetration'}),
+    ]),
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="plotly.min.js"></script>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #0A2647; }}
+h1 {{ background: #0A2647; color: white; padding: 1rem; border-radius: 10px; }}
+h2 {{ border-bottom: 3px solid #0A2647; padding-bottom: .3rem; margin-top: 2.5rem; }}
+.charts {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(560px, 1fr)); gap: 1rem; }}
+table {{ border-collapse: collapse; }} td, th {{ padding: .3rem .6rem; border: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+# One preset per value of each global filter, plus everyone
+def default_presets(version):
+    data = load_dataset(version)
+    presets = [{'name': 'All respondents', 'filters': {}}]
+    for column in GLOBAL_FILTERS.values():
+        for value in sorted(data[column].dropna().astype(str).unique()):
+            presets.append({'name': f"{column.replace('_', ' ')}: {value}", 'filters': {column: [value]}})
+    return presets
+
+
+# Presets file: [{"name": ..., "filters": {column: [values, ...]}}, ...]
+def load_presets(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# Same filter state the dashboard sidebar produces for the preset, so
+# report renders and snapshot entries share cache keys with live sessions
+def preset_filters(preset, version=None):
+    return default_filter_state(version or data_version(), preset['filters'])
+
+
+def slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'preset'
+
+
+# Build the models and indexes every preset shares. With fork-based
+# workers they are inherited instead of rebuilt per preset.
+def warm_caches(version):
+    load_dataset(version)
+    segment_codes(version)
+    sentiment_scores(version)
+    clv_scores(version)
+    text_index(version)
+    region_assignment(version)
+    model = train_churn_model(version)
+    churn_feature_importance(model['version'], version)
+    churn_risk(version)
+    for _, charts in REPORT_PAGES.values():
+        for name, args, spec in charts:
+            figure(name, version, (), *args, **spec)
+
+
+def images_available():
+    return importlib.util.find_spec('kaleido') is not None
+
+
+def render_preset(version, preset, out_dir, images=False):
+    started = time.perf_counter()
+    filters = preset_filters(preset, version)
+    name = slug(preset['name'])
+    sections = [f"<h1>SYNLAB Report: {html.escape(preset['name'])}</h1>",
+                f"<p>{len(filter_rows(version, filters)):,} respondents &middot; dataset {html.escape(version)}</p>"]
+    image_errors = []
+    for page, (summary, charts) in REPORT_PAGES.items():
+        sections.append(f"<h2>{html.escape(page)}</h2>")
+        if summary is not None:
+            sections.append(summary(version, filters).to_html(border=0))
+        sections.append('<div class="charts">')
+        for chart, args, spec in charts:
+            fig = figure(chart, version, filters, *args, **spec)
+            if fig is None:
+                sections.append(f"<p>{html.escape(chart.replace('_', ' ').title())}: no data for this preset.</p>")
+                continue
+            sections.append(fig.to_html(full_html=False, include_plotlyjs=False))
+            if images:
+                try:
+                    fig.write_image(os.path.join(out_dir, 'images', f"{name}_{chart}.png"))
+                except Exception as e:
+                    image_errors.append(f"{chart}: {e}")
+        sections.append('</div>')
+    path = os.path.join(out_dir, f"{name}.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(PAGE_TEMPLATE.format(title=html.escape(preset['name']), body='\n'.join(sections)))
+    return path, time.perf_counter() - started, image_errors
+
+
+def write_index(out_dir, presets, version):
+    links = '\n'.join(f'<li><a href="{slug(p["name"])}.html">{html.escape(p["name"])}</a></li>' for p in presets)
+    body = f"<h1>SYNLAB Report Pack</h1><p>Dataset {html.escape(version)}</p><ul>{links}</ul>"
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(PAGE_TEMPLATE.format(title='SYNLAB Report Pack', body=body))
+
+
+# Render every preset to static HTML (plus PNGs when kaleido is
+# installed) using worker processes that share the warmed caches
+def render_report(out_dir, presets=None, workers=None, images=False, log=print):
+    version = data_version()
+    os.makedirs(out_dir, exist_ok=True)
+    if images:
+        os.makedirs(os.path.join(out_dir, 'images'), exist_ok=True)
+
+    started = time.perf_counter()
+    warm_caches(version)
+    log(f"Shared data, indexes and models ready in {time.perf_counter() - started:.1f}s")
+    presets = presets if presets is not None else default_presets(version)
+
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    write_index(out_dir, presets, version)
+
+    # fork keeps the warmed caches; other start methods rebuild them per worker
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(presets)), mp_context=context) as pool:
+        jobs = [pool.submit(render_preset, version, preset, out_dir, images) for preset in presets]
+        for preset, job in zip(presets, jobs):
+            path, seconds, image_errors = job.result()
+            log(f"{preset['name']}: {path} ({seconds:.1f}s)")
+            for error in image_errors[:1]:
+                log(f"  image export failed ({error})")
+    log(f"{len(presets)} presets rendered in {time.perf_counter() - started:.1f}s")
+    return os.path.join(out_dir, 'index.html')
+
+
+# Filter states a fresh session asks for: the landscape view, the
+# default sidebar, page 1's own default filters and every preset
+def snapshot_states(version, presets):
+    data = load_dataset(version)
+    page_defaults = tuple((column, tuple(sorted(map(str, data[column].unique()))))
+                          for column in ['Age_Group', 'Occupation'])
+    states = [(), default_filter_state(version), page_defaults]
+    states += [preset_filters(preset, version) for preset in presets]
+    return list(dict.fromkeys(states))
+
+
+def snapshot_charts():
+    charts = [chart for _, page_charts in REPORT_PAGES.values() for chart in page_charts
+              if chart[0] != 'area_opportunity']
+    return charts + [('area_opportunity', (), {'metric': metric}) for metric in SHRINKAGE_RATES]
+
+
+# Precompute figures and model outputs for the common filter states so
+# a fresh server renders them without touching the models
+def build_snapshot(presets=None, log=print):
+    version = data_version()
+    started = time.perf_counter()
+    warm_caches(version)
+    log(f"Shared data, indexes and models ready in {time.perf_counter() - started:.1f}s")
+
+    states = snapshot_states(version, presets if presets is not None else default_presets(version))
+    figures = {}
+    for filters in states:
+        for name, args, spec in snapshot_charts():
+            code = CHARTS[name]['code']
+            spec = tuple(sorted(spec.items()))
+            serialized = figure_json(name, code, version, filters, args, spec)
+            figures[figure_key(name, code, filters, args, spec)] = serialized or ''
+
+    model = train_churn_model(version)
+    resources = {
+        'churn_model': model,
+        'churn_importance': {'model_key': model['version'],
+                             'importance': churn_feature_importance(model['version'], version)},
+        'text_index': text_index(version),
+    }
+    path = write_snapshot(version, {'filter_states': len(states), 'figures': len(figures),
+                                    'built': time.strftime('%Y-%m-%dT%H:%M:%S')}, figures, resources)
+    log(f"{len(figures)} figures for {len(states)} filter states written to {path} "
+        f"in {time.perf_counter() - started:.1f}s")
+    return path
@@ -0,0 +1,126 @@
+import html
+import re
+
+import numpy as np
+import streamlit as st
+
+from synlab.data import filter_rows
+from synlab.perf import counts_calls, counts_misses
+from synlab.text import TOKEN_PATTERN, text_index
+
+SEARCH_COLUMNS = ['Additional_Suggestions', 'Preferred_Lab_Reason']
+PAGE_SIZE = 20
+
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+# Inverted index (token -> sorted row ids) built once per dataset version.
+# The CSC layout of the token matrix already stores one posting list per token.
+@counts_calls
+@st.cache_resource(show_spinner="Building search index...", max_entries=2)
+@counts_misses
+def search_index(version):
+    index = text_index(version)
+    postings = sum(index['counts'][column] for column in SEARCH_COLUMNS).tocsc()
+    postings.sort_indices()
+    return {
+        'postings': postings,
+        'token_ids': {token: i for i, token in enumerate(index['vocabulary'])},
+        'columns': {column: index['columns'][column] for column in SEARCH_COLUMNS},
+    }
+
+
+def tokenize(text):
+    return [token.lower() for token in re.findall(TOKEN_PATTERN, text)]
+
+
+# Split a query into OR-clauses of AND-ed terms; quoted text is a phrase.
+# e.g. 'results HMO OR "close to home"' -> [[results, hmo], ["close to home"]]
+def parse_query(query):
+    clauses = [[]]
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if word == 'OR':
+            clauses.append([])
+        elif phrase:
+            clauses[-1].append(phrase.strip())
+        elif word != 'AND':
+            clauses[-1].append(word)
+    return [clause for clause in clauses if clause]
+
+
+def posting_list(index, token):
+    token_id = index['token_ids'].get(token)
+    if token_id is None:
+        return np.empty(0, dtype=np.int32)
+    postings = index['postings']
+    return postings.indices[postings.indptr[token_id]:postings.indptr[token_id + 1]]
+
+
+# Rows whose text contains the phrase. Candidates come from the posting
+# lists; the exact phrase is checked once per distinct answer, not per row.
+def phrase_rows(index, phrase):
+    tokens = tokenize(phrase)
+    if not tokens:
+        return np.empty(0, dtype=np.int32)
+    rows = posting_list(index, tokens[0])
+    for token in tokens[1:]:
+        rows = np.intersect1d(rows, posting_list(index, token), assume_unique=True)
+    if len(tokens) == 1 or len(rows) == 0:
+        return rows
+    pattern = re.compile(r'\b' + r'\W+'.join(map(re.escape, tokens)) + r'\b', re.IGNORECASE)
+    keep = np.zeros(len(rows), dtype=bool)
+    for codes, uniques in index['columns'].values():
+        matches = np.array([bool(pattern.search(text)) for text in uniques], dtype=bool)
+        row_codes = codes[rows]
+        keep |= (row_codes >= 0) & matches[np.maximum(row_codes, 0)]
+    return rows[keep]
+
+
+# Row ids matching the query within the active filter state
+@counts_calls
+@st.cache_data(show_spinner=False, max_entries=64)
+@counts_misses
+def search_rows(version, filters, query):
+    index = search_index(version)
+    matches = np.empty(0, dtype=np.int32)
+    for clause in parse_query(query):
+        rows = None
+        for term in clause:
+            term_rows = phrase_rows(index, term)
+            rows = term_rows if rows is None else np.intersect1d(rows, term_rows, assume_unique=True)
+        matches = np.union1d(matches, rows)
+    if filters:
+        matches = np.intersect1d(matches, filter_rows(version, filters), assume_unique=True)
+    return matches
+
+
+# Matches are found in the raw text and only the output is escaped, so
+# terms never match inside HTML entities
+def highlight(text, query):
+    terms = [term for clause in parse_query(query) for term in clause]
+    patterns = [p for p in (r'\W+'.join(map(re.escape, tokenize(term))) for term in terms) if p]
+    if not patterns:
+        return html.escape(text)
+    pattern = re.compile(r'\b(' + '|'.join(patterns) + r')\b', re.IGNORECASE)
+    parts = []
+    end = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[end:match.start()]))
+        parts.append(f'<mark>{html.escape(match.group())}</mark>')
+        end = match.end()
+    parts.append(html.escape(text[end:]))
+    return ''.join(parts)
+
+
+# One page of matching comments, one entry per row
+def result_page(version, rows, page, page_size=PAGE_SIZE):
+    index = search_index(version)
+    page_rows = rows[page * page_size:(page + 1) * page_size]
+    results = []
+    for row in page_rows:
+        texts = {}
+        for column, (codes, uniques) in index['columns'].items():
+            if codes[row] >= 0 and uniques[codes[row]]:
+                texts[column] = uniques[codes[row]]
+        results.append((int(row), texts))
+    return results
@@ -0,0 +1,29 @@
+import numpy as np
+import streamlit as st
+
+from synlab.data import load_dataset
+from synlab.perf import counts_calls, counts_misses
+
+SEGMENTS = ['Champions', 'At Risk', 'New Users', 'Prospects', 'Others']
+
+
+# Create customer segments
+def create_segments(data):
+    conditions = [
+        (data['Familiarity_Score'] >= 2.5) & (data['SYNLAB_Rating_1_5'] >= 4) & (data['Used_SYNLAB'] == True),
+        (data['Familiarity_Score'] >= 2.5) & (data['SYNLAB_Rating_1_5'] < 4) & (data['Used_SYNLAB'] == True),
+        (data['Familiarity_Score'] < 2.5) & (data['Used_SYNLAB'] == True),
+        (data['Familiarity_Score'] < 2.5) & (data['Used_SYNLAB'] == False) & (data['Heard_SYNLAB'] == True)
+    ]
+    choices = SEGMENTS[:-1]
+    return np.select(conditions, choices, default='Others')
+
+
+# Segment index (into SEGMENTS) for every respondent
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def segment_codes(version):
+    segments = create_segments(load_dataset(version))
+    order = np.argsort(SEGMENTS)
+    return order[np.searchsorted(np.array(SEGMENTS), segments, sorter=order)].astype(np.int8)
@@ -0,0 +1,120 @@
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import filter_rows, load_dataset
+from synlab.perf import counts_calls, counts_misses
+from synlab.text import text_index
+
+SENTIMENT_COLUMNS = ['Additional_Suggestions', 'Preferred_Lab_Reason']
+SENTIMENT_LABELS = ['Negative', 'Neutral', 'Positive', 'No Comment']
+
+# Local word-level lexicon; scores range from -2 (very negative) to +2
+LEXICON = {
+    'wonderful': 2, 'excellent': 2, 'best': 2, 'amazing': 2, 'outstanding': 2,
+    'good': 1, 'great': 1, 'nice': 1, 'reliable': 1, 'accurate': 1, 'quality': 1,
+    'fast': 1, 'quick': 1, 'quickly': 1, 'prompt': 1, 'efficient': 1, 'convenient': 1,
+    'proximity': 1, 'nearby': 1, 'accessible': 1, 'affordable': 1, 'cheap': 1,
+    'trust': 1, 'trusted': 1, 'professional': 1, 'professionalism': 1, 'friendly': 1,
+    'clean': 1, 'improving': 1, 'recommend': 1, 'satisfied': 1,
+    'love': 2, 'thanks': 1, 'thank': 1,
+    'slow': -1, 'slower': -1, 'delay': -1, 'delayed': -1, 'delays': -1, 'late': -1,
+    'expensive': -1, 'costly': -1, 'pricey': -1, 'far': -1, 'difficult': -1,
+    'poor': -2, 'bad': -2, 'worst': -2, 'terrible': -2, 'rude': -2, 'dirty': -1,
+    'wrong': -2, 'complaint': -1, 'complain': -1, 'unreliable': -2,
+    'inaccurate': -2, 'disappointed': -2, 'problem': -1, 'issues': -1,
+}
+
+# A negation marks the following NEGATION_WINDOW words of its clause as
+# negated ("never late" -> "never not_late"); negated lexicon words are
+# vocabulary features of their own with the opposite weight
+NEGATION_WINDOW = 3
+NEGATION_PATTERN = re.compile(
+    r"((?:\b(?:not|no|never|nor|without|hardly|cannot|dont|didnt|isnt|wasnt|arent|wont)|n't)\b)"
+    r"((?:[^\w.,!?;:]+\w+){1,%d})" % NEGATION_WINDOW)
+WORD_PATTERN = re.compile(r"\w+")
+SENTIMENT_VOCABULARY = list(LEXICON) + [f"not_{word}" for word in LEXICON]
+SENTIMENT_WEIGHTS = np.array(list(LEXICON.values()) + [-weight for weight in LEXICON.values()], dtype=np.float32)
+
+# Score saturation constant: a single +1 word scores ~0.58, +2 ~0.82
+SATURATION = 2.0
+NEUTRAL_BAND = 0.05
+
+
+def negate_words(match):
+    return match.group(1) + WORD_PATTERN.sub(r'not_\g<0>', match.group(2))
+
+
+def mark_negations(text):
+    return NEGATION_PATTERN.sub(negate_words, text.lower())
+
+
+def sentiment_vectorizer():
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    return CountVectorizer(vocabulary=SENTIMENT_VOCABULARY, preprocessor=mark_negations,
+                           token_pattern=r"(?u)\b\w\w+\b", dtype=np.float32)
+
+
+# Score every response with one sparse matrix-vector product of the
+# lexicon feature counts against the weight vector. Distinct answers are
+# vectorized once and expanded to rows by code, as in the text index.
+# Rows without any lexicon word are NaN (no opinion expressed).
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def sentiment_scores(version):
+    index = text_index(version)
+    vectorizer = sentiment_vectorizer()
+    counts = sum(vectorizer.transform(uniques)[codes]
+                 for codes, uniques in (index['columns'][column] for column in SENTIMENT_COLUMNS)).tocsr()
+    raw = counts @ SENTIMENT_WEIGHTS
+    hits = counts.getnnz(axis=1) > 0
+    scores = np.full(counts.shape[0], np.nan, dtype=np.float32)
+    scores[hits] = raw[hits] / np.sqrt(raw[hits] ** 2 + SATURATION)
+    return scores
+
+
+# Sentiment_Score derived column: label codes aligned with dataset rows
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=2)
+@counts_misses
+def sentiment_codes(version):
+    scores = sentiment_scores(version)
+    codes = np.full(len(scores), SENTIMENT_LABELS.index('No Comment'), dtype=np.int8)
+    scored = ~np.isnan(scores)
+    codes[scored] = np.searchsorted([-NEUTRAL_BAND, NEUTRAL_BAND], scores[scored], side='right')
+    return codes
+
+
+def sentiment_mask(version, labels):
+    return np.isin(sentiment_codes(version), [SENTIMENT_LABELS.index(label) for label in labels])
+
+
+# Share of commenting respondents with positive feedback
+def positive_share(version, rows):
+    codes = sentiment_codes(version)[rows]
+    commented = codes != SENTIMENT_LABELS.index('No Comment')
+    if not commented.any():
+        return 0.0
+    return (codes[commented] == SENTIMENT_LABELS.index('Positive')).mean() * 100
+
+
+# Row positions matching a filter state and, when given, sentiment labels
+def sentiment_rows(version, filters, labels=None):
+    rows = filter_rows(version, filters)
+    if labels is not None:
+        rows = rows[sentiment_mask(version, labels)[rows]]
+    return rows
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def sentiment_by_segment(version, filters, column, labels=None):
+    rows = sentiment_rows(version, filters, labels)
+    scores = sentiment_scores(version)[rows]
+    groups = load_dataset(version)[column].to_numpy()[rows]
+    return pd.Series(scores).groupby(groups).agg(['mean', 'count']).dropna()
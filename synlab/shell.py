@@ -0,0 +1,74 @@
+import io
+import os
+import re
+
+import streamlit as st
+
+from synlab.data import ROOT
+
+LOGO_PATH = os.path.join(ROOT, 'assets', 'synlab_logo.jpg')
+FAVICON_PATH = os.path.join(ROOT, 'assets', 'synlab_favicon.png')
+THEME_CSS_PATH = os.path.join(ROOT, 'pages', 'app.css')
+LOGO_WIDTH = 200
+
+
+@st.cache_resource(show_spinner=False)
+def favicon(path=FAVICON_PATH):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# Logo resized to twice its display width (sharp on high-DPI screens)
+# and re-encoded once per process
+@st.cache_resource(show_spinner=False)
+def logo_bytes(path=LOGO_PATH, width=LOGO_WIDTH):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        scale = min(1.0, 2 * width / image.width)
+        size = (round(image.width * scale), round(image.height * scale))
+        buffer = io.BytesIO()
+        image.convert('RGB').resize(size, Image.LANCZOS).save(buffer, format='JPEG', quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+# st.image serves the bytes from a content-hashed media URL, so the
+# browser downloads the logo once and reruns only resend the URL
+def display_logo(width=LOGO_WIDTH):
+    try:
+        logo = logo_bytes(LOGO_PATH, width)
+    except FileNotFoundError:
+        st.error(f"Image file not found: {LOGO_PATH}")
+        return
+    except OSError as e:
+        st.warning(f"Could not load logo: {e}")
+        return
+    with st.container(horizontal_alignment='center'):
+        st.image(logo, width=width, output_format='JPEG')
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+# Shared theme plus the page's own rules, read and minified once per
+# process (and again only if app.css changes)
+@st.cache_resource(show_spinner=False)
+def theme_css(page_css, mtime, path=THEME_CSS_PATH):
+    with open(path, encoding='utf-8') as f:
+        css = f.read()
+    return f"<style>{minify_css(css + page_css)}</style>"
+
+
+# Theme and logo common to every page. Style-only HTML goes to the event
+# container, so the stylesheet takes no space in the layout. Streamlit
+# drops elements a rerun does not emit, so the style element is emitted
+# every rerun; it is byte-identical and above global.minCachedMessageSize
+# (.streamlit/config.toml), so after the first run of each page the
+# browser gets a hash reference instead of the stylesheet.
+def page_shell(page_css=''):
+    st.html(theme_css(page_css, os.path.getmtime(THEME_CSS_PATH)))
+    display_logo()
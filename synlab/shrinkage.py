@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# KPI rates that are binomial proportions: name -> (successes, trials)
+SHRINKAGE_RATES = {
+    'Usage': ('Users', 'Respondents'),
+    'Awareness': ('Aware', 'Respondents'),
+    'Penetration': ('Aware_Users', 'Aware'),
+}
+INTERVAL_LEVEL = 0.9
+# Upper bound on the prior's pseudo-count when areas look homogeneous
+MAX_PRIOR_STRENGTH = 1e4
+
+
+# Beta prior fitted across all areas by the method of moments: the
+# spread of the observed rates minus the binomial noise expected from
+# each area's sample size is the between-area variance.
+def beta_prior(successes, trials):
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    observed = trials > 0
+    total = trials[observed].sum()
+    if total == 0:
+        return 1.0, 1.0
+    mean = successes[observed].sum() / total
+    if mean <= 0 or mean >= 1:
+        strength = MAX_PRIOR_STRENGTH
+    else:
+        weights = trials[observed] / total
+        rates = successes[observed] / trials[observed]
+        spread = np.sum(weights * (rates - mean) ** 2)
+        noise = mean * (1 - mean) * observed.sum() / total
+        between = spread - noise
+        strength = MAX_PRIOR_STRENGTH if between <= 0 else min(mean * (1 - mean) / between - 1, MAX_PRIOR_STRENGTH)
+        strength = max(strength, 1e-3)
+    mean = min(max(mean, 1e-6), 1 - 1e-6)
+    return mean * strength, (1 - mean) * strength
+
+
+# Posterior mean and equal-tailed interval (in %) for every area at once
+def shrunk_rates(successes, trials, level=INTERVAL_LEVEL):
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    successes = np.minimum(successes, trials)
+    alpha, beta = beta_prior(successes, trials)
+    post_alpha = alpha + successes
+    post_beta = beta + trials - successes
+    tail = (1 - level) / 2
+    # Beta quantiles straight from the special function; scipy.stats
+    # costs about a second to import
+    from scipy.special import betaincinv
+    return (post_alpha / (post_alpha + post_beta) * 100,
+            betaincinv(post_alpha, post_beta, tail) * 100,
+            betaincinv(post_alpha, post_beta, 1 - tail) * 100)
+
+
+# Shrunk estimate, interval bounds and sample size for each binomial
+# KPI, from the same grouped sums that feed kpi_frame
+def rate_estimates(sums, index=None, level=INTERVAL_LEVEL):
+    columns = {}
+    for name, (numerator, denominator) in SHRINKAGE_RATES.items():
+        estimate, low, high = shrunk_rates(sums[numerator], sums[denominator], level)
+        columns[f'{name}_Est'] = estimate
+        columns[f'{name}_Low'] = low
+        columns[f'{name}_High'] = high
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,95 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import re
+
+import streamlit as st
+
+from synlab.data import ROOT
+
+# Prebuilt bundles of figures and model outputs, one directory per
+# dataset version, written by `python -m synlab build-snapshot`
+SNAPSHOT_DIR = os.environ.get('SYNLAB_SNAPSHOT_DIR', os.path.join(ROOT, 'snapshots'))
+SNAPSHOT_FORMAT = 2
+
+
+# Fingerprint of the analytics code; a bundle built by different code
+# is ignored rather than served stale
+def code_version():
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def bundle_path(version):
+    return os.path.join(SNAPSHOT_DIR, re.sub(r'[^A-Za-z0-9_.-]', '_', version))
+
+
+def figure_key(name, code, filters, args, spec):
+    return hashlib.sha1(repr((name, code, filters, args, spec)).encode()).hexdigest()
+
+
+# The bundle for a dataset version, or None when there is no usable one
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_snapshot(version):
+    path = bundle_path(version)
+    try:
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if (manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('data_version') != version
+            or manifest.get('code_version') != code_version()):
+        return None
+    with open(os.path.join(path, 'figures.json')) as f:
+        figures = json.load(f)
+    return {'manifest': manifest, 'figures': figures}
+
+
+def snapshot_figure(version, key):
+    snapshot = load_snapshot(version)
+    return None if snapshot is None else snapshot['figures'].get(key)
+
+
+# Model outputs are pickled one per file and loaded on first use, so a
+# page that only shows figures never unpickles (and imports) sklearn
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_resource(version, name):
+    with open(os.path.join(bundle_path(version), f'{name}.pkl'), 'rb') as f:
+        return pickle.load(f)
+
+
+def snapshot_resource(version, name):
+    snapshot = load_snapshot(version)
+    if snapshot is None or name not in snapshot['manifest']['resources']:
+        return None
+    return load_resource(version, name)
+
+
+# Write a bundle atomically: build in a temporary directory, then swap
+def write_snapshot(version, manifest, figures, resources):
+    path = bundle_path(version)
+    staging = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    with open(os.path.join(staging, 'figures.json'), 'w') as f:
+        json.dump(figures, f)
+    for name, resource in resources.items():
+        with open(os.path.join(staging, f'{name}.pkl'), 'wb') as f:
+            pickle.dump(resource, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+        json.dump(dict(manifest, format=SNAPSHOT_FORMAT, data_version=version, code_version=code_version(),
+                       resources=sorted(resources)), f, indent=1)
+    if os.path.isdir(path):
+        retired = f"{path}.old-{os.getpid()}"
+        os.replace(path, retired)
+        os.replace(staging, path)
+        for name in os.listdir(retired):
+            os.remove(os.path.join(retired, name))
+        os.rmdir(retired)
+    else:
+        os.replace(staging, path)
+    return path
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import load_dataset
+from synlab.perf import counts_calls, counts_misses
+
+TABLE_PAGE_SIZE = 50
+DEFAULT_TABLE_COLUMNS = ['Age_Group', 'Gender', 'Occupation', 'Area', 'Familiarity_with_SYNLAB',
+                         'SYNLAB_Rating_1_5', 'Likelihood_to_Recommend', 'Used_SYNLAB']
+# Columns with at most this many distinct values can be used as filters
+MAX_FILTER_VALUES = 25
+
+
+# Low-cardinality columns offered as table filters, with their values
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def filter_options(version):
+    options = {}
+    for column, values in load_dataset(version).items():
+        distinct = values.dropna().astype(str).unique()
+        if 1 < len(distinct) <= MAX_FILTER_VALUES:
+            options[column] = sorted(distinct)
+    return options
+
+
+# Stable sort order of the whole dataset by one column (missing values
+# last), computed once per dataset version and column
+@counts_calls
+@st.cache_resource(show_spinner=False, max_entries=16)
+@counts_misses
+def column_order(version, column):
+    values = load_dataset(version)[column]
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_numeric_dtype(values):
+        keys = values.to_numpy(dtype=np.float64, na_value=np.inf)
+    else:
+        keys, _ = pd.factorize(values, sort=True)
+        keys = np.where(keys < 0, np.iinfo(keys.dtype).max, keys)
+    order = np.argsort(keys, kind='stable')
+    return order, missing[order]
+
+
+# Filtered rows in sort order: one pass over the precomputed order
+# instead of re-sorting each filter state
+def sorted_rows(version, rows, column=None, ascending=True):
+    if column is None:
+        return rows
+    order, missing = column_order(version, column)
+    keep = np.zeros(len(order), dtype=bool)
+    keep[rows] = True
+    selected = keep[order]
+    ordered, ordered_missing = order[selected], missing[selected]
+    if not ascending:
+        present = ordered[~ordered_missing]
+        ordered = np.concatenate([present[::-1], ordered[ordered_missing]])
+    return ordered
+
+
+# Only the visible page of rows and the selected columns
+def table_page(version, rows, columns, page, page_size=TABLE_PAGE_SIZE):
+    data = load_dataset(version)
+    page_rows = rows[page * page_size:(page + 1) * page_size]
+    return data.iloc[page_rows, data.columns.get_indexer(columns)]
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from synlab.data import filter_rows, load_dataset
+from synlab.perf import counts_calls, counts_misses
+from synlab.snapshot import snapshot_resource
+
+TEXT_COLUMNS = ['Additional_Suggestions', 'Preferred_Lab_Reason', 'Other_Labs_Named']
+
+# Survey placeholders that mean "no answer"
+PLACEHOLDER_TEXT = {
+    '', 'no', 'nah', 'none', 'nil', 'yes', 'not specified', 'no suggestions',
+    'no suggestion', 'no comments', 'no comment', '0 comments', 'none mentioned',
+    'none for now', 'none for now.',
+}
+
+# Every alphanumeric token of two or more characters is indexed so that
+# search can match short terms like "HMO"; charts only use KEYWORD_PATTERN
+TOKEN_PATTERN = r"(?u)\b[a-zA-Z0-9]{2,}\b"
+STOP_WORDS = {'please', 'would', 'like', 'better', 'good', 'great', 'service', 'lab', 'synlab',
+              'their', 'they', 'that', 'this', 'with', 'have', 'from', 'what', 'your', 'more'}
+
+N_TOPICS = 5
+TOPIC_FIT_MAX_ROWS = 100_000
+
+
+def clean_text(values):
+    text = values.fillna('').astype(str).str.strip()
+    return text.mask(text.str.lower().isin(PLACEHOLDER_TEXT), '')
+
+
+# Tokenize each free-text column once per dataset version.
+# Answers repeat heavily, so only distinct answers go through the
+# tokenizer and rows are expanded by sparse row indexing.
+@counts_calls
+@st.cache_resource(show_spinner="Indexing free-text answers...", max_entries=2)
+@counts_misses
+def text_index(version):
+    index = snapshot_resource(version, 'text_index')
+    if index is not None:
+        return index
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+    data = load_dataset(version)
+    columns = {column: pd.factorize(clean_text(data[column])) for column in TEXT_COLUMNS}
+
+    vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.int32)
+    vectorizer.fit(np.concatenate([uniques for _, uniques in columns.values()]))
+    vocabulary = vectorizer.get_feature_names_out()
+
+    counts = {}
+    for column, (codes, uniques) in columns.items():
+        counts[column] = vectorizer.transform(uniques)[codes].tocsr()
+    total = sum(counts.values()).tocsr()
+
+    keyword_mask = np.array([len(word) >= 4 and word.isalpha() and word not in STOP_WORDS
+                             for word in vocabulary], dtype=bool)
+    keywords = np.flatnonzero(keyword_mask)
+    tfidf = TfidfTransformer().fit_transform(total[:, keywords])
+
+    topics, topic_words = fit_topics(tfidf, vocabulary[keywords])
+    return {
+        'vocabulary': vocabulary,
+        'columns': columns,
+        'counts': counts,
+        'total': total,
+        'keywords': keywords,
+        'tfidf': tfidf,
+        'topics': topics,
+        'topic_words': topic_words,
+    }
+
+
+# NMF topic model over the TF-IDF matrix; very large corpora are fitted
+# on a sample and every row is then projected onto the topics
+def fit_topics(tfidf, words, n_topics=N_TOPICS, top_n=3):
+    import scipy.sparse as sp
+    from sklearn.decomposition import NMF
+
+    has_text = np.flatnonzero(tfidf.getnnz(axis=1))
+    n_topics = min(n_topics, len(words), len(has_text))
+    if n_topics == 0:
+        return sp.csr_matrix((tfidf.shape[0], 0)), []
+    sample = has_text
+    if len(sample) > TOPIC_FIT_MAX_ROWS:
+        sample = np.random.default_rng(42).choice(has_text, TOPIC_FIT_MAX_ROWS, replace=False)
+    nmf = NMF(n_components=n_topics, init='nndsvda', random_state=42, max_iter=400)
+    nmf.fit(tfidf[sample])
+    topics = np.zeros((tfidf.shape[0], n_topics), dtype=np.float32)
+    topics[has_text] = nmf.transform(tfidf[has_text])
+    topic_words = [', '.join(words[np.argsort(component)[::-1][:top_n]]) for component in nmf.components_]
+    return topics, topic_words
+
+
+# Filtered views row-slice the cached matrices instead of re-tokenizing
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def top_words(version, filters, n=15):
+    index = text_index(version)
+    rows = filter_rows(version, filters)
+    keywords = index['keywords']
+    counts = np.asarray(index['total'][rows][:, keywords].sum(axis=0)).ravel()
+    order = np.argsort(counts)[::-1][:n]
+    order = order[counts[order] > 0]
+    return pd.Series(counts[order], index=index['vocabulary'][keywords][order])
+
+
+@counts_calls
+@st.cache_data(show_spinner=False)
+@counts_misses
+def topic_weights(version, filters):
+    index = text_index(version)
+    rows = filter_rows(version, filters)
+    weights = np.asarray(index['topics'][rows].sum(axis=0)).ravel()
+    return pd.Series(weights, index=index['topic_words']).sort_values(ascending=False)